@@ -0,0 +1,49 @@
+import sys
+import time
+
+IN_JS = sys.platform in ['mozilla', 'ie6', 'opera', 'oldmoz',
+                         'safari', 'spidermonkey', 'pyv8']
+
+
+class Benchmark:
+    # The methods whose names start with "bench" are called with a number
+    # of operations to do, which is doubled until a call takes min_time
+    # seconds; the result is reported in operations per second.
+
+    min_time = 0.5
+
+    def __init__(self):
+        self.bench_methods = []
+
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def getName(self):
+        return self.__class__.__name__
+
+    def getBenchMethods(self):
+        self.bench_methods = []
+        for m in dir(self):
+            if m.find("bench") == 0 and callable(getattr(self, m)):
+                self.bench_methods.append(m)
+
+    def measure(self, method):
+        n = 1
+        while True:
+            start = time.time()
+            method(n)
+            elapsed = time.time() - start
+            if elapsed >= self.min_time:
+                return n / elapsed
+            n *= 2
+
+    def run(self):
+        self.getBenchMethods()
+        self.setUp()
+        for name in self.bench_methods:
+            rate = self.measure(getattr(self, name))
+            print "%s.%s %.1f ops/s" % (self.getName(), name, rate)
+        self.tearDown()
@@ -0,0 +1,178 @@
+from Benchmark import Benchmark
+
+
+class Base(object):
+    pass
+
+
+class Derived(Base):
+    pass
+
+
+def count(n):
+    i = 0
+    while i < n:
+        yield i
+        i += 1
+
+
+class BuiltinsBenchmark(Benchmark):
+    # Each operation is one use of a builtin of pyjslib, in a loop like
+    # benchLoop's, which is measured on its own for comparison.  Which
+    # builtins are called (e.g. op_add for +) depends on the translator
+    # options, see runtime_benchmark --group.
+    #
+    # The results are kept in self.sink, and the operands change from one
+    # operation to the next (e.g. x = l[x]), so that a JIT can neither
+    # drop the operations nor move them out of the loop.
+
+    sink = None
+
+    def setUp(self):
+        self.list = range(16)
+        # l[-1] == -1, so that x = l[x] keeps using a negative index
+        self.negatives = range(-16, 0)
+        # d[k] == k, for k = d[k]
+        self.dict = dict([('key%d' % i, 'key%d' % i) for i in range(16)])
+        self.derived = Derived()
+        # equal to 'abcdef', but not the same string object
+        self.string = ''.join(['abc', 'def'])
+
+    def benchLoop(self, n):
+        for i in xrange(n):
+            pass
+
+    def benchOpAdd(self, n):
+        t = 0
+        for i in xrange(n):
+            t = t + i
+        self.sink = t
+
+    def benchOpAddStr(self, n):
+        s = 'abc'
+        other = 'abd'
+        for i in xrange(n):
+            t = s + 'def'
+            u = s
+            s = other
+            other = u
+        self.sink = t
+
+    def benchOpEq(self, n):
+        e = False
+        for i in xrange(n):
+            e = i == 5
+        self.sink = e
+
+    def benchOpEqStr(self, n):
+        # compares the characters, half of the time of equal strings
+        s = self.string
+        other = 'abcdeg'
+        e = False
+        for i in xrange(n):
+            e = s == 'abcdef'
+            u = s
+            s = other
+            other = u
+        self.sink = e
+
+    def benchIsinstance(self, n):
+        x = self.derived
+        other = 1
+        e = False
+        for i in xrange(n):
+            e = isinstance(x, Base)
+            u = x
+            x = other
+            other = u
+        self.sink = e
+
+    def benchIsinstanceTuple(self, n):
+        x = self.derived
+        other = 1.5
+        e = False
+        for i in xrange(n):
+            e = isinstance(x, (int, str, Base))
+            u = x
+            x = other
+            other = u
+        self.sink = e
+
+    def benchListGetItem(self, n):
+        l = self.list
+        x = 3
+        for i in xrange(n):
+            x = l[x]
+        self.sink = x
+
+    def benchListGetItemNegative(self, n):
+        l = self.negatives
+        x = -1
+        for i in xrange(n):
+            x = l[x]
+        self.sink = x
+
+    def benchListSetItem(self, n):
+        l = self.list
+        for i in xrange(n):
+            l[3] = i
+        l[3] = 3
+
+    def benchDictGetItem(self, n):
+        d = self.dict
+        k = 'key3'
+        for i in xrange(n):
+            k = d[k]
+        self.sink = k
+
+    def benchDictSetItem(self, n):
+        d = self.dict
+        for i in xrange(n):
+            d['key3'] = i
+        d['key3'] = 'key3'
+
+    def benchDictContains(self, n):
+        # every other key is missing
+        d = self.dict
+        k = 'key3'
+        other = 'key17'
+        e = False
+        for i in xrange(n):
+            e = k in d
+            u = k
+            k = other
+            other = u
+        self.sink = e
+
+    def benchSprintf(self, n):
+        for i in xrange(n):
+            s = "%s=%d" % ('key', i)
+        self.sink = s
+
+    def benchSprintfFloat(self, n):
+        x = 3.14159
+        for i in xrange(n):
+            s = "%.2f" % x
+            x = -x
+        self.sink = s
+
+    def benchGenerator(self, n):
+        # each operation runs a generator of 10 items
+        t = 0
+        for i in xrange(n):
+            for x in count(10):
+                t = x
+        self.sink = t
+
+    def benchRange(self, n):
+        for i in xrange(n):
+            r = range(10)
+        self.sink = r
+
+    def benchXrange(self, n):
+        # each operation iterates over 10 numbers
+        t = 0
+        for i in xrange(n):
+            for x in xrange(10):
+                t = x
+        self.sink = t
@@ -0,0 +1,102 @@
+from Benchmark import Benchmark
+
+SIZE = 1000
+
+
+class Key(object):
+    # hashed by its $H, like the instances of most classes
+    pass
+
+
+class DictBenchmark(Benchmark):
+    # Each operation goes over SIZE keys; run it with and without
+    # --enable-native-map to compare the dict and set backends.
+
+    def setUp(self):
+        self.strings = ['key%d' % i for i in range(SIZE)]
+        self.numbers = range(SIZE)
+        self.objects = [Key() for i in range(SIZE)]
+        self.dict = dict([(k, k) for k in self.strings])
+        self.set = set(self.strings)
+        self.other = set(self.strings[::2])
+
+    def benchSetItem(self, n):
+        keys = self.strings
+        for i in xrange(n):
+            d = {}
+            for k in keys:
+                d[k] = i
+
+    def benchSetItemNumbers(self, n):
+        keys = self.numbers
+        for i in xrange(n):
+            d = {}
+            for k in keys:
+                d[k] = i
+
+    def benchSetItemObjects(self, n):
+        keys = self.objects
+        for i in xrange(n):
+            d = {}
+            for k in keys:
+                d[k] = i
+
+    def benchGetItem(self, n):
+        d = self.dict
+        keys = self.strings
+        for i in xrange(n):
+            for k in keys:
+                d[k]
+
+    def benchContains(self, n):
+        d = self.dict
+        keys = self.numbers
+        for i in xrange(n):
+            for k in keys:
+                k in d
+
+    def benchDelItem(self, n):
+        keys = self.strings
+        for i in xrange(n):
+            d = self.dict.copy()
+            for k in keys:
+                del d[k]
+
+    def benchLen(self, n):
+        d = self.dict
+        for i in xrange(n):
+            for k in xrange(SIZE):
+                len(d)
+
+    def benchIterate(self, n):
+        d = self.dict
+        for i in xrange(n):
+            for k in d:
+                pass
+
+    def benchItems(self, n):
+        d = self.dict
+        for i in xrange(n):
+            d.items()
+
+    def benchSetAdd(self, n):
+        keys = self.strings
+        for i in xrange(n):
+            s = set()
+            for k in keys:
+                s.add(k)
+
+    def benchSetContains(self, n):
+        s = self.set
+        keys = self.strings
+        for i in xrange(n):
+            for k in keys:
+                k in s
+
+    def benchSetOperations(self, n):
+        s = self.set
+        other = self.other
+        for i in xrange(n):
+            s.intersection(other)
+            s.union(other)
+            s.difference(other)
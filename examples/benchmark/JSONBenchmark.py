@@ -0,0 +1,43 @@
+import json
+
+from Benchmark import Benchmark, IN_JS
+
+if IN_JS:
+    # the code json uses where the engine has no native JSON
+    def loads_fallback(s):
+        return json.parser.jsObjectToPyObject(json.parser.parseJSON(s))
+
+    def dumps_fallback(obj):
+        return json.parser.toJSONString(obj)
+else:
+    loads_fallback = json.loads
+    dumps_fallback = json.dumps
+
+
+class JSONBenchmark(Benchmark):
+    # Each operation decodes or encodes a payload of about 2.5 MB.
+
+    def setUp(self):
+        records = []
+        for i in range(20000):
+            records.append({'id': i, 'name': 'item %d' % i,
+                            'price': i * 0.25, 'tags': ['a', 'b', 'c'],
+                            'visible': i % 2 == 0, 'parent': None})
+        self.payload = {'result': records, 'id': 1, 'error': None}
+        self.data = json.dumps(self.payload)
+
+    def benchDumps(self, n):
+        for i in xrange(n):
+            json.dumps(self.payload)
+
+    def benchDumpsFallback(self, n):
+        for i in xrange(n):
+            dumps_fallback(self.payload)
+
+    def benchLoads(self, n):
+        for i in xrange(n):
+            json.loads(self.data)
+
+    def benchLoadsFallback(self, n):
+        for i in xrange(n):
+            loads_fallback(self.data)
@@ -0,0 +1,40 @@
+import re
+
+from Benchmark import Benchmark
+
+LINE = "2012-03-04 12:34:56 GET /index.html?key=value&page=42 200 5120"
+
+
+class ReBenchmark(Benchmark):
+
+    def setUp(self):
+        # more patterns than re kept before it had an LRU cache (100)
+        self.patterns = [r"p%d(\d+)" % i for i in range(200)]
+        self.compiled = re.compile(r"(\d+)-(\d+)-(\d+)")
+
+    def benchMatch(self, n):
+        for i in xrange(n):
+            re.match(r"(\d+)-(\d+)-(\d+)", LINE)
+
+    def benchMatchCompiled(self, n):
+        p = self.compiled
+        for i in xrange(n):
+            p.match(LINE)
+
+    def benchMatchManyPatterns(self, n):
+        patterns = self.patterns
+        for i in xrange(n):
+            re.match(patterns[i % 200], "p1234")
+
+    def benchMatchUncached(self, n):
+        for i in xrange(n):
+            re.purge()
+            re.match(r"(\d+)-(\d+)-(\d+)", LINE)
+
+    def benchSearch(self, n):
+        for i in xrange(n):
+            re.search(r"key=(\w+)", LINE)
+
+    def benchSub(self, n):
+        for i in xrange(n):
+            re.sub(r"\d+", "#", LINE)
@@ -0,0 +1,83 @@
+import math
+import time
+
+from pyjamas.chart.GChart import GChart
+from pyjamas.chart import SymbolType
+
+
+N_POINTS = 50000
+N_HIT_TESTS = 200
+
+"""*
+* Times loading, updating and hit-testing a time series with
+* many points, comparing one addPoint per point with the
+* bulk setPoints and appendPoints of the curve.
+*
+* The chart has to be on the page when run is called, as
+* update and hit-testing depend on the rendered chart.
+*
+"""
+class GChartBenchmark(GChart):
+
+    def __init__(self, nPoints=N_POINTS):
+        GChart.__init__(self)
+        self.nPoints = nPoints
+        self.timings = []
+        self.setChartTitle("<b>%d point time series</b>" % nPoints)
+        self.setChartSize(600, 200)
+        self.addCurve()
+        symbol = self.getCurve().getSymbol()
+        symbol.setSymbolType(SymbolType.LINE)
+        symbol.setFillThickness(1)
+        symbol.setWidth(1)
+        symbol.setHeight(1)
+        symbol.setHoverSelectionEnabled(True)
+
+        self.xs = range(nPoints)
+        self.ys = [math.sin(i/1000.0) for i in self.xs]
+        self.timeIt("load, addPoint per point", self.loadByPoint)
+        self.timeIt("load, setPoints", self.load)
+
+    def timeIt(self, name, method):
+        start = time.time()
+        method()
+        self.timings.append((name, time.time() - start))
+
+    def loadByPoint(self):
+        curve = self.getCurve()
+        curve.clearPoints()
+        for i in range(self.nPoints):
+            curve.addPoint(self.xs[i], self.ys[i])
+
+    def load(self):
+        self.getCurve().setPoints(self.xs, self.ys)
+
+    def updateValues(self):
+        ys = [-y for y in self.ys]
+        self.getCurve().setPoints(self.xs, ys)
+        self.update()
+
+    def appendValues(self):
+        n = self.getCurve().getNPoints()
+        xs = range(n, n + 1000)
+        ys = [math.sin(x/1000.0) for x in xs]
+        self.getCurve().appendPoints(xs, ys)
+        self.update()
+
+    def hitTest(self):
+        width = self.getXChartSize()
+        y = self.getYChartSize() / 2
+        for i in range(N_HIT_TESTS):
+            self.getClosestBrushTouchingPointNoCheck(
+                (i * width) / N_HIT_TESTS, y)
+
+    def run(self):
+        self.timeIt("update", self.update)
+        self.timeIt("setPoints and update", self.updateValues)
+        self.timeIt("appendPoints(1000) and update", self.appendValues)
+        self.timeIt("%d hit tests" % N_HIT_TESTS, self.hitTest)
+
+    def getResultsHTML(self):
+        rows = ["<tr><td>%s</td><td>%.3fs</td></tr>" % (name, seconds)
+                for name, seconds in self.timings]
+        return "<table>" + "".join(rows) + "</table>"
@@ -12,6 +12,7 @@ from pyjamas.ui.HorizontalPanel import HorizontalPanel
 from pyjamas.ui.ListBox import ListBox
 from pyjamas.ui.VerticalPanel import VerticalPanel
 from pyjamas.chart.GChart import GChart
+from pyjamas.chart import IllegalArgumentException
 from pyjamas.chart import AnnotationLocation
 from pyjamas.chart import SymbolType
 from pyjamas.chart import TouchedPointUpdateOption
@@ -38,6 +38,8 @@ from GChartExample21 import GChartExample21
 from GChartExample24 import GChartExample24
 from GChartExample25 import GChartExample25
 
+from GChartBenchmark import GChartBenchmark
+
 """*
 *
 * Displays the test  chart in the browser, and checks the HTML
@@ -123,6 +125,20 @@ def addChart(gchart):
 def addChartNoUpdate(gchart):
     DeferredCommand.add(AddOneChart(gchart, False))
 
+class RunBenchmark:
+    def __init__(self, benchmark):
+        self.benchmark = benchmark
+
+    def execute(self):
+        RootPanel("testappcharts").add(HTML(getTitle(self.benchmark)))
+        RootPanel("testappcharts").add(self.benchmark)
+        self.benchmark.run()
+        RootPanel("testappcharts").add(
+            HTML(self.benchmark.getResultsHTML()))
+
+def addBenchmark(benchmark):
+    DeferredCommand.add(RunBenchmark(benchmark))
+
 class GWTCanvasBasedCanvasFactory(object):
     def create(self):
         return GWTCanvas()
@@ -405,6 +421,9 @@ def onModuleLoad():
 
     #addChart(TestGChart00())
 
+    # timings of a curve with 50000 points
+    #addBenchmark(GChartBenchmark())
+
     RootPanel("loadingMessage").setVisible(False)
 
 
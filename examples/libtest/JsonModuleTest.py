@@ -0,0 +1,90 @@
+# Testing json module: where the engine has a JSON object, dumps and
+# loads use JSON.stringify and JSON.parse; the results must be those of
+# the toJSONString & parseJSON fallback
+
+import UnitTest
+import json
+
+
+class Point(object):
+    # made from a __jsonclass__ hint
+
+    def __init__(self, x=None, y=None):
+        self.x = x
+        self.y = y
+
+
+# without --enable-number-classes, longs are numbers in javascript
+has_long_type = 1L << 31 > 0
+
+
+class JsonModuleTest(UnitTest.UnitTest):
+
+    def fallbackDumps(self, obj):
+        return json.parser.toJSONString(obj)
+
+    def fallbackLoads(self, s):
+        parser = json.parser
+        return parser.jsObjectToPy(parser.parseJSON(s))
+
+    def fallbackLoadsObject(self, s):
+        parser = json.parser
+        return parser.jsObjectToPyObject(parser.parseJSON(s))
+
+    def testNested(self):
+        data = {'a': [1, 2, {'b': [3, 'x', None, True, False]}],
+                'c': {'d': 1.5, 'e': []}, 'f': (4, 5)}
+        s = json.dumps(data)
+        expected = {'a': [1, 2, {'b': [3, 'x', None, True, False]}],
+                    'c': {'d': 1.5, 'e': []}, 'f': [4, 5]}
+        self.assertEqual(json.loads(s), expected)
+        if not UnitTest.IN_JS:
+            return
+        self.assertEqual(self.fallbackLoads(self.fallbackDumps(data)),
+                         expected)
+        self.assertEqual(json.parser.decode(s), self.fallbackLoads(s))
+        self.assertEqual(json.parser.decode(s), expected)
+        self.assertEqual(json.dumps([1, [2, [3]], {}]),
+                         self.fallbackDumps([1, [2, [3]], {}]))
+        self.assertEqual(json.dumps('a "b"\n'), self.fallbackDumps('a "b"\n'))
+
+    def testJsonClass(self):
+        if not UnitTest.IN_JS:
+            return
+        s = ('[{"__jsonclass__": ["JsonModuleTest.Point", []],'
+             ' "x": 1, "y": {"z": [2]}}, 3]')
+        native = json.loads(s)
+        fallback = self.fallbackLoadsObject(s)
+        for result in [native, fallback]:
+            self.assertEqual(len(result), 2)
+            self.assertTrue(isinstance(result[0], Point))
+            self.assertEqual(result[0].x, 1)
+            self.assertEqual(result[0].y, {'z': [2]})
+            self.assertEqual(result[1], 3)
+
+    def testNumberKeys(self):
+        if not has_long_type:
+            return
+        data = {1: 'int', long('12345678901234567890'): 'long'}
+        expected = {'1': 'int', '12345678901234567890': 'long'}
+        self.assertEqual(json.loads(json.dumps(data)), expected)
+        if not UnitTest.IN_JS:
+            return
+        self.assertEqual(self.fallbackLoads(self.fallbackDumps(data)),
+                         expected)
+
+    def testLongs(self):
+        if not has_long_type:
+            return
+        big = long('1180591620717411303424')
+        self.assertEqual(json.dumps(big), '1180591620717411303424')
+        self.assertEqual(json.loads(json.dumps([long(1), big])),
+                         [1, big])
+        self.assertEqual(json.dumps(long(5)), '5')
+        if not UnitTest.IN_JS:
+            return
+        # do not fit a number, so dumps falls back to toJSONString
+        self.assertEqual(json.dumps(big), self.fallbackDumps(big))
+        self.assertEqual(json.dumps([long(1), big]),
+                         self.fallbackDumps([long(1), big]))
+        self.assertEqual(json.dumps(long(5)), self.fallbackDumps(long(5)))
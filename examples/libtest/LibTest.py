@@ -59,9 +59,11 @@ from Base64ModuleTest import Base64ModuleTest
 from MathModuleTest import MathModuleTest
 from RandomModuleTest import RandomModuleTest
 from ReModuleTest import ReModuleTest
+from JsonModuleTest import JsonModuleTest
 from CsvModuleTest import CsvModuleTest
 from StringIOModuleTest import StringIOModuleTest
 from HashableTest import HashableTest
+from MapBackendTest import MapBackendTest
 
 from RunTests import RunTests
 
@@ -100,9 +102,11 @@ def main():
     t.add(Base64ModuleTest)
     t.add(MathModuleTest)
     t.add(ReModuleTest)
+    t.add(JsonModuleTest)
     t.add(RandomModuleTest)
     t.add(CsvModuleTest)
     t.add(HashableTest)
+    t.add(MapBackendTest)
 
     if IN_BROWSER:
         t.add(JSOTest)
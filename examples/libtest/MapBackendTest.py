@@ -0,0 +1,104 @@
+from UnitTest import UnitTest, IN_JS
+
+# dict, set and frozenset behave the same whether pyjslib is built with
+# --enable-native-map (Map-backed) or without (object-backed); build and
+# run LibTest both ways.
+
+
+class Key(object):
+    # equal keys hash alike
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and self.value == other.value
+
+
+class Plain(object):
+    # hashed by identity ($H)
+    pass
+
+
+class MapBackendTest(UnitTest):
+
+    def testInsertionOrder(self):
+        if not IN_JS:
+            # python 2 dicts are not ordered
+            return
+        d = {}
+        for k in ['b', 'a', 'c', 'd']:
+            d[k] = k.upper()
+        self.assertEqual(d.keys(), ['b', 'a', 'c', 'd'])
+        self.assertEqual(d.values(), ['B', 'A', 'C', 'D'])
+        del d['a']
+        d['a'] = 'A'
+        self.assertEqual(d.keys(), ['b', 'c', 'd', 'a'])
+        self.assertEqual(list(d.items()[-1]), ['a', 'A'])
+        self.assertEqual([k for k in d], ['b', 'c', 'd', 'a'])
+        d['b'] = 'bb'
+        self.assertEqual(d.keys(), ['b', 'c', 'd', 'a'])
+
+        s = set()
+        for k in [3, 1, 2]:
+            s.add(k)
+        self.assertEqual(list(s), [3, 1, 2])
+
+    def testHashKeys(self):
+        d = {}
+        d[Key(1)] = 'one'
+        d[Key(1)] = 'uno'
+        self.assertEqual(len(d), 1)
+        self.assertEqual(d[Key(1)], 'uno')
+        self.assertTrue(Key(1) in d)
+        self.assertFalse(Key(2) in d)
+
+        a = Plain()
+        b = Plain()
+        d = {a: 1, b: 2}
+        self.assertEqual(len(d), 2)
+        self.assertEqual(d[a], 1)
+        self.assertEqual(d[b], 2)
+        del d[a]
+        self.assertFalse(a in d)
+        self.assertEqual(d.keys(), [b])
+
+        d = {1: 'int', 'a': 'str', (1, 2): 'tuple', None: 'none'}
+        self.assertEqual(len(d), 4)
+        self.assertEqual(d[1], 'int')
+        self.assertEqual(d['a'], 'str')
+        self.assertEqual(d[(1, 2)], 'tuple')
+        self.assertEqual(d[None], 'none')
+        self.assertEqual(d.get(2, 'missing'), 'missing')
+        self.assertRaises(KeyError, lambda: d['b'])
+
+        d = {frozenset([1, 2]): 'fs'}
+        self.assertEqual(d[frozenset([2, 1])], 'fs')
+
+    def testSetOperations(self):
+        a = set([1, 2, 3, Key('x')])
+        b = set([3, 4, Key('x')])
+        self.assertEqual(a.union(b), set([1, 2, 3, 4, Key('x')]))
+        self.assertEqual(a.intersection(b), set([3, Key('x')]))
+        self.assertEqual(a.difference(b), set([1, 2]))
+        self.assertEqual(a.symmetric_difference(b), set([1, 2, 4]))
+        self.assertTrue(set([1, Key('x')]).issubset(a))
+        self.assertTrue(a.issuperset(set([2, 3])))
+        self.assertFalse(a.isdisjoint(b))
+        self.assertTrue(a.isdisjoint(set([5])))
+
+        c = set(a)
+        c.discard(Key('x'))
+        c.update([5, 6])
+        c.difference_update([1])
+        self.assertEqual(c, set([2, 3, 5, 6]))
+        self.assertEqual(len(a), 4)
+        self.assertEqual(c.pop() in set([2, 3, 5, 6]), True)
+        self.assertEqual(len(c), 3)
+
+        f = frozenset([1, 2]).union(frozenset([2, 3]))
+        self.assertEqual(f, frozenset([1, 2, 3]))
+        self.assertEqual(set([1, 2, 3]), f)
+        self.assertEqual(len(set([frozenset([1]), frozenset([1])])), 1)
@@ -144,6 +144,53 @@ class ReModuleTest(UnitTest.UnitTest):
         g = m.groups("")
         self.assertEqual(g, ("", "1"))
 
+    def testCacheEviction(self):
+        maxcache = re._MAXCACHE
+        re.purge()
+        try:
+            re._MAXCACHE = 3
+            first = re.compile('a0')
+            self.assertTrue(re.compile('a0') is first)
+            for i in range(1, 4):
+                re.compile('a%d' % i)
+            # dropped from the cache, compiled again
+            self.assertFalse(re.compile('a0') is first)
+            self.assertTrue(re.compile('a0').match('a0') is not None)
+            if UnitTest.IN_JS:
+                # the least recently used pattern is dropped first
+                re.purge()
+                first = re.compile('b0')
+                second = re.compile('b1')
+                re.compile('b2')
+                re.compile('b0')
+                re.compile('b3')
+                self.assertTrue(re.compile('b0') is first)
+                self.assertFalse(re.compile('b1') is second)
+        finally:
+            re._MAXCACHE = maxcache
+            re.purge()
+
+    def testLazyRegExps(self):
+        if not UnitTest.IN_JS:
+            return
+        r = re.compile('xy+', re.I)
+        self.assertTrue(r.match_code is None)
+        self.assertTrue(r.search_code is None)
+        self.assertEqual(r.match('XYy').group(0), 'XYy')
+        self.assertFalse(r.match_code is None)
+        self.assertTrue(r.search_code is None)
+        self.assertEqual(r.search('axyb').span(), (1, 3))
+        self.assertFalse(r.search_code is None)
+        # the RegExps are created once
+        code = r.match_code
+        r.match('xy')
+        self.assertTrue(r.match_code is code)
+        # findall searches with the search RegExp
+        r = re.compile('zw+', re.I)
+        self.assertEqual(r.findall('zw ZWW'), ['zw', 'ZWW'])
+        self.assertFalse(r.search_code is None)
+        self.assertTrue(r.match_code is None)
+
     def testBackReferences(self):
         B_re = re.compile(r'\*\*(.*?)\*\*', re.DOTALL)
         EM_re = re.compile(r'\*(.*?)\*', re.DOTALL)
@@ -41,7 +41,12 @@ P_NONE = 4
 class NodeInfo:
     """Each instance describes a specific AST node"""
     def __init__(self, name, args):
-        self.name = name
+        mo = rx_base.match(name)
+        if mo is None:
+            self.name = name
+            self.base = "Node"
+        else:
+            self.name, self.base = mo.groups()
         self.args = args.strip()
         self.argnames = self.get_argnames()
         self.argprops = self.get_argprops()
@@ -92,7 +97,9 @@ class NodeInfo:
 
     def gen_source(self):
         buf = StringIO()
-        print >> buf, "class %s(Node):" % self.name
+        print >> buf, "class %s(%s):" % (self.name, self.base)
+        self._gen_slots(buf)
+        print >> buf
         self._gen_init(buf)
         print >> buf
         self._gen_getChildren(buf)
@@ -103,6 +110,22 @@ class NodeInfo:
         buf.seek(0, 0)
         return buf.read()
 
+    def get_slots(self):
+        """the arguments and the attributes set by the extra init code"""
+        slots = list(self.argnames)
+        for line in self.init:
+            for name in rx_attr.findall(line):
+                if name not in slots:
+                    slots.append(name)
+        return slots
+
+    def _gen_slots(self, buf):
+        slots = ["'%s'" % name for name in self.get_slots()]
+        if len(slots) == 1:
+            print >> buf, "    __slots__ = (%s,)" % slots[0]
+        else:
+            print >> buf, "    __slots__ = (%s)" % COMMA.join(slots)
+
     def _gen_init(self, buf):
         if self.args:
             print >> buf, "    def __init__(self, %s, lineno=None):" % self.args
@@ -190,6 +213,8 @@ class NodeInfo:
             print >> buf, '        return "%s()"' % self.name
 
 rx_init = re.compile('init\((.*)\):')
+rx_base = re.compile('(\w+)\((\w+)\)$')
+rx_attr = re.compile('self\.(\w+)\s*=')
 
 def parse_spec(file):
     classes = {}
@@ -234,7 +259,7 @@ if __name__ == "__main__":
 
 This file is automatically generated by Tools/compiler/astgen.py
 """
-from consts import CO_VARARGS, CO_VARKEYWORDS
+from pycompiler.consts import CO_VARARGS, CO_VARKEYWORDS
 
 def flatten(seq):
     l = []
@@ -253,7 +278,13 @@ def flatten_nodes(seq):
 nodes = {}
 
 class Node(object):
-    """Abstract base class for ast nodes."""
+    """Abstract base class for ast nodes.
+
+    The node classes use __slots__ to keep large trees small; attributes
+    which are not in the slots of a class still go to a __dict__, which is
+    only created for the nodes that get one."""
+    __slots__ = ('_lineno', '_context', '__dict__')
+
     def getChildren(self):
         pass # implemented by subclasses
     def __iter__(self):
@@ -267,18 +298,30 @@ class Node(object):
         return self._lineno
     def _set_lineno(self, lineno):
         if lineno is not None and not isinstance(lineno, int):
-            self._context = lineno
+            # a (prefix, (lineno, column)) context from the parser; only
+            # the position is kept, the prefix holds the comments and
+            # white space in front of the token
+            self._context = lineno[1]
             self._lineno = lineno[1][0]
         else:
             self._lineno = lineno
             self._context = None
     lineno = property(_get_lineno, _set_lineno)
 
+    def __str__(self):
+        return repr(self)
+
 class EmptyNode(Node):
-    pass
+    __slots__ = ()
+
+class CollComp(Node):
+    """base class of the list, set and dict comprehensions"""
+    __slots__ = ()
 
 class Expression(Node):
     # Expression is an artificial node class to support "eval"
+    __slots__ = ('node',)
+
     nodes["expression"] = "Expression"
     def __init__(self, node):
         Node.__init__(self)
@@ -294,6 +337,8 @@ class Expression(Node):
         return "Expression(%s)" % (repr(self.node))
 
 ### EPILOGUE
-for name, obj in globals().items():
+_Function = Function
+
+for name, obj in list(globals().items()):
     if isinstance(obj, type) and issubclass(obj, Node):
         nodes[name.lower()] = obj
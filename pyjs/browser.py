@@ -22,11 +22,15 @@ else:
 
 from pyjs import util
 from pyjs import options
+from pyjs import watcher
+from pyjs import treeshaker
+from pyjs import minifier
 from cStringIO import StringIO
 from optparse import OptionParser, OptionGroup
 import pyjs
 import re
 import traceback
+import json
 try:
     from hashlib import md5
 except:
@@ -38,6 +42,18 @@ AVAILABLE_PLATFORMS = ('IE6', 'Opera', 'OldMoz', 'Safari', 'Mozilla')
 
 BOILERPLATE_PATH = os.path.join(os.path.dirname(__file__), 'boilerplate')
 
+# template values of the app file which hold the code of the modules and
+# javascript libraries; they are streamed into the file instead
+STREAMED_APP_VALUES = ('early_static_app_libs', 'static_app_libs',
+                       'early_static_js_libs', 'static_js_libs',
+                       'late_static_js_libs')
+
+
+def module_packages(name):
+    """returns the packages of the module name, followed by the name"""
+    parts = name.split('.')
+    return ['.'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+
 
 APP_HTML_TEMPLATE = """\
 <html>
@@ -72,7 +88,16 @@ class BrowserLinker(linker.BaseLinker):
         self.apploader_file = kwargs.pop('apploader_file', None)
         self.public_folder = kwargs.pop('public_folder', 'public')
         self.runtime_options = kwargs.pop('runtime_options', [])
+        self.split_modules = kwargs.pop('split_modules', [])
+        self.tree_shaking_keep = kwargs.pop('tree_shaking_keep', [])
+        self.minify = kwargs.pop('minify', False)
+        self.precompress = kwargs.pop('precompress', False)
         super(BrowserLinker, self).__init__(*args, **kwargs)
+        if (    (self.unlinked_modules or self.split_modules)
+            and not 'dynamic' in self.modules
+           ):
+            # pyjslib loads the unlinked modules and chunks with it
+            self.modules.append('dynamic')
 
     def visit_start(self):
         super(BrowserLinker, self).visit_start()
@@ -81,6 +106,15 @@ class BrowserLinker(linker.BaseLinker):
         self.merged_public = set()
         self.app_files = {}
         self.renamed_libs = {}
+        self.module_bodies = {}
+        self.shaken_bodies = {}
+        self.chunks = {}
+        self.tree_shaking = {}
+        # minified code by the md5 hash of the code, kept for rebuilds
+        self.minified_bodies = {}
+        # the keys of minified_bodies used by the app file of each platform
+        self.minified_keys = {}
+        self.minified = {}
 
     def visit_end_platform(self, platform):
         if not platform:
@@ -111,13 +145,37 @@ class BrowserLinker(linker.BaseLinker):
             self.done[platform] = renamed
         self.app_files[platform] = self._generate_app_file(platform)
 
+    def rebuild(self, changed_files):
+        if self.cache_buster:
+            # the renamed module files would all change
+            return None
+        platforms = super(BrowserLinker, self).rebuild(changed_files)
+        if platforms is None:
+            return None
+        if not self.multi_file:
+            for platform in platforms:
+                self.app_files[platform] = self._generate_app_file(platform)
+            self.module_bodies = {}
+            self.remove_stale_chunks()
+            if self.precompress:
+                self.compress_files()
+        return platforms
+
     def visit_end(self):
+        self.module_bodies = {}
+        self.shaken_bodies = {}
         self._create_app_html()
         self._create_nocache_html()
+        self.remove_stale_chunks()
+        if self.precompress:
+            self.compress_files()
         if not self.keep_lib_files:
             for fname in self.remove_files:
                 if fname.find(self.output) == 0:
                     os.unlink(fname)
+                    manifest = util.deps_manifest_path(fname)
+                    if os.path.isfile(manifest):
+                        os.unlink(manifest)
 
     def merge_resources(self, dir_name):
         if not dir_name in self.merged_public:
@@ -182,9 +240,285 @@ class BrowserLinker(linker.BaseLinker):
             keys[k] = 1
         return keys.keys()
 
+    def read_module_body(self, fname, platform_name):
+        """returns the contents of fname; files which are not specific to
+        a platform are kept for the app files of the other platforms"""
+        body = self.shaken_bodies.get(fname)
+        if body is not None:
+            return body
+        body = self.module_bodies.get(fname)
+        if body is None:
+            f = file(fname)
+            body = f.read()
+            f.close()
+            if not '__%s__' % platform_name in fname.split('.'):
+                self.module_bodies[fname] = body
+        return body
+
+    def read_minified_body(self, fname, platform_name):
+        """returns the contents of fname, minified if the linker minifies,
+        see pyjs.minifier"""
+        body = self.read_module_body(fname, platform_name)
+        if not self.minify:
+            return body
+        key = md5(body).hexdigest()
+        self.minified_keys[platform_name].add(key)
+        minified = self.minified_bodies.get(key)
+        if minified is None:
+            start = time.time()
+            minified = minifier.minify(body)
+            self.minified_bodies[key] = minified
+            stats = self.minified[platform_name]
+            stats[2] += time.time() - start
+        else:
+            stats = self.minified[platform_name]
+        stats[0] += len(body)
+        stats[1] += len(minified)
+        return minified
+
+    def prune_minified(self):
+        """forgets the minified code no app file uses any more"""
+        used = set()
+        for keys in self.minified_keys.values():
+            used.update(keys)
+        for key in self.minified_bodies.keys():
+            if not key in used:
+                del self.minified_bodies[key]
+
+    def report_minified(self, platform):
+        """prints the size of the code minified for platform, and the
+        time it took"""
+        size, minified, seconds = self.minified[platform.lower()]
+        if not size:
+            return
+        print("Minified [%s]: %d bytes to %d bytes (%d%%) in %.2fs" % (
+            platform, size, minified, 100 * minified / size, seconds))
+        if self.profile is not None:
+            self.profile.add_phase('minify', platform, seconds)
+            self.profile.add_minified(platform, size, minified)
+
+    def compress_files(self):
+        """writes the precompressed files of the app files, chunks and
+        html files, see pyjs.minifier.compress"""
+        paths = [os.path.join(self.output, self.top_module + ext)
+                 for ext in ('.html', '.nocache.html')]
+        for platform in self.platforms:
+            paths.append(self.app_files[platform])
+            paths.extend([chunk[1] for chunk in self.chunks.get(platform, [])])
+        start = time.time()
+        size = 0
+        compressed = {}
+        for path in paths:
+            if not os.path.isfile(path):
+                continue
+            size += os.path.getsize(path)
+            for out_path, out_size in minifier.compress(path):
+                ext = os.path.splitext(out_path)[1]
+                compressed[ext] = compressed.get(ext, 0) + out_size
+        print("Precompressed %d bytes to %s in %.2fs" % (
+            size, ', '.join(["%d bytes (%s)" % (compressed[ext], ext)
+                             for ext in sorted(compressed)]),
+            time.time() - start))
+        if self.profile is not None:
+            self.profile.add_phase('precompress', None, time.time() - start)
+
+    def shake_tree(self, platform, template):
+        """removes the functions and classes nothing refers to from the
+        modules of the app files of platform, see pyjs.treeshaker"""
+        platform_name = platform.lower()
+        self.shaken_bodies = {}
+        original = dict([(new, old)
+                         for old, new in self.renamed_libs.items()])
+        modules = {}
+        module_files = {}
+        other_code = [template]
+        for path in self.done[platform]:
+            body = self.read_module_body(path, platform_name)
+            source = self.sources.get(original.get(path, path))
+            if source is None:
+                # javascript included as a module
+                other_code.append(body)
+            else:
+                modules[source[2]] = body
+                module_files[source[2]] = path
+        for lib in (  self.early_static_app_libs + self.js_libs
+                    + self.dynamic_js_libs + self.static_js_libs
+                    + self.early_static_js_libs + self.late_static_js_libs):
+            fname = lib
+            if not os.path.isfile(fname):
+                fname = os.path.join(self.output, lib)
+            if os.path.isfile(fname):
+                other_code.append(self.read_module_body(fname,
+                                                        platform_name))
+        shaken, removed = treeshaker.shake(modules, other_code,
+                                           self.tree_shaking_keep)
+        report = []
+        for module_name, body in shaken.items():
+            self.shaken_bodies[module_files[module_name]] = body
+            if removed[module_name]:
+                size = len(modules[module_name])
+                saved = size - len(body)
+                report.append((module_name, size, saved,
+                               removed[module_name]))
+                if self.profile is not None:
+                    self.profile.add_tree_shaking(platform, module_name,
+                                                  size, saved,
+                                                  removed[module_name])
+        report.sort(key=lambda r: r[2], reverse=True)
+        self.tree_shaking[platform] = report
+        print("Tree shaking [%s]: removed %d functions and classes, "
+              "%d bytes" % (platform, sum([len(r[3]) for r in report]),
+                            sum([r[2] for r in report])))
+
+    def module_imports(self, platform):
+        """returns the modules of platform, mapped to the modules they
+        import"""
+        original = dict([(new, old)
+                         for old, new in self.renamed_libs.items()])
+        imports = {}
+        for out_file in self.done[platform]:
+            out_file = original.get(out_file, out_file)
+            if out_file in self.sources:
+                imports[self.sources[out_file][2]] = \
+                    self.dependencies[out_file]
+        return imports
+
+    def split_chunks(self, imports, roots, entries, names):
+        """returns the chunks of the modules which are imported by the
+        entry modules, but not by the roots without going through an entry
+        module, as (name, modules) sorted by name.  The modules imported by
+        several entry modules make up chunks of their own, one for each
+        group of entry modules importing them.  names are the modules of
+        the app, in the order of the chunks."""
+        def closure(start, stop):
+            found = set()
+            todo = list(start)
+            while todo:
+                name = todo.pop()
+                if name in found or name in stop:
+                    continue
+                found.add(name)
+                for dep in imports.get(name, []):
+                    todo.extend(module_packages(dep))
+            return found
+
+        entries = set(entries)
+        linked = closure(roots, entries)
+        users = {}
+        for entry in entries:
+            for name in closure(module_packages(entry),
+                                linked | (entries - set([entry]))):
+                users.setdefault(name, []).append(entry)
+        chunks = {}
+        for name in names:
+            if not name in users:
+                continue
+            key = tuple(sorted(users[name]))
+            if len(key) == 1:
+                chunk_name = key[0]
+            else:
+                chunk_name = 'shared.' + md5('+'.join(key)).hexdigest()[:8]
+            chunks.setdefault(chunk_name, []).append(name)
+        return sorted(chunks.items())
+
+    def write_chunk(self, platform, chunk_name, libs):
+        """writes the modules of a chunk into one file, named after the
+        chunk and the md5 hash of its contents.  Returns its path."""
+        platform_name = platform.lower()
+        body = '\n'.join([self.read_minified_body(lib, platform_name)
+                          for lib in libs])
+        chunk_dir = os.path.join(self.output, 'chunks')
+        if not os.path.isdir(chunk_dir):
+            os.mkdir(chunk_dir)
+        path = os.path.join(chunk_dir, '%s.%s%s' % (
+            chunk_name, md5(body).hexdigest(), pyjs.MOD_SUFFIX))
+        if not os.path.exists(path):
+            f = open(path, 'w')
+            f.write(body)
+            f.close()
+        return path
+
+    def read_chunk_manifest(self, path):
+        """returns the names of the chunk files listed in a chunk
+        manifest, or an empty list"""
+        if not os.path.isfile(path):
+            return []
+        f = open(path)
+        try:
+            try:
+                return json.load(f)
+            except ValueError:
+                return []
+        finally:
+            f.close()
+
+    def remove_stale_chunks(self):
+        """removes the chunk files written by earlier builds of this app
+        which are not chunks of the current app files, with their
+        precompressed copies.  The chunk files of each app are listed in
+        chunks/<top module>.chunks.json, so the chunks of other apps
+        built into the same output are kept."""
+        chunk_dir = os.path.join(self.output, 'chunks')
+        if not os.path.isdir(chunk_dir):
+            return
+        manifest_name = self.top_module + '.chunks.json'
+        manifest = os.path.join(chunk_dir, manifest_name)
+        current = set()
+        for chunks in self.chunks.values():
+            current.update([os.path.basename(chunk[1]) for chunk in chunks])
+        # the same chunk may have been written by another app
+        used = set(current)
+        for fname in os.listdir(chunk_dir):
+            if fname.endswith('.chunks.json') and fname != manifest_name:
+                used.update(self.read_chunk_manifest(
+                    os.path.join(chunk_dir, fname)))
+        for fname in self.read_chunk_manifest(manifest):
+            if fname in used:
+                continue
+            for ext in ('', '.gz', '.br'):
+                path = os.path.join(chunk_dir, fname + ext)
+                if os.path.exists(path):
+                    os.unlink(path)
+        if current:
+            f = open(manifest, 'w')
+            json.dump(sorted(current), f)
+            f.close()
+        elif os.path.exists(manifest):
+            os.unlink(manifest)
+
+    def unlinked_module_graph(self, imports, urls):
+        """returns the modules which are loaded at runtime, mapped to the
+        url of their file and the modules to load for them, the modules
+        they import (directly or not) followed by the module itself.
+        urls maps the names of these modules to the urls of their files
+        (or chunks); the modules of the app are not loaded, and other
+        modules are not available."""
+        def visit(name, order, seen):
+            if name in seen:
+                return
+            seen.add(name)
+            for dep in imports.get(name, []):
+                for pn in module_packages(dep):
+                    visit(pn, order, seen)
+            if name in urls:
+                order.append(name)
+
+        graph = {}
+        for name, url in urls.items():
+            order = []
+            seen = set()
+            for pn in module_packages(name):
+                visit(pn, order, seen)
+            graph[name] = [url, order]
+        return graph
+
     def _generate_app_file(self, platform):
         # TODO: cache busting
         template = self.read_boilerplate('all.cache.html')
+        if self.translator_arguments.get('tree_shaking'):
+            self.shake_tree(platform, template)
+        self.minified[platform.lower()] = [0, 0, 0.0]
+        self.minified_keys[platform.lower()] = set()
         name_parts = [self.top_module, platform, 'cache.html']
         done = self.done[platform]
         len_ouput_dir = len(self.output)+1
@@ -222,8 +556,8 @@ class BrowserLinker(linker.BaseLinker):
                 code.append('<script type="text/javascript"><!--')
                 if not msg is None:
                     code.append("/* start %s: %s */" % (msg, name))
-                f = file(fname)
-                code.append(f.read())
+                # written by write_code
+                code.append((fname,))
                 if not msg is None:
                     code.append("/* end %s */" % (name,))
                 code.append("""--></script>""")
@@ -234,38 +568,49 @@ class BrowserLinker(linker.BaseLinker):
                     fname = '.'.join(fname)
                     if os.path.isfile(fname):
                         self.remove_files[fname] = True
-            return "\n".join(code)
+            return code
+
+        def write_code(code):
+            for i, part in enumerate(code):
+                if i:
+                    write('\n')
+                if isinstance(part, tuple):
+                    write(self.read_minified_body(part[0], platform_name))
+                else:
+                    write(part)
 
         def js_modname(path):
             return 'js@'+os.path.basename(path)+'.'+md5(path).hexdigest()
 
+        def lib_module_name(path):
+            pltfrm = '__%s__' % platform_name
+            fname = os.path.basename(path).rpartition(pyjs.MOD_SUFFIX)[0]
+            frags = fname.split('.')
+            # TODO: do not combine module chunks until we write the file
+            if self.cache_buster and len(frags[-1])==32 and len(frags[-1].strip('0123456789abcdef'))==0:
+                frags.pop()
+            if frags[-1] == pltfrm:
+                frags.pop()
+            return '.'.join(frags)
+
+        def is_unlinked(fname):
+            for m in not_unlinked_modules:
+                if m.match(fname):
+                    return False
+            for m in unlinked_modules:
+                if m.match(fname):
+                    return True
+            return False
+
         def skip_unlinked(lst):
             new_lst = []
-            pltfrm = '__%s__' % platform_name
             for path in lst:
-                fname = os.path.basename(path).rpartition(pyjs.MOD_SUFFIX)[0]
-                frags = fname.split('.')
-                # TODO: do not combine module chunks until we write the file
-                if self.cache_buster and len(frags[-1])==32 and len(frags[-1].strip('0123456789abcdef'))==0:
-                    frags.pop()
-                if frags[-1] == pltfrm:
-                    frags.pop()
-                fname = '.'.join(frags)
-                in_not_unlinked_modules = False
-                for m in not_unlinked_modules:
-                    if m.match(fname):
-                        in_not_unlinked_modules = True
-                        new_lst.append(path)
-                        break
-                if not in_not_unlinked_modules:
-                    in_unlinked_modules = False
-                    for m in unlinked_modules:
-                        if m.match(fname):
-                            in_unlinked_modules = True
-                            if fname in available_modules:
-                                available_modules.remove(fname)
-                    if not in_unlinked_modules:
-                        new_lst.append(path)
+                fname = lib_module_name(path)
+                if is_unlinked(fname) or fname in chunked:
+                    if fname in available_modules:
+                        available_modules.remove(fname)
+                else:
+                    new_lst.append(path)
             return new_lst
 
         if self.multi_file:
@@ -275,6 +620,50 @@ class BrowserLinker(linker.BaseLinker):
             static_js_libs = self.unique_list_values(static_js_libs + [m for m in list(self.js_libs) if not m in dynamic_js_libs])
             static_app_libs = self.unique_list_values([m for m in done if not m in early_static_app_libs])
 
+        def output_url(path):
+            return path[len_ouput_dir:].replace(os.sep, '/')
+
+        imports = self.module_imports(platform)
+        app_libs = {}
+        app_names = []
+        for lib in done:
+            fname = lib_module_name(lib)
+            app_libs[fname] = lib
+            app_names.append(fname)
+        unlinked_urls = {}
+        for fname in app_names:
+            # not served with the app if compiled in place
+            if is_unlinked(fname) and app_libs[fname].find(self.output) == 0:
+                unlinked_urls[fname] = output_url(app_libs[fname])
+
+        chunked = {}
+        if self.split_modules:
+            split_modules = [re.compile(m) for m in self.split_modules]
+            entries = [fname for fname in app_names
+                       if     fname != self.top_module
+                          and not fname in unlinked_urls
+                          and [m for m in split_modules if m.match(fname)]
+                          and not [m for m in not_unlinked_modules
+                                   if m.match(fname)]]
+            # the unlinked modules are loaded one by one, and the modules
+            # they import are linked
+            roots = [linker.builtin_module] + required_modules + [
+                mn for mn in self.modules if not mn in entries
+            ] + unlinked_urls.keys()
+            chunks = self.split_chunks(imports, roots, entries, app_names)
+            self.chunks[platform] = []
+            for chunk_name, names in chunks:
+                path = self.write_chunk(platform, chunk_name,
+                                        [app_libs[fname] for fname in names])
+                for fname in names:
+                    chunked[fname] = output_url(path)
+                self.chunks[platform].append(
+                    (chunk_name, path, names, os.path.getsize(path)))
+                if self.profile is not None:
+                    self.profile.add_chunk(platform, chunk_name, path, names)
+        unlinked_urls.update(chunked)
+        module_graph = self.unlinked_module_graph(imports, unlinked_urls)
+
         dynamic_js_libs = skip_unlinked(dynamic_js_libs)
         dynamic_app_libs = skip_unlinked(dynamic_app_libs)
         static_js_libs = skip_unlinked(static_js_libs)
@@ -297,16 +686,51 @@ class BrowserLinker(linker.BaseLinker):
         late_static_js_libs = static_code(late_static_js_libs, "javascript lib")
 
         setoptions = "\n".join([("$pyjs['options']['%s'] = %s;" % (n, v)).lower() for n,v in self.runtime_options])
+        if self.minify:
+            # called by the minified code instead of tracking inline
+            setoptions += "\n" + minifier.TRACK_HELPERS
+        if module_graph:
+            # read by pyjslib.__dynamic_load__ and dynamic.load_modules
+            setoptions += "\n$pyjs['module_graph'] = %s;" % json.dumps(
+                module_graph, sort_keys=True, separators=(',', ':'))
+
+        # fill in the template with markers for the module code, and
+        # write the code in place of the markers while streaming the file
+        streamed = {}
+        values = locals().copy()
+        for name in STREAMED_APP_VALUES:
+            marker = '\0%s\0' % name
+            streamed[marker] = values[name]
+            values[name] = marker
+        file_parts = re.split('(\0[a-z_]+\0)', template % values)
 
-        file_contents = template % locals()
-        if self.cache_buster:
-            md5sum = md5(file_contents).hexdigest()
-            name_parts.insert(2, md5sum)
         out_path = os.path.join(self.output, '.'.join((name_parts)))
-
-        out_file = file(out_path, 'w')
-        out_file.write(file_contents)
-        out_file.close()
+        if self.cache_buster:
+            # the name depends on the contents
+            tmp_path = out_path + '.tmp'
+        else:
+            tmp_path = out_path
+        out_file = file(tmp_path, 'w')
+        checksum = md5()
+        def write(data):
+            out_file.write(data)
+            checksum.update(data)
+        try:
+            for part in file_parts:
+                if part in streamed:
+                    write_code(streamed[part])
+                else:
+                    write(part)
+        finally:
+            out_file.close()
+        if self.cache_buster:
+            name_parts.insert(2, checksum.hexdigest())
+            out_path = os.path.join(self.output, '.'.join((name_parts)))
+            if os.path.exists(out_path):
+                os.unlink(out_path)
+            os.rename(tmp_path, out_path)
+        self.report_minified(platform)
+        self.prune_minified()
         return out_path
 
     def _create_nocache_html(self):
@@ -407,17 +831,6 @@ class BrowserLinker(linker.BaseLinker):
         fh.close()
         return created
 
-MODIFIED_TIME = {}
-
-def is_modified(path):
-    current_mtime = os.path.getmtime(path)
-    if current_mtime == MODIFIED_TIME.get(path):
-        return False
-    else:
-        MODIFIED_TIME[path] = current_mtime
-        print('mtime changed for %s.' % path)
-        return True
-
 def serve(path):
     print("\nMonitoring file modifications in %s ..." % \
            os.path.abspath(os.curdir))
@@ -434,6 +847,10 @@ def build(top_module, pyjs, options, app_platforms,
                       path=pyjs.path,
                       js_libs=options.js_includes,
                       unlinked_modules=options.unlinked_modules,
+                      split_modules=options.split_modules,
+                      tree_shaking_keep=options.tree_shaking_keep,
+                      minify=options.minify,
+                      precompress=options.precompress,
                       keep_lib_files=options.keep_lib_files,
                       compile_inplace=options.compile_inplace,
                       translator_arguments=translator_arguments,
@@ -444,12 +861,16 @@ def build(top_module, pyjs, options, app_platforms,
                       public_folder=options.public_folder,
                       runtime_options=runtime_options,
                       list_imports=options.list_imports,
+                      translator_jobs=options.translator_jobs,
+                      translator_server=options.translator_server,
+                      build_cache=linker.get_build_cache(options),
+                      profile_build=options.profile_build,
                      )
     l()
 
     if not options.list_imports:
         print ("Built to :", os.path.abspath(options.output))
-        return
+        return l
     print("Dependencies")
     for f, deps in l.dependencies.items():
         print("%s\n%s" % (f, '\n'.join(map(lambda x: "\t%s" % x, deps))))
@@ -518,54 +939,47 @@ MODULE(s) will also translate, if available; they MUST be importable by the tool
     runtime_options.append(("arg_kwarg_dup", options.function_argument_checking))
     runtime_options.append(("arg_kwarg_unexpected_keyword", options.function_argument_checking))
     runtime_options.append(("arg_kwarg_multiple_values", options.function_argument_checking))
-    runtime_options.append(("dynamic_loading", (len(options.unlinked_modules)>0)))
+    runtime_options.append(("dynamic_loading", (len(options.unlinked_modules)>0 or len(options.split_modules)>0)))
 
-    build(top_module, pyjs, options, app_platforms,
-          runtime_options, args)
+    l = build(top_module, pyjs, options, app_platforms,
+              runtime_options, args)
 
     if not options.auto_build:
         sys.exit(0)
 
-    # autobuild starts here: loops round the current directory file structure
-    # looking for file modifications.  extra files in the public folder are
-    # copied to output, verbatim (without a recompile) but changes to python
-    # files result in a recompile with the exact same compile options.
+    # autobuild starts here: watches the current directory file structure
+    # for file modifications.  extra files in the public folder are
+    # copied to output, verbatim (without a recompile).  changes to python
+    # files retranslate just the modules built from them and regenerate
+    # the app files including them; if that is not possible (new files,
+    # changed imports) the whole app is rebuilt with the same options.
 
-    first_loop = True
-
-    public_dir = options.public_folder
     output_dir = options.output
 
     serve(top_module)
 
-    while True:
-        for root, dirs, files in os.walk('.'):
-            if root[2:].startswith(output_dir):
-                continue
-            if root[2:].startswith(public_dir):
-                for filename in files:
-                    file_path = os.path.join(root, filename)
-                    if is_modified(file_path) and not first_loop:
-                        dest_path = output_dir
-                        dest_path += file_path.split(public_dir, 1)[1]
-                        dest_dir = os.path.dirname(dest_path)
-                        if not os.path.exists(dest_dir):
-                            os.makedirs(dest_dir)
-                        print('Copying %s to %s' % (file_path, dest_path))
-                        shutil.copy(file_path, dest_path)
-            else:
-                for filename in files:
-                    if os.path.splitext(filename)[1] in ('.py',):
-                        file_path = os.path.join(root, filename)
-                        if is_modified(file_path) and not first_loop:
-                            try:
-                              build(top_module, pyjs, options,
-                                    app_platforms, runtime_options, args)
-                            except Exception:
-                              traceback.print_exception(*sys.exc_info())
-                            break
-        first_loop = False
-        time.sleep(1)
+    for changed in watcher.get_watcher('.', [output_dir]):
+        py_files = []
+        for file_path in changed or []:
+            if file_path.startswith(os.path.join('.', options.public_folder)):
+                dest_path = output_dir
+                dest_path += file_path.split(options.public_folder, 1)[1]
+                dest_dir = os.path.dirname(dest_path)
+                if not os.path.exists(dest_dir):
+                    os.makedirs(dest_dir)
+                print('Copying %s to %s' % (file_path, dest_path))
+                shutil.copy(file_path, dest_path)
+            elif os.path.splitext(file_path)[1] in ('.py',):
+                py_files.append(file_path)
+        if changed is not None and not py_files:
+            continue
+        try:
+            if l is None or changed is None or l.rebuild(py_files) is None:
+                l = build(top_module, pyjs, options,
+                          app_platforms, runtime_options, args)
+        except Exception:
+            l = None
+            traceback.print_exception(*sys.exc_info())
 
 
 mappings = options.Mappings()
@@ -0,0 +1,173 @@
+"""Content-addressed cache of translated modules.
+
+Entries are keyed by the contents of a module's source and override files,
+the compile options and a fingerprint of the translator itself, so they
+stay valid across checkouts, branch switches and restored CI caches.  The
+cache directory can be shared by concurrent builds on one machine: entries
+are written to a temporary file and renamed into place, and the least
+recently used entries are removed once the cache grows beyond its limit.
+"""
+
+import os
+import time
+import tempfile
+try:
+    from hashlib import md5
+except:
+    from md5 import md5
+
+from ast import literal_eval
+
+PYJS_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# sources which determine the output of the translator
+FINGERPRINT_FILES = ['translator.py', 'translator_proto.py',
+                     'translator_dict.py', 'options.py']
+FINGERPRINT_DIRS = ['lib_trans']
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+_fingerprint = None
+
+def file_digest(path):
+    f = open(path, 'rb')
+    try:
+        return md5(f.read()).hexdigest()
+    finally:
+        f.close()
+
+def translator_fingerprint():
+    """returns a hash of the translator sources, so that cache entries
+    made by a different translator version are never used"""
+    global _fingerprint
+    if _fingerprint is None:
+        paths = [os.path.join(PYJS_PATH, name) for name in FINGERPRINT_FILES]
+        for name in FINGERPRINT_DIRS:
+            for root, dirs, files in os.walk(os.path.join(PYJS_PATH, name)):
+                dirs.sort()
+                for fname in sorted(files):
+                    if fname.endswith('.py'):
+                        paths.append(os.path.join(root, fname))
+        h = md5()
+        for path in paths:
+            if os.path.isfile(path):
+                h.update(path[len(PYJS_PATH):])
+                h.update(file_digest(path))
+        _fingerprint = h.hexdigest()
+    return _fingerprint
+
+
+class BuildCache(object):
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                # created by a concurrent build
+                if not os.path.isdir(self.path):
+                    raise
+
+    def key(self, file_names, module_name, translator_opts):
+        """file_names is the module source followed by its overrides,
+        translator_opts the normalized list from get_translator_opts"""
+        h = md5()
+        h.update(translator_fingerprint())
+        h.update(repr(sorted(translator_opts)))
+        h.update(module_name)
+        for file_name in file_names:
+            # the source path ends up in the output as __file__
+            h.update('\0' + os.path.abspath(file_name) + '\0')
+            h.update(file_digest(file_name))
+        return h.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + '.js')
+
+    def __contains__(self, key):
+        return os.path.isfile(self.entry_path(key))
+
+    def get(self, key):
+        """returns (deps, js_libs, js) for key, or None"""
+        path = self.entry_path(key)
+        try:
+            f = open(path, 'rb')
+        except IOError:
+            self.misses += 1
+            return None
+        try:
+            deps = literal_eval(f.readline())
+            js_libs = literal_eval(f.readline())
+            js = f.read()
+        finally:
+            f.close()
+        try:
+            # the modification time records the last use
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return deps, js_libs, js
+
+    def put(self, key, deps, js_libs, js):
+        path = self.entry_path(key)
+        dir_name = os.path.dirname(path)
+        if not os.path.isdir(dir_name):
+            try:
+                os.mkdir(dir_name)
+            except OSError:
+                if not os.path.isdir(dir_name):
+                    raise
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=dir_name)
+        f = os.fdopen(fd, 'wb')
+        try:
+            f.write(repr(deps) + '\n')
+            f.write(repr(js_libs) + '\n')
+            f.write(js)
+        finally:
+            f.close()
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # windows does not replace existing files; the entry is
+            # already there, written by a concurrent build
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def trim(self):
+        """removes the least recently used entries until the cache is no
+        larger than max_size"""
+        if not self.max_size:
+            return
+        entries = []
+        total = 0
+        now = time.time()
+        for root, dirs, files in os.walk(self.path):
+            for fname in files:
+                path = os.path.join(root, fname)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if fname.endswith('.tmp') and now - st.st_mtime < 3600:
+                    # still being written by a concurrent build
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        if total <= self.max_size:
+            return
+        entries.sort()
+        for mtime, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_size:
+                break
@@ -0,0 +1,177 @@
+"""Build profiling for pyjsbuild --profile-build.
+
+The linker records the time of each build phase and of each translated
+module; the translator stores the time it spent parsing, transforming and
+generating code in the dependency manifest of the module.  The report is
+written as JSON and summarized on stdout, most expensive first.
+"""
+
+import os
+import sys
+import time
+import json
+
+from pyjs import util
+
+PHASES = ('parse', 'transform', 'codegen')
+
+
+class BuildProfile(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.start = time.time()
+        self.phases = []
+        self.modules = []
+        self.chunks = []
+        self.tree_shaking = []
+        self.minified = []
+
+    def written_since_start(self, out_file):
+        try:
+            mtime = os.path.getmtime(util.deps_manifest_path(out_file))
+        except OSError:
+            return False
+        # file systems may round the mtime down to the second
+        return mtime >= int(self.start)
+
+    def add_phase(self, name, platform, seconds):
+        self.phases.append(dict(name=name, platform=platform,
+                                seconds=seconds))
+
+    def add_module(self, platform, module_name, file_names, out_file,
+                   seconds, cache_hit=None):
+        """records one call of the translator_func; seconds is the time
+        the linker waited for it, cache_hit whether the build cache had
+        the module (None without a build cache)"""
+        profile = util.read_translation_profile(out_file)
+        if cache_hit:
+            status = 'cache hit'
+        elif profile and self.written_since_start(out_file):
+            status = 'translated'
+        else:
+            # not modified since an earlier build
+            status = 'up to date'
+        if status != 'translated':
+            profile = None
+        module = dict(
+            module=module_name,
+            platform=platform,
+            sources=file_names,
+            out_file=out_file,
+            status=status,
+            seconds=seconds,
+            source_size=sum([os.path.getsize(f) for f in file_names]),
+            output_size=os.path.getsize(out_file),
+        )
+        if profile:
+            for phase in PHASES:
+                module[phase] = profile.get(phase, 0.0)
+            module['read'] = profile.get('read', 0.0)
+            if 'parse_cache_hits' in profile:
+                module['parse_cache_hits'] = profile['parse_cache_hits']
+        self.modules.append(module)
+
+    def add_chunk(self, platform, name, path, modules):
+        """records a chunk written by the linker, holding modules"""
+        self.chunks.append(dict(name=name, platform=platform, path=path,
+                                modules=modules,
+                                size=os.path.getsize(path)))
+
+    def add_tree_shaking(self, platform, module_name, size, saved, removed):
+        """records the functions and classes removed from a module"""
+        self.tree_shaking.append(dict(module=module_name, platform=platform,
+                                      size=size, saved=saved,
+                                      removed=removed))
+
+    def add_minified(self, platform, size, minified):
+        """records the size of the code of platform before and after
+        minifying it"""
+        self.minified.append(dict(platform=platform, size=size,
+                                  minified=minified))
+
+    def cost(self, module):
+        """the time spent translating module, which is more accurate than
+        the time the linker waited if translation ran in parallel"""
+        if 'codegen' in module:
+            return module['read'] + module['codegen']
+        return module['seconds']
+
+    def report(self, output_dir):
+        files = []
+        for root, dirs, names in os.walk(output_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                files.append(dict(path=os.path.relpath(path, output_dir),
+                                  size=os.path.getsize(path)))
+        statuses = {}
+        for module in self.modules:
+            statuses[module['status']] = statuses.get(module['status'], 0) + 1
+        return dict(
+            seconds=time.time() - self.start,
+            phases=self.phases,
+            modules=sorted(self.modules, key=self.cost, reverse=True),
+            module_status=statuses,
+            chunks=sorted(self.chunks, key=lambda c: c['size'],
+                          reverse=True),
+            tree_shaking=sorted(self.tree_shaking, key=lambda t: t['saved'],
+                                reverse=True),
+            minified=self.minified,
+            files=sorted(files, key=lambda f: f['size'], reverse=True),
+        )
+
+    def write(self, output_dir, out=sys.stdout, top=20):
+        report = self.report(output_dir)
+        f = open(self.path, 'w')
+        json.dump(report, f, indent=1, sort_keys=True)
+        f.close()
+
+        print >> out, "Build profile: %.2fs, written to %s" % (
+            report['seconds'], self.path)
+        print >> out
+        print >> out, "%-24s %-10s %9s" % ('phase', 'platform', 'seconds')
+        for phase in sorted(report['phases'], key=lambda p: p['seconds'],
+                            reverse=True):
+            print >> out, "%-24s %-10s %9.3f" % (
+                phase['name'], phase['platform'] or '-', phase['seconds'])
+        print >> out
+        print >> out, ', '.join(["%d %s" % (count, status) for status, count
+                                 in sorted(report['module_status'].items())])
+        print >> out, "%-40s %-10s %-10s %8s %8s %8s %8s %9s" % (
+            'module', 'platform', 'status', 'seconds', 'parse', 'transfrm',
+            'codegen', 'output')
+        for module in report['modules'][:top]:
+            phases = [module.get(phase) for phase in PHASES]
+            print >> out, "%-40s %-10s %-10s %8.3f %8s %8s %8s %9d" % tuple(
+                [module['module'], module['platform'] or '-',
+                 module['status'], self.cost(module)]
+                + [p is None and '-' or "%.3f" % p for p in phases]
+                + [module['output_size']])
+        if report['chunks']:
+            print >> out
+            print >> out, "%-40s %-10s %8s %9s" % ('chunk', 'platform',
+                                                   'modules', 'bytes')
+            for chunk in report['chunks']:
+                print >> out, "%-40s %-10s %8d %9d" % (
+                    chunk['name'], chunk['platform'] or '-',
+                    len(chunk['modules']), chunk['size'])
+        if report['tree_shaking']:
+            print >> out
+            print >> out, "%-40s %-10s %8s %9s %9s" % (
+                'tree shaking', 'platform', 'removed', 'bytes', 'saved')
+            for t in report['tree_shaking'][:top]:
+                print >> out, "%-40s %-10s %8d %9d %9d" % (
+                    t['module'], t['platform'] or '-', len(t['removed']),
+                    t['size'], t['saved'])
+        if report['minified']:
+            print >> out
+            print >> out, "%-40s %-10s %9s %9s" % (
+                'minified', 'platform', 'bytes', 'saved')
+            for m in report['minified']:
+                print >> out, "%-40s %-10s %9d %9d" % (
+                    'app code', m['platform'] or '-', m['size'],
+                    m['size'] - m['minified'])
+        print >> out
+        print >> out, "%-60s %9s" % ('largest output files', 'bytes')
+        for f in report['files'][:top]:
+            print >> out, "%-60s %9d" % (f['path'], f['size'])
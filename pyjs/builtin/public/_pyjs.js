@@ -13,12 +13,9 @@ function $pyjs_kwargs_call(obj, func, star_args, dstar_args, args)
             throw (pyjslib['TypeError'](func['__name__'] + "() arguments after ** must be a dictionary " + pyjslib['repr'](dstar_args)));
         }
         var i;
-        /* use of __iter__ and next is horrendously expensive,
-           use direct access to dictionary instead
-         */
-        for (var keys in dstar_args['__object']) {
-            var k = dstar_args['__object'][keys][0];
-            var v = dstar_args['__object'][keys][1];
+        var kwarg = function(kv) {
+            var k = kv[0];
+            var v = kv[1];
 
             if (pyjslib['var_remap']['indexOf'](k) >= 0) {
                 k = '$$' + k;
@@ -28,6 +25,17 @@ function $pyjs_kwargs_call(obj, func, star_args, dstar_args, args)
                 $pyjs__exception_func_multiple_values(func['__name__'], k);
              }
             args[0][k] = v;
+        };
+        /* use of __iter__ and next is horrendously expensive,
+           use direct access to dictionary instead
+         */
+        if (typeof dstar_args['__map'] == 'object') {
+            // dict backed by a Map, see --enable-native-map
+            dstar_args['__map']['forEach'](kwarg);
+        } else {
+            for (var keys in dstar_args['__object']) {
+                kwarg(dstar_args['__object'][keys]);
+            }
         }
 
     }
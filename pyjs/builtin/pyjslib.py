@@ -16,7 +16,7 @@
 
 # must declare import _before_ importing sys
 
-from __pyjamas__ import INT, JS, setCompilerOptions, debugger
+from __pyjamas__ import INT, NATIVE_MAP, JS, setCompilerOptions, debugger
 
 setCompilerOptions("noDebug", "noBoundMethods", "noDescriptors", "noGetattrSupport", "noAttributeChecking", "noSourceTracking", "noLineTracking", "noStoreSource")
 
@@ -970,23 +970,41 @@ def ___import___(path, context, module_name=None, get_base=True):
         "No module named %s, %s in context %s" % (importName, path, context))
 
 def __dynamic_load__(importName):
-    global __nondynamic_modules__
+    global __nondynamic_modules__, dynamic
     setCompilerOptions("noDebug")
     module = JS("""$pyjs['loaded_modules'][@{{importName}}]""")
-    if sys is None or dynamic is None or __nondynamic_modules__.has_key(importName):
+    if sys is None or __nondynamic_modules__.has_key(importName):
         return module
+    graph = JS("""$pyjs['module_graph']""")
+    if JS("""typeof @{{graph}} != 'undefined' && !@{{graph}}['hasOwnProperty'](@{{importName}})"""):
+        # the linker recorded the modules linked at runtime, the others
+        # are not available
+        __nondynamic_modules__[importName] = 1.0
+        return module
+    if dynamic is None:
+        if not sys.modules.has_key('dynamic'):
+            if JS("""typeof $pyjs['loaded_modules']['dynamic'] == 'undefined'"""):
+                return module
+            ___import___('dynamic', None)
+        m = sys.modules['dynamic']
+        if JS("""typeof @{{m}}['ajax_import'] != 'function'"""):
+            # dynamic is being initialized
+            return module
+        dynamic = m
     if JS("""typeof @{{module}}== 'undefined'"""):
-        try:
-            dynamic.ajax_import("lib/" + importName + ".__" + platform + "__.js")
-            module = JS("""$pyjs['loaded_modules'][@{{importName}}]""")
-        except:
-            pass
-    if JS("""typeof @{{module}}== 'undefined'"""):
-        try:
-            dynamic.ajax_import("lib/" + importName + ".js")
-            module = JS("""$pyjs['loaded_modules'][@{{importName}}]""")
-        except:
-            pass
+        if JS("""typeof @{{graph}} != 'undefined'"""):
+            urls = [JS("""@{{graph}}[@{{importName}}][0]""")]
+        else:
+            urls = ["lib/" + importName + ".__" + platform + "__.js",
+                    "lib/" + importName + ".js"]
+        for url in urls:
+            try:
+                dynamic.ajax_import(url)
+                module = JS("""$pyjs['loaded_modules'][@{{importName}}]""")
+            except:
+                pass
+            if JS("""typeof @{{module}}!= 'undefined'"""):
+                break
         if JS("""typeof @{{module}}== 'undefined'"""):
             __nondynamic_modules__[importName] = 1.0
     return module
@@ -5574,6 +5592,797 @@ class frozenset(set):
 JS("@{{frozenset}}['__str__'] = @{{frozenset}}['__repr__'];")
 JS("@{{frozenset}}['toString'] = @{{frozenset}}['__repr__'];")
 
+# dict, set and frozenset backed by a javascript Map (--enable-native-map).
+# The keys of the Map are the same as the property names above, so objects
+# hash alike with both; but the size is known, iterating needs no property
+# lookups and the items keep their insertion order.  Engines without a Map
+# keep the classes above.
+if NATIVE_MAP() and JS("typeof Map == 'function'"):
+
+    class dict:
+        def __init__(self, seq=JS("[]"), **kwargs):
+            self.__map = JS("new Map()")
+            # Transform data into an array with [key,value] and add to self.__map
+            # Input data can be Array(key, val), iteratable (key,val) or Object/Function
+            def init(_data):
+                JS("""
+            var item, i, n, key, sKey;
+            var data = @{{_data}},
+                selfMap = @{{self}}['__map'];
+
+            if (data === null) {
+                throw @{{TypeError}}("'NoneType' is not iterable");
+            }
+            if (data['constructor'] === Array) {
+            } else if (typeof data['__map'] == 'object') {
+                data['__map']['forEach'](function(kv, sKey) {
+                    selfMap['set'](sKey, kv['slice']());
+                });
+                return null;
+            } else if (typeof data['__object'] == 'object') {
+                data = data['__object'];
+                for (sKey in data) {
+                    selfMap['set'](sKey, data[sKey]['slice']());
+                }
+                return null;
+            } else if (typeof data['__iter__'] == 'function') {
+                if (typeof data['__array'] == 'object') {
+                    data = data['__array'];
+                } else {
+                    var iter = data['__iter__']();
+                    if (typeof iter['__array'] == 'object') {
+                        data = iter['__array'];
+                    }
+                    data = [];
+                    var item, i = 0;
+                    if (typeof iter['$genfunc'] == 'function') {
+                        while (typeof (item=iter['next'](true)) != 'undefined') {
+                            data[i++] = item;
+                        }
+                    } else {
+                        try {
+                            while (true) {
+                                data[i++] = iter['next']();
+                            }
+                        }
+                        catch (e) {
+                            if (!@{{isinstance}}(e, @{{StopIteration}})) throw e;
+                        }
+                    }
+                }
+            } else if (typeof data == 'object' || typeof data == 'function') {
+                for (var key in data) {
+                    var _key = key;
+                    if (key['substring'](0,2) == '$$') {
+                        // handle back mapping of name
+                        // d = dict(comment='value')
+                        // comment will be in the object as $$comment
+                        _key = key['substring'](2);
+                        if (var_remap['indexOf'](_key) < 0) {
+                            _key = key;
+                        }
+                    }
+                    selfMap['set']('$'+_key, [_key, data[key]]);
+                }
+                return null;
+            } else {
+                throw @{{TypeError}}("'" + @{{repr}}(data) + "' is not iterable");
+            }
+            // Assume uniform array content...
+            if ((n = data['length']) == 0) {
+                return null;
+            }
+            i = 0;
+            if (data[0]['constructor'] === Array) {
+                while (i < n) {
+                    item = data[i++];
+                    key = item[0];
+                    sKey = (key===null?null:(typeof key['$H'] != 'undefined'?key['$H']:((typeof key=='string'||key['__number__'])?'$'+key:@{{__hash}}(key))));
+                    selfMap['set'](sKey, [key, item[1]]);
+                }
+                return null;
+            }
+            if (typeof data[0]['__array'] != 'undefined') {
+                while (i < n) {
+                    item = data[i++]['__array'];
+                    key = item[0];
+                    sKey = (key===null?null:(typeof key['$H'] != 'undefined'?key['$H']:((typeof key=='string'||key['__number__'])?'$'+key:@{{__hash}}(key))));
+                    selfMap['set'](sKey, [key, item[1]]);
+                }
+                return null;
+            }
+            i = -1;
+            while (++i < n) {
+                key = data[i]['__getitem__'](0);
+                sKey = (key===null?null:(typeof key['$H'] != 'undefined'?key['$H']:((typeof key=='string'||key['__number__'])?'$'+key:@{{__hash}}(key))));
+                selfMap['set'](sKey, [key, data[i]['__getitem__'](1)]);
+            }
+            return null;
+            """)
+            init(seq)
+            if kwargs:
+                init(kwargs)
+
+        def __hash__(self):
+            raise TypeError("dict objects are unhashable")
+
+        def __setitem__(self, key, value):
+            JS("""
+            if (typeof @{{value}} == 'undefined') {
+                throw @{{ValueError}}("Value for key '" + @{{key}} + "' is undefined");
+            }
+            var sKey = (@{{key}}===null?null:(typeof @{{key}}['$H'] != 'undefined'?@{{key}}['$H']:((typeof @{{key}}=='string'||@{{key}}['__number__'])?'$'+@{{key}}:@{{__hash}}(@{{key}}))));
+            @{{self}}['__map']['set'](sKey, [@{{key}}, @{{value}}]);
+            """)
+
+        def __getitem__(self, key):
+            JS("""
+            var sKey = (@{{key}}===null?null:(typeof @{{key}}['$H'] != 'undefined'?@{{key}}['$H']:((typeof @{{key}}=='string'||@{{key}}['__number__'])?'$'+@{{key}}:@{{__hash}}(@{{key}}))));
+            var value=@{{self}}['__map']['get'](sKey);
+            if (typeof value == 'undefined'){
+                throw @{{KeyError}}(@{{key}});
+            }
+            return value[1];
+            """)
+
+        def __nonzero__(self):
+            return JS("@{{self}}['__map']['size'] > 0")
+
+        def __cmp__(self, other):
+            if not isinstance(other, dict):
+                raise TypeError("dict.__cmp__(x,y) requires y to be a 'dict'")
+            JS("""
+            var self_sKeys = new Array(),
+                other_sKeys = new Array(),
+                selfMap = @{{self}}['__map'],
+                otherMap = @{{other}}['__map'],
+                selfLen = selfMap['size'],
+                otherLen = otherMap['size'];
+            if (selfLen < otherLen) {
+                return -1;
+            }
+            if (selfLen > otherLen) {
+                return 1;
+            }
+            selfMap['forEach'](function(kv, sKey) {
+                self_sKeys['push'](sKey);
+            });
+            otherMap['forEach'](function(kv, sKey) {
+                other_sKeys['push'](sKey);
+            });
+            self_sKeys['sort']();
+            other_sKeys['sort']();
+            var c, sKey;
+            for (var idx = 0; idx < selfLen; idx++) {
+                c = @{{cmp}}(selfMap['get'](sKey = self_sKeys[idx])[0], otherMap['get'](other_sKeys[idx])[0]);
+                if (c != 0) {
+                    return c;
+                }
+                c = @{{cmp}}(selfMap['get'](sKey)[1], otherMap['get'](sKey)[1]);
+                if (c != 0) {
+                    return c;
+                }
+            }
+            return 0;""")
+
+        def __len__(self):
+            return INT(JS("@{{self}}['__map']['size']"))
+
+        def __delitem__(self, key):
+            JS("""
+            var sKey = (@{{key}}===null?null:(typeof @{{key}}['$H'] != 'undefined'?@{{key}}['$H']:((typeof @{{key}}=='string'||@{{key}}['__number__'])?'$'+@{{key}}:@{{__hash}}(@{{key}}))));
+            @{{self}}['__map']['delete'](sKey);
+            """)
+
+        def __contains__(self, key):
+            JS("""
+            var sKey = (@{{key}}===null?null:(typeof @{{key}}['$H'] != 'undefined'?@{{key}}['$H']:((typeof @{{key}}=='string'||@{{key}}['__number__'])?'$'+@{{key}}:@{{__hash}}(@{{key}}))));
+            return @{{self}}['__map']['has'](sKey);
+            """)
+
+        def keys(self):
+            JS("""
+            var keys = @{{list}}(),
+                __array = keys['__array'],
+                i = 0;
+            @{{self}}['__map']['forEach'](function(kv) {
+                __array[i++] = kv[0];
+            });
+            return keys;
+            """)
+
+        @staticmethod
+        def fromkeys(iterable, v = None):
+            d = {}
+            for i in iterable:
+                d[i] = v
+            return d
+
+        def values(self):
+            JS("""
+            var values = @{{list}}(),
+                __array = values['__array'],
+                i = 0;
+            @{{self}}['__map']['forEach'](function(kv) {
+                __array[i++] = kv[1];
+            });
+            return values;
+            """)
+
+        def items(self):
+            JS("""
+            var items = @{{list}}(),
+                __array = items['__array'],
+                i = 0;
+            @{{self}}['__map']['forEach'](function(kv) {
+                __array[i++] = @{{list}}(kv);
+            });
+            return items;
+            """)
+
+        def __iter__(self):
+            JS("""
+            var keys = new Array(),
+                i = 0;
+            @{{self}}['__map']['forEach'](function(kv) {
+                keys[i++] = kv[0];
+            });
+            return new $iter_array(keys);
+            """)
+
+        def __enumerate__(self):
+            JS("""
+            var keys = new Array(),
+                i = 0;
+            @{{self}}['__map']['forEach'](function(kv) {
+                keys[i++] = kv[0];
+            });
+            return new $enumerate_array(keys);
+            """)
+
+        def itervalues(self):
+            return self.values().__iter__();
+
+        def iteritems(self):
+            return self.items().__iter__();
+
+        def setdefault(self, key, default_value):
+            JS("""
+            var sKey = (@{{key}}===null?null:(typeof @{{key}}['$H'] != 'undefined'?@{{key}}['$H']:((typeof @{{key}}=='string'||@{{key}}['__number__'])?'$'+@{{key}}:@{{__hash}}(@{{key}}))));
+            var value = @{{self}}['__map']['get'](sKey);
+            if (typeof value == 'undefined') {
+                @{{self}}['__map']['set'](sKey, value = [@{{key}}, @{{default_value}}]);
+            }
+            return value[1];
+            """)
+
+        def get(self, key, default_value=None):
+            JS("""
+            var selfMap = @{{self}}['__map'];
+            if (selfMap['size'] == 0) return @{{default_value}};
+            var sKey = (@{{key}}===null?null:(typeof @{{key}}['$H'] != 'undefined'?@{{key}}['$H']:((typeof @{{key}}=='string'||@{{key}}['__number__'])?'$'+@{{key}}:@{{__hash}}(@{{key}}))));
+            var value = selfMap['get'](sKey);
+            return typeof value == 'undefined' ? @{{default_value}} : value[1];
+            """)
+
+        def update(self, *args, **kwargs):
+            if args:
+                if len(args) > 1:
+                    raise TypeError("update expected at most 1 arguments, got %d" % len(args))
+                d = args[0]
+                if hasattr(d, "iteritems"):
+                    for k,v in d.iteritems():
+                        self[k] = v
+                elif hasattr(d, "keys"):
+                    for k in d:
+                        self[k] = d[k]
+                else:
+                    for k, v in d:
+                        self[k] = v
+            if kwargs:
+                for k,v in kwargs.iteritems():
+                    self[k] = v
+
+        def pop(self, k, *d):
+            if len(d) > 1:
+                raise TypeError("pop expected at most 2 arguments, got %s" %
+                                (1 + len(d)))
+            try:
+                res = self[k]
+                del self[k]
+                return res
+            except KeyError:
+                if d:
+                    return d[0]
+                else:
+                    raise
+
+        def popitem(self):
+            for k, v in self.iteritems():
+                return (k, v)
+            raise KeyError('popitem(): dictionary is empty')
+
+        def getObject(self):
+            """
+            Return a javascript Object like the one the dict without a Map
+            uses to store dictionary keys and values; it is a copy
+            """
+            JS("""
+            var obj = {};
+            @{{self}}['__map']['forEach'](function(kv, sKey) {
+                obj[sKey] = kv;
+            });
+            return obj;
+            """)
+
+        def copy(self):
+            JS("""
+            var d = @{{__empty_dict}}();
+            // the [key, value] items are never changed, only replaced
+            d['__map'] = new Map(@{{self}}['__map']);
+            return d;
+            """)
+
+        def clear(self):
+            JS("@{{self}}['__map']['clear']();")
+
+        def __repr__(self):
+            if callable(self):
+                return "<type '%s'>" % self.__name__
+            JS("""
+            var items = new Array(),
+                i = 0;
+            @{{self}}['__map']['forEach'](function(kv) {
+                items[i++] = @{{repr}}(kv[0]) + ": " + @{{repr}}(kv[1]);
+            });
+            return "{" + items['join'](", ") + "}";
+            """)
+
+        def toString(self):
+            return self.__repr__()
+
+    JS("@{{dict}}['has_key'] = @{{dict}}['__contains__'];")
+    JS("@{{dict}}['iterkeys'] = @{{dict}}['__iter__'];")
+    JS("@{{dict}}['__str__'] = @{{dict}}['__repr__'];")
+
+    def __empty_dict():
+        JS("""
+        var dict__init__ = @{{dict}}['__init__'];
+        var d;
+        @{{dict}}['__init__'] = function() {
+            this['__map'] = new Map();
+        };
+        d = @{{dict}}();
+        d['__init__'] = @{{dict}}['__init__'] = dict__init__;
+        return d;
+    """)
+
+    class set(object):
+        def __init__(self, _data=None):
+            """ Transform data into an array with [key,value] and add set
+                self.__map
+                Input data can be Array(key, val), iteratable (key,val) or
+                Object/Function
+            """
+            if _data is None:
+                JS("var data = [];")
+            else:
+                JS("var data = @{{_data}};")
+
+            JS("""
+            var item,
+                i,
+                n,
+                selfMap = @{{self}}['__map'] = new Map();
+
+            if (@{{!data}}['constructor'] === Array) {
+            // data is already an Array.
+            // We deal with the Array of data after this if block.
+              }
+
+              // We may have some other set-like thing with __map or __object
+              else if (typeof @{{!data}}['__map'] == 'object') {
+                @{{!data}}['__map']['forEach'](function(value, sVal) {
+                    selfMap['set'](sVal, value);
+                });
+                return null;
+              }
+              else if (typeof @{{!data}}['__object'] == 'object') {
+                var dataObj = @{{!data}}['__object'];
+                for (var sVal in dataObj) {
+                    selfMap['set'](sVal, dataObj[sVal]);
+                }
+                return null;
+              }
+
+              // Something with an __iter__ method
+              else if (typeof @{{!data}}['__iter__'] == 'function') {
+
+                // It has an __array member to iterate over. Make that our data.
+                if (typeof @{{!data}}['__array'] == 'object') {
+                    data = @{{!data}}['__array'];
+                    }
+                else {
+                    // Several ways to deal with the __iter__ method
+                    var iter = @{{!data}}['__iter__']();
+                    // iter has an __array member that's an array. Use that.
+                    if (typeof iter['__array'] == 'object') {
+                        data = iter['__array'];
+                    }
+                    var data = [];
+                    var item, i = 0;
+                    // iter has a ['$genfunc']
+                    if (typeof iter['$genfunc'] == 'function') {
+                        while (typeof (item=iter['next'](true)) != 'undefined') {
+                            @{{!data}}[i++] = item;
+                        }
+                    } else {
+                    // actually use the object's __iter__ method
+                        try {
+                            while (true) {
+                                @{{!data}}[i++] = iter['next']();
+                            }
+                        }
+                        catch (e) {
+                            if (!@{{isinstance}}(e, @{{StopIteration}})) throw e;
+                        }
+                    }
+                }
+              // Check undefined first so isIteratable can do check for __iter__.
+            } else if (!(@{{isUndefined}}(@{{data}})) && @{{isIteratable}}(@{{data}}))
+                {
+                for (var item in @{{data}}) {
+                    selfMap['set'](@{{__hash}}(item), item);
+                }
+                return null;
+            } else {
+                throw @{{TypeError}}("'" + @{{repr}}(@{{!data}}) + "' is not iterable");
+            }
+            n = @{{!data}}['length'];
+            for (i = 0; i < n; i++) {
+                item = @{{!data}}[i];
+                selfMap['set'](@{{__hash}}(item), item);
+            }
+            return null;
+            """)
+
+        def __cmp__(self, other):
+            # We (mis)use cmp here for the missing __gt__/__ge__/...
+            # if self == other : return 0
+            # if self is subset of other: return -1
+            # if self is superset of other: return 1
+            # else return 2
+            if not isSet(other):
+                return 2
+            JS("""
+            var selfMap = @{{self}}['__map'],
+                otherMap = @{{other}}['__map'],
+                selfMismatch = false,
+                otherMismatch = false;
+            if (selfMap === otherMap) {
+                throw @{{TypeError}}("Set operations must use two sets.");
+                }
+            selfMap['forEach'](function(value, sVal) {
+                if (!otherMap['has'](sVal)) selfMismatch = true;
+            });
+            otherMap['forEach'](function(value, sVal) {
+                if (!selfMap['has'](sVal)) otherMismatch = true;
+            });
+            if (selfMismatch && otherMismatch) return 2;
+            if (selfMismatch) return 1;
+            if (otherMismatch) return -1;
+            return 0;
+    """)
+
+        def __contains__(self, value):
+            if isSet(value) == 1: # An instance of set
+                # Use frozenset hash
+                JS("""
+                var hashes = new Array(),
+                    i = 0;
+                @{{value}}['__map']['forEach'](function(v, sVal) {
+                    hashes[i++] = sVal;
+                });
+                hashes['sort']();
+                return @{{self}}['__map']['has'](hashes['join']("|"));
+    """)
+            JS("""return @{{self}}['__map']['has'](@{{__hash}}(@{{value}}));""")
+
+        def __hash__(self):
+            raise TypeError("set objects are unhashable")
+
+        def __iter__(self):
+            JS("""
+            var items = new Array(),
+                i = 0;
+            @{{self}}['__map']['forEach'](function(value) {
+                items[i++] = value;
+            });
+            return new $iter_array(items);
+            """)
+
+        def __len__(self):
+            return INT(JS("@{{self}}['__map']['size']"))
+
+        def __repr__(self):
+            if callable(self):
+                return "<type '%s'>" % self.__name__
+            JS("""
+            var values = new Array(),
+                i = 0;
+            @{{self}}['__map']['forEach'](function(value) {
+                values[i++] = @{{repr}}(value);
+            });
+            return @{{self}}['__name__'] + "([" + values['join'](", ") + "])";
+            """)
+
+        def __and__(self, other):
+            """ Return the intersection of two sets as a new set.
+                only available under --number-classes
+            """
+            if not isSet(other):
+                return NotImplemented
+            return self.intersection(other)
+
+        def __or__(self, other):
+            """ Return the union of two sets as a new set..
+                only available under --number-classes
+            """
+            if not isSet(other):
+                return NotImplemented
+            return self.union(other)
+
+        def __xor__(self, other):
+            """ Return the symmetric difference of two sets as a new set..
+                only available under --number-classes
+            """
+            if not isSet(other):
+                return NotImplemented
+            return self.symmetric_difference(other)
+
+        def  __sub__(self, other):
+            """ Return the difference of two sets as a new Set..
+                only available under --number-classes
+            """
+            if not isSet(other):
+                return NotImplemented
+            return self.difference(other)
+
+        def add(self, value):
+            JS("""@{{self}}['__map']['set'](@{{hash}}(@{{value}}), @{{value}});""")
+            return None
+
+        def clear(self):
+            JS("""@{{self}}['__map']['clear']();""")
+            return None
+
+        def copy(self):
+            return set(self)
+
+        def difference(self, other):
+            """ Return the difference of two sets as a new set.
+                (i.e. all elements that are in this set but not the other.)
+            """
+            if not isSet(other):
+                other = frozenset(other)
+            new_set = set()
+            JS("""
+            var newMap = @{{new_set}}['__map'],
+                otherMap = @{{other}}['__map'];
+            @{{self}}['__map']['forEach'](function(value, sVal) {
+                if (!otherMap['has'](sVal)) {
+                    newMap['set'](sVal, value);
+                }
+            });
+    """)
+            return new_set
+
+        def difference_update(self, other):
+            """ Remove all elements of another set from this set.
+            """
+            if not isSet(other):
+                other = frozenset(other)
+            JS("""
+            var selfMap = @{{self}}['__map'];
+            @{{other}}['__map']['forEach'](function(value, sVal) {
+                selfMap['delete'](sVal);
+            });
+    """)
+            return None
+
+        def discard(self, value):
+            if isSet(value) == 1:
+                value = frozenset(value)
+            JS("""@{{self}}['__map']['delete'](@{{hash}}(@{{value}}));""")
+            return None
+
+        def intersection(self, other):
+            """ Return the intersection of two sets as a new set.
+                (i.e. all elements that are in both sets.)
+            """
+            if not isSet(other):
+                other = frozenset(other)
+            new_set = set()
+            JS("""
+            var newMap = @{{new_set}}['__map'],
+                otherMap = @{{other}}['__map'];
+            @{{self}}['__map']['forEach'](function(value, sVal) {
+                if (otherMap['has'](sVal)) {
+                    newMap['set'](sVal, value);
+                }
+            });
+    """)
+            return new_set
+
+        def intersection_update(self, other):
+            """ Update a set with the intersection of itself and another.
+            """
+            if not isSet(other):
+                other = frozenset(other)
+            JS("""
+            var selfMap = @{{self}}['__map'],
+                otherMap = @{{other}}['__map'];
+            selfMap['forEach'](function(value, sVal) {
+                if (!otherMap['has'](sVal)) {
+                    selfMap['delete'](sVal);
+                }
+            });
+    """)
+            return None
+
+        def isdisjoint(self, other):
+            """ Return True if two sets have a null intersection.
+            """
+            if not isSet(other):
+                other = frozenset(other)
+            JS("""
+            var selfMap = @{{self}}['__map'],
+                otherMap = @{{other}}['__map'],
+                disjoint = true;
+            if (selfMap['size'] > otherMap['size']) {
+                selfMap = otherMap;
+                otherMap = @{{self}}['__map'];
+            }
+            selfMap['forEach'](function(value, sVal) {
+                if (otherMap['has'](sVal)) disjoint = false;
+            });
+            return disjoint;
+    """)
+
+        def issubset(self, other):
+            if not isSet(other):
+                other = frozenset(other)
+            return JS("@{{self}}['__cmp__'](@{{other}}) < 0")
+
+        def issuperset(self, other):
+            if not isSet(other):
+                other = frozenset(other)
+            return JS("(@{{self}}['__cmp__'](@{{other}})|1) == 1")
+
+        def pop(self):
+            JS("""
+            var selfMap = @{{self}}['__map'];
+            if (selfMap['size'] > 0) {
+                var first = selfMap['entries']()['next']()['value'];
+                selfMap['delete'](first[0]);
+                return first[1];
+            }
+            """)
+            raise KeyError("pop from an empty set")
+
+        def remove(self, value):
+            if isSet(value) == 1:
+                val = frozenset(value)
+            else:
+                val = value
+            JS("""
+            if (!@{{self}}['__map']['delete'](@{{hash}}(@{{val}}))) {
+                throw @{{KeyError}}(@{{value}});
+            }
+            """)
+
+        def symmetric_difference(self, other):
+            """ Return the symmetric difference of two sets as a new set.
+                (i.e. all elements that are in exactly one of the sets.)
+            """
+            if not isSet(other):
+                other = frozenset(other)
+            new_set = set()
+            JS("""
+            var newMap = @{{new_set}}['__map'],
+                selfMap = @{{self}}['__map'],
+                otherMap = @{{other}}['__map'];
+            selfMap['forEach'](function(value, sVal) {
+                if (!otherMap['has'](sVal)) {
+                    newMap['set'](sVal, value);
+                }
+            });
+            otherMap['forEach'](function(value, sVal) {
+                if (!selfMap['has'](sVal)) {
+                    newMap['set'](sVal, value);
+                }
+            });
+    """)
+            return new_set
+
+        def symmetric_difference_update(self, other):
+            """ Update a set with the symmetric difference of itself and another.
+            """
+            if not isSet(other):
+                other = frozenset(other)
+            JS("""
+            var selfMap = @{{self}}['__map'];
+            @{{other}}['__map']['forEach'](function(value, sVal) {
+                if (!selfMap['delete'](sVal)) {
+                    selfMap['set'](sVal, value);
+                }
+            });
+    """)
+            return None
+
+        def union(self, other):
+            """ Return the union of two sets as a new set.
+                (i.e. all elements that are in either set.)
+            """
+            new_set = set(self)
+            new_set.update(other)
+            return new_set
+
+        def update(self, data):
+            if not isSet(data):
+                data = frozenset(data)
+            JS("""
+            var selfMap = @{{self}}['__map'];
+            @{{data}}['__map']['forEach'](function(value, sVal) {
+                if (!selfMap['has'](sVal)) {
+                    selfMap['set'](sVal, value);
+                }
+            });
+            """)
+            return None
+
+    JS("@{{set}}['__str__'] = @{{set}}['__repr__'];")
+    JS("@{{set}}['toString'] = @{{set}}['__repr__'];")
+
+    class frozenset(set):
+        def __init__(self, _data=None):
+            if JS("(!('__map' in @{{self}}))"):
+                set.__init__(self, _data)
+
+        def __hash__(self):
+            JS("""
+            var hashes = new Array(), i = 0;
+            @{{self}}['__map']['forEach'](function(value, sVal) {
+                hashes[i++] = sVal;
+            });
+            hashes['sort']();
+            return (@{{self}}['$H'] = hashes['join']("|"));
+    """)
+
+        def add(self, value):
+            raise AttributeError('frozenset is immutable')
+
+        def clear(self):
+            raise AttributeError('frozenset is immutable')
+
+        def difference_update(self, other):
+            raise AttributeError('frozenset is immutable')
+
+        def discard(self, value):
+            raise AttributeError('frozenset is immutable')
+
+        def intersection_update(self, other):
+            raise AttributeError('frozenset is immutable')
+
+        def pop(self):
+            raise AttributeError('frozenset is immutable')
+
+        def symmetric_difference_update(self, other):
+            raise AttributeError('frozenset is immutable')
+
+    JS("@{{frozenset}}['__str__'] = @{{frozenset}}['__repr__'];")
+    JS("@{{frozenset}}['toString'] = @{{frozenset}}['__repr__'];")
+
 
 class property(object):
     # From: http://users.rcn.com/python/download/Descriptor.htm
@@ -6586,7 +7395,8 @@ def isInteger(a):
 def isSet(a):
     JS("""
     if (@{{a}}=== null) return false;
-    if (typeof @{{a}}['__object'] == 'undefined') return false;
+    if (typeof @{{a}}['__object'] == 'undefined'
+        && typeof @{{a}}['__map'] == 'undefined') return false;
     var a_mro = @{{a}}['__mro__'];
     switch (a_mro[a_mro['length']-2]['__md5__']) {
         case @{{set}}['__md5__']:
@@ -1,9 +1,11 @@
 def printFunc(objs, newline):
+    # print of the spidermonkey shell, not the print of the module
+    s = ' '.join([str(i) for i in list(objs)])
     JS("""
-    @{{print}}.apply(this, @{{objs}});
+    print(@{{s}});
     """)
 
 def debugReport(msg):
     JS("""
-    @{{print}}(@{{msg}});
+    print(@{{msg}});
     """)
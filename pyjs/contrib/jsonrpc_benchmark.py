@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""Measure the requests per second of the JSON-RPC services.
+
+Small and large requests, and calls which fail, are answered by the
+process method of JSONRPCServiceBase, which the framework adapters call,
+by the CGI and mongrel2 adapters with in-memory stand-ins for stdin and
+the mongrel2 connection, and on python 3 by process_async of
+pyjs.jsonrpc.asyncio.  Every json library found is measured.
+
+    python -m pyjs.contrib.jsonrpc_benchmark [-n REQUESTS] [-c CODEC]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+from timeit import default_timer as timer
+from optparse import OptionParser
+
+from pyjs import jsonrpc
+from pyjs.jsonrpc.cgihandler import CGIJSONRPCService
+from pyjs.jsonrpc.mongrel2 import Mongrel2JSONRPCService
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+CODECS = jsonrpc.FAST_CODECS + ('simplejson', jsonrpc.json.__name__)
+
+LARGE_PARAM = [dict(id=i, name='item %d' % i, price=i * 0.25,
+                    tags=['a', 'b', 'c'], visible=i % 2 == 0)
+               for i in range(1000)]
+
+
+def echo(param):
+    return param
+
+
+def fail(param):
+    raise ValueError(param)
+
+
+def payloads(codec):
+    dumps = codec.dumps
+    def request(method, param):
+        return dumps({'jsonrpc': '2.0', 'id': 1, 'method': method,
+                      'params': [param]})
+    return [('small', request('echo', 'hello')),
+            ('large', request('echo', LARGE_PARAM)),
+            ('error', request('fail', 'broken'))]
+
+
+class MongrelRequest(object):
+    def __init__(self, body):
+        self.body = body
+
+
+class MongrelConnection(object):
+    """stands in for a mongrel2 handler.Connection"""
+
+    def __init__(self, body):
+        self.request = MongrelRequest(body)
+
+    def recv(self):
+        return self.request
+
+    def reply_http(self, req, response):
+        pass
+
+
+def add_methods(service):
+    service.add_method('echo', echo)
+    service.add_method('fail', fail)
+    return service
+
+
+def base_adapter(codec, debug, data):
+    service = add_methods(jsonrpc.JSONRPCServiceBase(codec=codec,
+                                                     debug=debug))
+    return lambda: service.process(data)
+
+
+def cgi_adapter(codec, debug, data):
+    service = add_methods(CGIJSONRPCService(codec=codec, debug=debug))
+    def call():
+        sys.stdin = StringIO(data)
+        sys.stdout = StringIO()
+        try:
+            service()
+        finally:
+            sys.stdin = sys.__stdin__
+            sys.stdout = sys.__stdout__
+    os.environ['CONTENT_LENGTH'] = str(len(data))
+    return call
+
+
+def mongrel2_adapter(codec, debug, data):
+    service = Mongrel2JSONRPCService(MongrelConnection(data))
+    service.codec = codec
+    service.debug = debug
+    add_methods(service)
+    return service
+
+
+def asyncio_adapter(codec, debug, data):
+    import asyncio
+    from pyjs.jsonrpc.asyncio import JSONRPCService
+    service = add_methods(JSONRPCService(codec=codec, debug=debug))
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return lambda: loop.run_until_complete(service.process_async(data))
+
+
+ADAPTERS = [('base', base_adapter),
+            ('cgi', cgi_adapter),
+            ('mongrel2', mongrel2_adapter)]
+if sys.version_info[0] >= 3:
+    ADAPTERS.append(('asyncio', asyncio_adapter))
+
+
+def measure(call, requests):
+    call()
+    start = timer()
+    for i in range(requests):
+        call()
+    return requests / (timer() - start)
+
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("-n", "--requests", dest="requests", type="int",
+                      default=2000,
+                      help="requests per measurement; the large ones are "
+                           "a tenth of it")
+    parser.add_option("-c", "--codec", dest="codecs", action="append",
+                      help="measure the json library CODEC; may be given "
+                           "more than once (default: all installed)")
+    parser.add_option("--debug", dest="debug", action="store_true",
+                      default=False,
+                      help="format the traceback of failed calls")
+    options, args = parser.parse_args()
+
+    codecs = []
+    for name in options.codecs or CODECS:
+        try:
+            codec = jsonrpc.get_codec(name)
+        except ImportError:
+            if options.codecs:
+                raise
+            continue
+        if codec.name not in [c.name for c in codecs]:
+            codecs.append(codec)
+
+    print("%-12s %-10s %-8s %12s" % ('codec', 'adapter', 'payload',
+                                     'requests/s'))
+    for codec in codecs:
+        for payload, data in payloads(codec):
+            requests = options.requests
+            if payload == 'large':
+                requests = max(1, requests // 10)
+            for adapter, create in ADAPTERS:
+                rps = measure(create(codec, options.debug, data), requests)
+                print("%-12s %-10s %-8s %12.0f" % (codec.name, adapter,
+                                                   payload, rps))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Load test of the JSON-RPC services against a local stand-in server.
+
+Starts a server on a free port of 127.0.0.1 whose methods wait DELAY
+seconds, like a method waiting for a database, and makes REQUESTS calls
+over CONCURRENCY kept-alive connections.  The asyncio server
+(pyjs.jsonrpc.asyncio) runs the method as a coroutine; the threaded
+server answers with the blocking JSONRPCServiceBase.process, one thread
+per connection, as the other adapters do.  Requires python 3.
+
+    python3 -m pyjs.contrib.jsonrpc_load_benchmark [-s asyncio|threaded]
+        [-n REQUESTS] [-c CONCURRENCY] [-d DELAY] [-b BATCH]
+"""
+
+from __future__ import print_function
+
+import json
+import time
+import asyncio
+import threading
+from optparse import OptionParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from pyjs.jsonrpc import JSONRPCServiceBase
+from pyjs.jsonrpc.asyncio import JSONRPCService, onloop
+
+
+def stand_in_methods(service, delay, coroutines):
+    def echo(msg):
+        return msg
+    if coroutines:
+        @onloop
+        def wait(msg):
+            return then_return(asyncio.sleep(delay), msg)
+    else:
+        def wait(msg):
+            time.sleep(delay)
+            return msg
+    service.add_method('echo', echo)
+    service.add_method('wait', wait)
+
+
+def then_return(awaitable, value):
+    future = asyncio.ensure_future(awaitable)
+    result = asyncio.get_event_loop().create_future()
+    future.add_done_callback(lambda f: result.set_result(value))
+    return result
+
+
+def start_asyncio_server(loop, delay):
+    service = JSONRPCService()
+    stand_in_methods(service, delay, True)
+    server = loop.run_until_complete(service.serve('127.0.0.1', 0))
+    return server, server.sockets[0].getsockname()[1]
+
+
+def start_threaded_server(delay):
+    service = JSONRPCServiceBase()
+    stand_in_methods(service, delay, False)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            data = self.rfile.read(int(self.headers['Content-Length']))
+            body = service.process(data.decode('utf-8')).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json-rpc')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        # accept all the connections of the clients at once
+        request_queue_size = 1024
+
+    server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, server.server_address[1]
+
+
+class LoadClient(asyncio.Protocol):
+    """posts request, waits for the response and posts it again until
+    the shared counter runs out"""
+
+    def __init__(self, request, counter, latencies, finished):
+        self.request = request
+        self.counter = counter
+        self.latencies = latencies
+        self.finished = finished
+        self.buffer = b''
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.send()
+
+    def send(self):
+        if self.counter[0] <= 0:
+            self.transport.close()
+            return
+        self.counter[0] -= 1
+        self.buffer = b''
+        self.start = time.time()
+        self.transport.write(self.request)
+
+    def data_received(self, data):
+        self.buffer += data
+        end = self.buffer.find(b'\r\n\r\n')
+        if end < 0:
+            return
+        length = 0
+        for line in self.buffer[:end].split(b'\r\n')[1:]:
+            name, sep, value = line.partition(b':')
+            if name.strip().lower() == b'content-length':
+                length = int(value)
+        if len(self.buffer) < end + 4 + length:
+            return
+        self.latencies.append(time.time() - self.start)
+        self.send()
+
+    def connection_lost(self, exc):
+        if not self.finished.done():
+            self.finished.set_result(None)
+
+
+def http_request(port, body):
+    return ('POST / HTTP/1.1\r\nHost: 127.0.0.1:%d\r\n'
+            'Content-Type: application/json-rpc\r\n'
+            'Content-Length: %d\r\n\r\n' % (port, len(body))).encode('latin-1') \
+        + body
+
+
+def run_clients(loop, port, options):
+    calls = [{'jsonrpc': '2.0', 'id': i, 'method': options.method,
+              'params': ['x' * options.size]}
+             for i in range(options.batch)]
+    if options.batch == 1:
+        body = json.dumps(calls[0])
+    else:
+        body = json.dumps(calls)
+    request = http_request(port, body.encode('utf-8'))
+    counter = [options.requests]
+    latencies = []
+    finished = []
+    connections = []
+    for i in range(options.concurrency):
+        future = loop.create_future()
+        finished.append(future)
+        connections.append(loop.create_connection(
+            lambda future=future: LoadClient(request, counter, latencies,
+                                             future),
+            '127.0.0.1', port))
+    start = time.time()
+    loop.run_until_complete(asyncio.gather(*connections))
+    loop.run_until_complete(asyncio.gather(*finished))
+    return time.time() - start, sorted(latencies)
+
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("-s", "--server", dest="server", default="asyncio",
+                      choices=["asyncio", "threaded"],
+                      help="asyncio or threaded (default asyncio)")
+    parser.add_option("-n", "--requests", dest="requests", type="int",
+                      default=5000, help="number of HTTP requests")
+    parser.add_option("-c", "--concurrency", dest="concurrency", type="int",
+                      default=200, help="number of connections")
+    parser.add_option("-d", "--delay", dest="delay", type="float",
+                      default=0.01,
+                      help="seconds the stand-in method waits; with 0 "
+                           "the echo method is called")
+    parser.add_option("-b", "--batch", dest="batch", type="int", default=1,
+                      help="calls per request, sent as a JSON-RPC 2.0 batch "
+                           "if more than 1")
+    parser.add_option("--size", dest="size", type="int", default=16,
+                      help="length of the string parameter")
+    options, args = parser.parse_args()
+    options.method = options.delay and 'wait' or 'echo'
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    if options.server == 'asyncio':
+        server, port = start_asyncio_server(loop, options.delay)
+    else:
+        server, port = start_threaded_server(options.delay)
+    try:
+        seconds, latencies = run_clients(loop, port, options)
+    finally:
+        if options.server == 'asyncio':
+            server.close()
+        else:
+            server.shutdown()
+    count = len(latencies)
+    print("%s server: %d requests (%d calls) over %d connections in %.2fs" % (
+        options.server, count, count * options.batch, options.concurrency,
+        seconds))
+    print("%10.0f requests/s %10.0f calls/s" % (
+        count / seconds, count * options.batch / seconds))
+    print("latency: p50 %.1fms p99 %.1fms max %.1fms" % (
+        latencies[count // 2] * 1000, latencies[int(count * 0.99)] * 1000,
+        latencies[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
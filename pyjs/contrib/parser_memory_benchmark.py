@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Measure the memory used to parse a module with the lib_trans parser.
+
+Each file is parsed in a fresh process, without the parse tree cache, and
+the growth of the peak resident set size is reported together with the
+number of nodes and the memory still held by the finished tree.  Defaults
+to the bundled pyjslib.py.
+
+    python -m pyjs.contrib.parser_memory_benchmark [file.py ...]
+"""
+
+import os
+import sys
+import gc
+import resource
+import subprocess
+from optparse import OptionParser
+
+import pyjs
+from pyjs import translator_proto
+
+compiler = translator_proto.compiler
+
+PYJS_PATH = os.path.dirname(os.path.abspath(pyjs.__file__))
+DEFAULT_FILES = [os.path.join(PYJS_PATH, 'builtin', 'pyjslib.py')]
+
+
+def peak_rss():
+    """peak resident set size of this process in kilobytes"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        rss /= 1024
+    return rss
+
+
+def tree_size(tree):
+    """returns (number of nodes, bytes held by the nodes)"""
+    count = 0
+    size = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        count += 1
+        size += sys.getsizeof(node)
+        node_dict = getattr(node, '__dict__', None)
+        if node_dict:
+            size += sys.getsizeof(node_dict)
+        stack.extend([child for child in node.getChildNodes()
+                      if isinstance(child, compiler.ast.Node)])
+    return count, size
+
+
+def measure(file_name):
+    f = open(file_name, 'U')
+    src = f.read() + '\n'
+    f.close()
+    gc.collect()
+    before = peak_rss()
+    tree = compiler.transformer.parse(src)
+    after = peak_rss()
+    nodes, size = tree_size(tree)
+    print "%-30s %8d nodes %8d KB tree %8d KB peak growth" % (
+        os.path.basename(file_name), nodes, size / 1024, after - before)
+
+
+def main():
+    parser = OptionParser(usage="%prog [file.py ...]")
+    parser.add_option("--measure", dest="measure", action="store_true",
+                      default=False, help="measure in this process")
+    options, args = parser.parse_args()
+    file_names = [os.path.abspath(f) for f in args or DEFAULT_FILES]
+    if options.measure:
+        for file_name in file_names:
+            measure(file_name)
+        return
+    for file_name in file_names:
+        # ru_maxrss never goes down, so every file gets its own process
+        subprocess.call([sys.executable, '-m',
+                         'pyjs.contrib.parser_memory_benchmark',
+                         '--measure', file_name])
+
+
+if __name__ == '__main__':
+    main()
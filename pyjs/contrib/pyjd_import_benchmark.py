@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Measure cold and warm starts of the pyjd importer code cache.
+
+Every module of pyjswidgets is merged with its override for the platform
+and compiled, as the pyjd importer does on a first start, with an empty
+code cache; then the code is loaded from the cache, as on the next starts.
+The importer itself needs a desktop runner, so its parsers are set up here
+the same way.
+
+    python -m pyjs.contrib.pyjd_import_benchmark [-p PLATFORM] [dir ...]
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+from timeit import default_timer as timer
+from optparse import OptionParser
+
+import pyjswidgets
+from pyjs.runners import codecache
+from pyjs.runners.modcompile import PlatformParser, Module
+
+DEFAULT_DIRS = [os.path.dirname(os.path.abspath(pyjswidgets.__file__))]
+
+
+def module_files(dirs):
+    """the .py files in dirs, without the platform overrides"""
+    file_names = []
+    for top in dirs:
+        for root, dir_names, names in os.walk(top):
+            for name in sorted(names):
+                if name.endswith('.py') and name.count('.') == 1:
+                    file_names.append(os.path.join(root, name))
+    return file_names
+
+
+def start(file_names, platform, cache):
+    """imports file_names like the pyjd importer; returns the number of
+    modules and the seconds it took"""
+    pp = PlatformParser(verbose=False)
+    pp.platform = platform
+    parser = PlatformParser(verbose=False, chain_plat=pp)
+    def compile(modname, file_name):
+        mod, file_name = parser.parseModule(modname, file_name)
+        code = Module(mod, file_name)
+        code.compile()
+        return code.getCode()
+    count = 0
+    begin = timer()
+    for file_name in file_names:
+        modname = os.path.splitext(os.path.basename(file_name))[0]
+        chain = [file_name]
+        platform_file = parser.checkOverridePlatformFile(file_name)
+        if platform_file:
+            chain.append(platform_file)
+        try:
+            cache.compile(chain, lambda: compile(modname, file_name))
+        except Exception, e:
+            # not every module compiles for every platform
+            print >> sys.stderr, "%s: %s" % (file_name, e)
+            continue
+        count += 1
+    return count, timer() - begin
+
+
+def main():
+    parser = OptionParser(usage="%prog [options] [dir ...]")
+    parser.add_option("-p", "--platform", dest="platform",
+                      default="hulahop",
+                      help="platform of the overrides (default hulahop)")
+    parser.add_option("-r", "--repeat", dest="repeat", type="int",
+                      default=3, help="number of warm starts")
+    options, args = parser.parse_args()
+    file_names = module_files(args or DEFAULT_DIRS)
+
+    tmp = tempfile.mkdtemp()
+    try:
+        cache = codecache.CodeCache(os.path.join(tmp, 'importcache'))
+        count, cold = start(file_names, options.platform, cache)
+        print "%-12s %5d modules %8.3fs (%d compiled)" % (
+            'cold start', count, cold, cache.misses)
+        for i in range(options.repeat):
+            cache.hits = cache.misses = 0
+            count, warm = start(file_names, options.platform, cache)
+            print "%-12s %5d modules %8.3fs (%d from the cache)" % (
+                'warm start', count, warm, cache.hits)
+        print "speedup %.1fx" % (cold / warm)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+"""Measure the pyjamas runtime with the benchmarks in examples/benchmark.
+
+The benchmark modules (by default every *Benchmark.py module there) are
+translated with the given translator options and run under the
+spidermonkey shell, pyv8 or, for comparison, standard python; each bench
+method prints its operations per second.  With --group the benchmarks are
+translated and run once for each option group (speed, strict or debug,
+on top of the other translator options; default is without a group), and
+the results are tabled side by side.
+
+With --history, the results are appended to a file of one json record per
+engine and group, and compared with the last record of the same engine
+and group there; a benchmark which got slower by more than the tolerance
+is reported as a regression, and the exit status is 1.
+
+    python -m pyjs.contrib.runtime_benchmark [-e ENGINE] [--js COMMAND]
+        [-t SECONDS] [-g GROUP ...] [--history FILE] [translator options]
+        [benchmark ...]
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import shlex
+import shutil
+import tempfile
+import subprocess
+from optparse import OptionParser
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+import pyjs
+from pyjs import translator, options as compile_options
+
+BENCHMARK_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)))), 'examples', 'benchmark')
+
+ENGINES = ('spidermonkey', 'pyv8', 'python')
+
+MAIN = 'RunBenchmarks'
+
+GROUPS = {
+    'default': {},
+    'speed': dict(compile_options.speed_options),
+    'strict': dict(compile_options.pythonic_options),
+    'debug': dict(compile_options.debug_options),
+}
+
+RESULT = re.compile(r'^(\w+\.\w+) ([0-9.]+) ops/s$')
+
+
+def benchmark_names(dir_name):
+    names = []
+    for file_name in sorted(glob.glob(os.path.join(dir_name,
+                                                   '*Benchmark.py'))):
+        name = os.path.splitext(os.path.basename(file_name))[0]
+        if name != 'Benchmark':
+            names.append(name)
+    return names
+
+
+def write_main(dir_name, names, min_time):
+    """writes the module running the benchmarks names"""
+    lines = ['import Benchmark',
+             'Benchmark.Benchmark.min_time = %r' % min_time]
+    for name in names:
+        lines.append('from %s import %s' % (name, name))
+        lines.append('%s().run()' % name)
+    f = open(os.path.join(dir_name, MAIN + '.py'), 'w')
+    try:
+        f.write('\n'.join(lines) + '\n')
+    finally:
+        f.close()
+
+
+def build(linker_class, output, path, translator_arguments):
+    l = linker_class([MAIN], output=output, path=path,
+                     translator_arguments=translator_arguments)
+    l()
+    return os.path.join(output, MAIN + pyjs.MOD_SUFFIX)
+
+
+def read_output(command, env=None):
+    """runs command, echoing its output; returns the exit status and the
+    output"""
+    p = subprocess.Popen(command, stdout=subprocess.PIPE, env=env)
+    lines = []
+    for line in iter(p.stdout.readline, ''):
+        sys.stdout.write(line)
+        sys.stdout.flush()
+        lines.append(line)
+    return p.wait(), ''.join(lines)
+
+
+class Output(object):
+    """stands in for sys.stdout, echoing and keeping what is written"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.parts = []
+
+    def write(self, s):
+        self.stream.write(s)
+        self.parts.append(s)
+
+    def flush(self):
+        self.stream.flush()
+
+    def getvalue(self):
+        return ''.join(self.parts)
+
+
+def run_spidermonkey(output, path, translator_arguments, js):
+    from pyjs.sm import SpidermonkeyLinker
+    app = build(SpidermonkeyLinker, output, path, translator_arguments)
+    return read_output(shlex.split(js) + [app])
+
+
+def run_pyv8(output, path, translator_arguments, js):
+    import PyV8
+    from pyjs.pyv8.linker import PyV8Linker
+    from pyjs.pyv8.jsglobal import Global
+    app = build(PyV8Linker, output, path, translator_arguments)
+    f = open(app)
+    try:
+        txt = f.read()
+    finally:
+        f.close()
+    g = Global([MAIN], path)
+    ctxt = PyV8.JSContext(g)
+    g.__context__ = ctxt
+    stdout = sys.stdout
+    sys.stdout = Output(stdout)
+    ctxt.enter()
+    try:
+        ctxt.eval(txt)
+    finally:
+        ctxt.leave()
+        output, sys.stdout = sys.stdout, stdout
+    return 0, output.getvalue()
+
+
+def run_python(output, path, translator_arguments, js):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(path)
+    # nothing is translated; MAIN is written to the first directory
+    return read_output([pyjs.PYTHON, os.path.join(path[0], MAIN + '.py')],
+                       env)
+
+
+def parse_results(output):
+    """returns {benchmark: operations per second} of the lines printed by
+    Benchmark.run, e.g. {'ReBenchmark.benchMatch': 19700.0}"""
+    results = {}
+    for line in output.splitlines():
+        m = RESULT.match(line.strip())
+        if m:
+            results[m.group(1)] = float(m.group(2))
+    return results
+
+
+def group_arguments(translator_arguments, group):
+    """returns translator_arguments with the options of group; print
+    statements stay enabled (speed disables them), they report the
+    results"""
+    args = dict(translator_arguments)
+    args.update(GROUPS[group])
+    args['print_statements'] = True
+    return args
+
+
+def print_table(groups, results):
+    names = set()
+    for group in groups:
+        names.update(results[group])
+    width = max([len(name) for name in names] + [len('benchmark')])
+    print
+    print ' '.join(['%-*s' % (width, 'benchmark')] +
+                   ['%14s' % group for group in groups])
+    for name in sorted(names):
+        row = ['%-*s' % (width, name)]
+        for group in groups:
+            if name in results[group]:
+                row.append('%14.1f' % results[group][name])
+            else:
+                row.append('%14s' % '-')
+        print ' '.join(row)
+
+
+def read_history(file_name):
+    """returns the records in the history file file_name, oldest first"""
+    records = []
+    if not os.path.exists(file_name):
+        return records
+    f = open(file_name)
+    try:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    finally:
+        f.close()
+    return records
+
+
+def append_history(file_name, records):
+    f = open(file_name, 'a')
+    try:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True) + '\n')
+    finally:
+        f.close()
+
+
+def compare(previous, record, tolerance):
+    """prints the changes from the previous record; returns the names of
+    the benchmarks which got slower by more than tolerance"""
+    regressions = []
+    print
+    print "%s, %s: compared with %s" % (record['engine'], record['group'],
+                                        previous['date'])
+    for name in sorted(record['results']):
+        rate = record['results'][name]
+        before = previous['results'].get(name)
+        if not before:
+            print "  %-40s %14.1f %8s" % (name, rate, 'new')
+            continue
+        change = rate / before - 1
+        flag = ''
+        if change < -tolerance:
+            flag = 'REGRESSION'
+            regressions.append(name)
+        print "  %-40s %14.1f %+7.1f%% %s" % (name, rate, change * 100, flag)
+    return regressions
+
+
+def main():
+    parser = OptionParser(usage="%prog [options] [benchmark ...]")
+    parser.add_option("-e", "--engine", dest="engine",
+                      default="spidermonkey", choices=ENGINES,
+                      help="spidermonkey, pyv8 or python "
+                           "(default spidermonkey)")
+    parser.add_option("--js", dest="js", default="js",
+                      help="command of the spidermonkey shell (default js)")
+    parser.add_option("-t", "--min-time", dest="min_time", type="float",
+                      default=0.5,
+                      help="seconds a measurement takes at least")
+    parser.add_option("--benchmark-dir", dest="benchmark_dir",
+                      default=BENCHMARK_DIR,
+                      help="directory of the benchmark modules")
+    parser.add_option("-g", "--group", dest="groups", action="append",
+                      choices=sorted(GROUPS),
+                      help="translate and run with the options of GROUP "
+                           "(speed, strict, debug or default); may be "
+                           "given more than once")
+    parser.add_option("--history", dest="history",
+                      help="append the results to the file HISTORY and "
+                           "compare them with the previous ones there")
+    parser.add_option("--tolerance", dest="tolerance", type="float",
+                      default=0.2,
+                      help="fraction by which a benchmark may get slower "
+                           "before it is a regression (default 0.2)")
+    translator.add_compile_options(parser)
+    # the results are printed
+    parser.set_defaults(print_statements=True)
+    options, args = parser.parse_args()
+
+    names = args or benchmark_names(options.benchmark_dir)
+    if not names:
+        parser.error("no benchmarks in %s" % options.benchmark_dir)
+    groups = options.groups or ['default']
+    translator_arguments = translator.get_compile_options(options)
+    run = globals()['run_' + options.engine]
+
+    results = {}
+    tmp = tempfile.mkdtemp()
+    try:
+        write_main(tmp, names, options.min_time)
+        path = [tmp, os.path.abspath(options.benchmark_dir)] + pyjs.path
+        for group in groups:
+            if len(groups) > 1:
+                print "== %s" % group
+            # the output of each group in its own directory, so that
+            # nothing translated with other options is used
+            status, output = run(os.path.join(tmp, group), path,
+                                 group_arguments(translator_arguments,
+                                                 group),
+                                 options.js)
+            if status:
+                sys.exit(status)
+            results[group] = parse_results(output)
+    finally:
+        shutil.rmtree(tmp)
+
+    if len(groups) > 1:
+        print_table(groups, results)
+    if not options.history:
+        return
+
+    history = read_history(options.history)
+    date = time.strftime('%Y-%m-%d %H:%M:%S')
+    records = []
+    regressions = []
+    for group in groups:
+        record = dict(date=date, engine=options.engine, group=group,
+                      results=results[group])
+        for previous in reversed(history):
+            if (previous['engine'], previous['group']) == \
+               (options.engine, group):
+                regressions += compare(previous, record, options.tolerance)
+                break
+        records.append(record)
+    append_history(options.history, records)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""Measure the speed of the translator in AST nodes per second.
+
+By default the bundled pyjslib.py and the modules of examples/libtest are
+translated; other files can be given on the command line.  Parsing is not
+included in the timings.
+
+    python -m pyjs.contrib.translator_benchmark [-r REPEAT] [file.py ...]
+"""
+
+import os
+import sys
+import glob
+from timeit import default_timer as timer
+from optparse import OptionParser
+from six.moves import cStringIO as StringIO
+
+import pyjs
+from pyjs import translator_proto
+from pyjs.options import all_compile_options
+
+compiler = translator_proto.compiler
+
+PYJS_PATH = os.path.dirname(os.path.abspath(pyjs.__file__))
+DEFAULT_FILES = [os.path.join(PYJS_PATH, 'builtin', 'pyjslib.py')] + \
+    sorted(glob.glob(os.path.join(PYJS_PATH, os.pardir,
+                                  'examples', 'libtest', '*.py')))
+
+
+def count_nodes(node):
+    count = 1
+    for child in node.getChildNodes():
+        if isinstance(child, compiler.ast.Node):
+            count += count_nodes(child)
+    return count
+
+
+def translate_file(file_name, repeat):
+    """returns (number of nodes, best translation time in seconds)"""
+    module_name = os.path.splitext(os.path.basename(file_name))[0]
+    f = open(file_name)
+    src = f.read()
+    f.close()
+    best = None
+    for i in range(repeat):
+        # the translator annotates the tree, so use a fresh one every time
+        tree = compiler.parseFile(file_name)
+        nodes = count_nodes(tree)
+        start = timer()
+        translator_proto.Translator(compiler, module_name, file_name, src,
+                                    tree, StringIO(), **all_compile_options)
+        elapsed = timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return nodes, best
+
+
+def main():
+    parser = OptionParser(usage="%prog [options] [file.py ...]")
+    parser.add_option("-r", "--repeat", dest="repeat", type="int",
+                      default=3,
+                      help="translate each file REPEAT times and report "
+                           "the fastest run")
+    options, args = parser.parse_args()
+    file_names = [os.path.abspath(f) for f in args or DEFAULT_FILES]
+
+    total_nodes = 0
+    total_time = 0.0
+    for file_name in file_names:
+        try:
+            nodes, elapsed = translate_file(file_name, options.repeat)
+        except Exception, e:
+            # some of the libtest modules are not meant to be translated
+            print >> sys.stderr, "%s: %s" % (file_name, e)
+            continue
+        total_nodes += nodes
+        total_time += elapsed
+        print "%-40s %8d nodes %8.3fs %10.0f nodes/s" % (
+            os.path.basename(file_name), nodes, elapsed, nodes / elapsed)
+    if total_time:
+        print "%-40s %8d nodes %8.3fs %10.0f nodes/s" % (
+            'total', total_nodes, total_time, total_nodes / total_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,55 +1,267 @@
 import sys
+import inspect
 import traceback
+import threading
 
 # some dog's dinner random ways to get a json library from somewhere...
 try:
     import json
-except ImportError, e:
+except ImportError:
     try:
         import gluon.contrib.simplejson as json
-    except ImportError, e:
+    except ImportError:
         import simplejson as json
 
+try:
+    string_types = basestring
+except NameError:
+    # python 3, for pyjs.jsonrpc.asyncio
+    string_types = str
+
+# json libraries which are faster than the one above, fastest first
+FAST_CODECS = ('orjson', 'ujson')
+
+class JSONCodec(object):
+    """the json functions used by a service, see get_codec"""
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+def get_codec(name=None):
+    """returns the JSONCodec of the json library name, by default of the
+    fastest one installed"""
+    if name is None:
+        names = FAST_CODECS
+    else:
+        names = [name]
+    for codec_name in names:
+        if codec_name == json.__name__:
+            return JSONCodec(json.__name__, json.loads, json.dumps)
+        try:
+            module = __import__(codec_name)
+        except ImportError:
+            continue
+        if codec_name == 'orjson':
+            # encodes to bytes, and refuses some of what json encodes, like
+            # integers beyond 64 bits; json encodes those
+            def dumps(obj, orjson_dumps=module.dumps,
+                      option=module.OPT_NON_STR_KEYS):
+                try:
+                    return orjson_dumps(obj, option=option).decode('utf-8')
+                except TypeError:
+                    return json.dumps(obj)
+            return JSONCodec(codec_name, module.loads, dumps)
+        return JSONCodec(codec_name, module.loads, module.dumps)
+    if name is not None:
+        raise ImportError('No json library named %s' % name)
+    return JSONCodec(json.__name__, json.loads, json.dumps)
+
+# the responses, with the members of the message filled in by the
+# encoded values instead of encoding a new dict for every message
+RESPONSE = '{"version": "1.1", "id": %s, "result": %s, "error": null}'
+ERROR = '{"id": %s, "version": "1.1", "error": ' \
+        '{"name": "JSONRPCError", "code": %s, "message": %s}}'
+BATCH_RESPONSE = '{"jsonrpc": "2.0", "id": %s, "result": %s}'
+BATCH_ERROR = '{"jsonrpc": "2.0", "id": %s, ' \
+              '"error": {"code": %s, "message": %s}}'
+BATCH_ERROR_DATA = '{"jsonrpc": "2.0", "id": %s, ' \
+                   '"error": {"code": %s, "message": %s, "data": %s}}'
+
+# error codes of JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
 # this base class, use it to call self.process
 class JSONRPCServiceBase:
 
-    def __init__(self):
+    # number of threads which run the calls of a batch concurrently; with
+    # 0 or 1 they are made one after the other, in the order of the batch
+    batch_workers = 0
+    _batch_pools = {}
+    _batch_pool_lock = threading.Lock()
+    # the json library, see get_codec
+    codec = get_codec()
+    # whether the errors of failed calls include the traceback
+    debug = False
+
+    def __init__(self, batch_workers=None, codec=None, debug=None):
         self.methods={}
+        if batch_workers is not None:
+            self.batch_workers = batch_workers
+        if codec is not None:
+            self.codec = codec
+        if debug is not None:
+            self.debug = debug
 
     def response(self, mid, result):
-        return json.dumps({'version': '1.1', 'id':mid,
-                                 'result':result, 'error':None})
+        dumps = self.codec.dumps
+        return RESPONSE % (dumps(mid), dumps(result))
+
     def error(self, mid, code, message):
-        return json.dumps({'id': mid,
-                                 'version': '1.1',
-                                 'error': {'name': 'JSONRPCError',
-                                           'code': code,
-                                           'message': message
-                                           }
-                                     })
+        dumps = self.codec.dumps
+        return ERROR % (dumps(mid), dumps(code), dumps(message))
+
+    def batch_response(self, mid, result):
+        dumps = self.codec.dumps
+        return BATCH_RESPONSE % (dumps(mid), dumps(result))
+
+    def batch_error(self, mid, code, message, data=None):
+        dumps = self.codec.dumps
+        if data is None:
+            return BATCH_ERROR % (dumps(mid), dumps(code), dumps(message))
+        return BATCH_ERROR_DATA % (dumps(mid), dumps(code), dumps(message),
+                                   dumps(data))
 
     def add_method(self, name, method):
         self.methods[name] = method
 
+    def call(self, func, params):
+        """calls func with params, a list of positional or a dict of named
+        arguments"""
+        if isinstance(params, dict):
+            return func(**params)
+        return func(*params)
+
+    def valid_params(self, func, params):
+        """whether params, a list or a dict, fit the arguments of func;
+        callables which can not be inspected, like builtins, take any"""
+        if not isinstance(params, (list, dict)):
+            return False
+        if not (inspect.isfunction(func) or inspect.ismethod(func)):
+            return True
+        try:
+            if isinstance(params, dict):
+                inspect.getcallargs(func, **params)
+            else:
+                inspect.getcallargs(func, *params)
+        except TypeError:
+            return False
+        return True
+
     def process(self, data):
-        data = json.loads(data)
-        msgid, method, params = data["id"], data["method"], data["params"]
-        if method in self.methods:
-            try:
-                result =self.methods[method](*params)
-                return self.response(msgid, result)
-            except BaseException:
-                etype, eval, etb = sys.exc_info()
-                tb = traceback.format_tb(etb)
-                return self.error(msgid, 100, '%s: %s\n%s' % \
-                        (etype.__name__, eval, '\n'.join(tb)))
-            except:
-                etype, eval, etb = sys.exc_info()
-                tb = traceback.format_tb(etb)
-                return self.error(msgid, 100, '%s: %s\n%s' % \
-                        (etype.__name__, eval, '\n'.join(tb)))
+        try:
+            data = self.codec.loads(data)
+        except ValueError:
+            return self.batch_error(None, PARSE_ERROR, 'Parse error')
+        if isinstance(data, list):
+            return self.process_batch(data)
+        try:
+            msgid, method, params = \
+                data["id"], data["method"], data["params"]
+        except (KeyError, TypeError):
+            # not a request object
+            return self.batch_error(None, INVALID_REQUEST, 'Invalid Request')
+        func = self.methods.get(method)
+        if func is None:
+            return self.missing_method_response(msgid, method)
+        if not self.valid_params(func, params):
+            return self.invalid_params_response(msgid, method)
+        try:
+            return self.response(msgid, self.call(func, params))
+        except:
+            return self.exception_response(msgid, sys.exc_info())
+
+    def exception_response(self, msgid, exc_info, batch=False):
+        """the error response to a call which raised an exception; the
+        traceback is only formatted in debug mode"""
+        etype, eval, etb = exc_info
+        message = '%s: %s' % (etype.__name__, eval)
+        tb = None
+        if self.debug:
+            tb = '\n'.join(traceback.format_tb(etb))
+        if batch:
+            return self.batch_error(msgid, SERVER_ERROR, message, tb)
+        if tb is not None:
+            message = '%s\n%s' % (message, tb)
+        return self.error(msgid, 100, message)
+
+    def missing_method_response(self, msgid, method, batch=False):
+        message = 'method "%s" does not exist' % method
+        if batch:
+            return self.batch_error(msgid, METHOD_NOT_FOUND, message)
+        return self.error(msgid, 100, message)
+
+    def invalid_params_response(self, msgid, method, batch=False):
+        message = 'invalid params for method "%s"' % method
+        if batch:
+            return self.batch_error(msgid, INVALID_PARAMS, message)
+        return self.error(msgid, 100, message)
+
+    def is_batch_request(self, request):
+        """whether request is a valid request object of a batch"""
+        return isinstance(request, dict) and \
+               isinstance(request.get('method'), string_types) and \
+               isinstance(request.get('params', []), (list, dict))
+
+    def process_batch(self, batch):
+        """handles a JSON-RPC 2.0 batch; returns the array of responses,
+        or an empty string if the batch holds only notifications"""
+        if not batch:
+            return self.batch_error(None, INVALID_REQUEST, 'Invalid Request')
+        pool = None
+        if self.batch_workers > 1 and len(batch) > 1:
+            pool = self.get_batch_pool()
+        if pool is None:
+            responses = map(self.process_batch_request, batch)
         else:
-            return self.error(msgid, 100, 'method "%s" does not exist' % method)
+            responses = pool.map(self.process_batch_request, batch)
+        responses = [r for r in responses if r is not None]
+        if not responses:
+            return ''
+        return '[%s]' % ', '.join(responses)
+
+    def process_batch_request(self, request):
+        """handles one request of a batch; returns None for notifications"""
+        if not self.is_batch_request(request):
+            return self.batch_error(None, INVALID_REQUEST, 'Invalid Request')
+        msgid = request.get('id')
+        method = request['method']
+        # a notification gets no response, not even on errors
+        notification = 'id' not in request
+        func = self.methods.get(method)
+        if func is None:
+            if notification:
+                return None
+            return self.missing_method_response(msgid, method, True)
+        params = request.get('params', [])
+        if not self.valid_params(func, params):
+            if notification:
+                return None
+            return self.invalid_params_response(msgid, method, True)
+        try:
+            result = self.call(func, params)
+        except:
+            if notification:
+                return None
+            return self.exception_response(msgid, sys.exc_info(), True)
+        if notification:
+            return None
+        return self.batch_response(msgid, result)
+
+    def get_batch_pool(self):
+        """returns the thread pool running the calls of batches, which is
+        shared by the services with the same number of batch_workers"""
+        pools = JSONRPCServiceBase._batch_pools
+        if self.batch_workers not in pools:
+            self._batch_pool_lock.acquire()
+            try:
+                if self.batch_workers not in pools:
+                    try:
+                        from multiprocessing.pool import ThreadPool
+                    except ImportError:
+                        # no threads, e.g. on google app engine
+                        pools[self.batch_workers] = None
+                    else:
+                        pools[self.batch_workers] = ThreadPool(
+                            self.batch_workers)
+            finally:
+                self._batch_pool_lock.release()
+        return pools[self.batch_workers]
 
     def listmethods(self):
         return self.methods.keys()
@@ -69,7 +281,7 @@ def jsonremote(service):
             service.add_method(func.__name__, func)
         else:
             emsg = 'Service "%s" not found' % str(service.__name__)
-            raise NotImplementedError, emsg
+            raise NotImplementedError(emsg)
         return func
     return remotify
 
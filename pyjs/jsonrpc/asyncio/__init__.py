@@ -0,0 +1,297 @@
+"""
+JSON-RPC services for asyncio (python 3).
+
+Methods which are coroutine functions (or marked with onloop) run on the
+event loop, other methods on an executor, so a call waiting for I/O does not tie up a thread and one
+process can serve many clients at once.  JSONRPCService comes with a small
+HTTP/1.1 server:
+
+    import asyncio
+    from pyjs.jsonrpc.asyncio import JSONRPCService, jsonremote
+
+    service = JSONRPCService()
+
+    @jsonremote(service)
+    async def echo(msg):
+        await asyncio.sleep(0.1)
+        return msg
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(service.serve('127.0.0.1', 8000))
+    loop.run_forever()
+
+The module does not use the async and await keywords, so that it can be
+byte-compiled by python 2 together with the rest of pyjs.
+"""
+
+from __future__ import absolute_import
+
+import asyncio
+import functools
+import logging
+from http.client import responses as http_reasons
+
+from pyjs.jsonrpc import JSONRPCServiceBase, jsonremote, \
+    PARSE_ERROR, INVALID_REQUEST
+
+log = logging.getLogger(__name__)
+
+
+def onloop(func):
+    """marks func, a method returning a future or another awaitable, to be
+    called on the event loop like a coroutine function"""
+    func.jsonrpc_onloop = True
+    return func
+
+
+def resolved(value):
+    """returns a future with the result value"""
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+def then(future, callback):
+    """returns a future of callback(future), called once future is done"""
+    result = asyncio.get_running_loop().create_future()
+    def done(future):
+        if result.cancelled():
+            return
+        try:
+            result.set_result(callback(future))
+        except BaseException as e:
+            result.set_exception(e)
+    future.add_done_callback(done)
+    return result
+
+
+class AsyncJSONRPCServiceBase(JSONRPCServiceBase):
+
+    def __init__(self, executor=None, codec=None, debug=None):
+        JSONRPCServiceBase.__init__(self, codec=codec, debug=debug)
+        # runs the methods which are not coroutine functions; None is the
+        # default executor of the event loop
+        self.executor = executor
+
+    def call_async(self, func, params):
+        """returns a future of the result of func"""
+        if isinstance(params, dict):
+            args, kwargs = (), params
+        else:
+            args, kwargs = params, {}
+        if asyncio.iscoroutinefunction(func) or \
+           getattr(func, 'jsonrpc_onloop', False):
+            return asyncio.ensure_future(func(*args, **kwargs))
+        return asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs))
+
+    def process_async(self, data):
+        """returns a future of the response to data, see process; the
+        calls of a batch run concurrently"""
+        data = self.codec.loads(data)
+        if not isinstance(data, list):
+            return self.process_request_async(data)
+        if not data:
+            return resolved(
+                self.batch_error(None, INVALID_REQUEST, 'Invalid Request'))
+        def join(future):
+            responses = [r for r in future.result() if r is not None]
+            if not responses:
+                return ''
+            return '[%s]' % ', '.join(responses)
+        return then(asyncio.gather(*[self.process_request_async(r, True)
+                                     for r in data]), join)
+
+    def process_request_async(self, request, batch=False):
+        """returns a future of the response to request, or of None for
+        the notifications in a batch"""
+        if batch:
+            if not self.is_batch_request(request):
+                return resolved(self.batch_error(None, INVALID_REQUEST,
+                                                 'Invalid Request'))
+            msgid = request.get('id')
+            method = request['method']
+            params = request.get('params', [])
+            response = self.batch_response
+        else:
+            msgid, method, params = \
+                request["id"], request["method"], request["params"]
+            response = self.response
+        notification = batch and 'id' not in request
+        func = self.methods.get(method)
+        if func is None:
+            if notification:
+                return resolved(None)
+            return resolved(
+                self.missing_method_response(msgid, method, batch))
+        if not self.valid_params(func, params):
+            if notification:
+                return resolved(None)
+            return resolved(
+                self.invalid_params_response(msgid, method, batch))
+        try:
+            future = self.call_async(func, params)
+        except Exception as e:
+            # e.g. a coroutine function called with the wrong arguments
+            future = asyncio.get_running_loop().create_future()
+            future.set_exception(e)
+        def respond(future):
+            e = future.exception()
+            if notification:
+                return None
+            if e is not None:
+                return self.exception_response(
+                    msgid, (type(e), e, e.__traceback__), batch)
+            return response(msgid, future.result())
+        return then(future, respond)
+
+
+class JSONRPCHTTPProtocol(asyncio.Protocol):
+    """answers the JSON-RPC requests POSTed to path (any path if None);
+    connections are kept alive and pipelined requests are answered in
+    order; reading is paused while a request is being answered"""
+
+    max_header_size = 64 * 1024
+    max_request_size = 16 * 1024 * 1024
+
+    def __init__(self, service, path=None):
+        self.service = service
+        self.path = path
+        self.transport = None
+        self.buffer = bytearray()
+        self.busy = False
+        self.paused = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+    def data_received(self, data):
+        self.buffer.extend(data)
+        if len(self.buffer) > self.max_header_size + self.max_request_size:
+            # more than any one request, the client does not wait for
+            # the responses
+            self.reply(413, keep_alive=False)
+            return
+        self.handle_requests()
+
+    def handle_requests(self):
+        while self.transport is not None and not self.busy:
+            if not self.handle_request():
+                break
+        if self.transport is None:
+            return
+        # the requests of a client which does not wait for the responses
+        # stay in the socket buffers rather than in self.buffer
+        if self.busy and not self.paused:
+            self.transport.pause_reading()
+            self.paused = True
+        elif not self.busy and self.paused:
+            self.transport.resume_reading()
+            self.paused = False
+
+    def handle_request(self):
+        """answers or starts answering the first request in the buffer;
+        returns False if it is not complete yet"""
+        end = self.buffer.find(b'\r\n\r\n')
+        if end < 0:
+            if len(self.buffer) > self.max_header_size:
+                self.reply(431, keep_alive=False)
+            return False
+        lines = self.buffer[:end].decode('latin-1').split('\r\n')
+        try:
+            method, path, version = lines[0].split()
+        except ValueError:
+            self.reply(400, keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.reply(400, keep_alive=False)
+            return False
+        if length > self.max_request_size:
+            self.reply(413, keep_alive=False)
+            return False
+        start = end + 4
+        if len(self.buffer) < start + length:
+            return False
+        body = bytes(self.buffer[start:start + length])
+        # deleting the head of a bytearray does not copy the rest
+        del self.buffer[:start + length]
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            keep_alive = connection == 'keep-alive'
+        else:
+            keep_alive = connection != 'close'
+        if method != 'POST':
+            self.reply(405, keep_alive=keep_alive)
+        elif self.path is not None and path.split('?')[0] != self.path:
+            self.reply(404, keep_alive=keep_alive)
+        else:
+            try:
+                future = self.service.process_async(body.decode('utf-8'))
+            except ValueError:
+                self.reply(200, self.service.batch_error(
+                    None, PARSE_ERROR, 'Parse error'), keep_alive)
+            except (KeyError, TypeError):
+                self.reply(200, self.service.batch_error(
+                    None, INVALID_REQUEST, 'Invalid Request'), keep_alive)
+            else:
+                self.busy = True
+                future.add_done_callback(
+                    functools.partial(self.done, keep_alive))
+        return True
+
+    def done(self, keep_alive, future):
+        self.busy = False
+        if self.transport is None:
+            return
+        try:
+            response = future.result()
+        except Exception:
+            log.exception("error while answering a JSON-RPC request")
+            self.reply(500, keep_alive=False)
+            return
+        if response:
+            self.reply(200, response, keep_alive)
+        else:
+            # only notifications
+            self.reply(204, keep_alive=keep_alive)
+        self.handle_requests()
+
+    def reply(self, status, body='', keep_alive=True):
+        if self.transport is None:
+            return
+        body = body.encode('utf-8')
+        head = ['HTTP/1.1 %d %s' % (status, http_reasons.get(status, ''))]
+        if status != 204:
+            head.append('Content-Type: application/json-rpc')
+            head.append('Content-Length: %d' % len(body))
+        if not keep_alive:
+            head.append('Connection: close')
+        head.append('\r\n')
+        self.transport.write('\r\n'.join(head).encode('latin-1') + body)
+        if not keep_alive:
+            self.transport.close()
+            self.transport = None
+
+
+class JSONRPCService(AsyncJSONRPCServiceBase):
+
+    def protocol(self, path=None):
+        return JSONRPCHTTPProtocol(self, path)
+
+    def serve(self, host='127.0.0.1', port=8000, path=None, **kwargs):
+        """returns a coroutine which starts an HTTP server answering the
+        requests POSTed to path, see loop.create_server"""
+        return asyncio.get_event_loop().create_server(
+            functools.partial(self.protocol, path), host, port, **kwargs)
@@ -0,0 +1,281 @@
+"""
+Tests of the asyncio JSON-RPC service and its HTTP server (python 3):
+
+    python3 -m unittest pyjs.jsonrpc.asyncio.test_service
+
+Like the service, they do not use the async and await keywords, so that
+python 2 can byte-compile them; the event loop of the server runs in a
+thread, and the tests talk to it over a socket.
+"""
+
+from __future__ import absolute_import
+
+import json
+import time
+import socket
+import asyncio
+import unittest
+import threading
+
+from pyjs.jsonrpc.asyncio import JSONRPCService, onloop
+
+# a coroutine function; compiled at run time, see the module docstring
+namespace = {'asyncio': asyncio}
+exec(compile('''
+async def slow_echo(msg, delay=0.01):
+    await asyncio.sleep(delay)
+    return msg
+''', __file__, 'exec'), namespace)
+slow_echo = namespace['slow_echo']
+
+
+def echo(msg):
+    return msg
+
+
+def fail():
+    raise ValueError('broken')
+
+
+def run(func, *args):
+    """returns the result of the future returned by func(*args), called on
+    a new event loop"""
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.create_future()
+        def start():
+            try:
+                future = func(*args)
+            except Exception as e:
+                result.set_exception(e)
+                return
+            def done(future):
+                if future.exception() is not None:
+                    result.set_exception(future.exception())
+                else:
+                    result.set_result(future.result())
+            future.add_done_callback(done)
+        loop.call_soon(start)
+        return loop.run_until_complete(result)
+    finally:
+        loop.close()
+
+
+def make_service():
+    service = JSONRPCService()
+    service.add_method('echo', echo)
+    service.add_method('slow_echo', slow_echo)
+    service.add_method('later', onloop(
+        lambda msg: asyncio.sleep(0.01, msg)))
+    service.add_method('fail', fail)
+    return service
+
+
+class ProcessAsyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = make_service()
+
+    def process(self, request):
+        response = run(self.service.process_async, json.dumps(request))
+        if response:
+            return json.loads(response)
+        return response
+
+    def testMethods(self):
+        for method in ('echo', 'slow_echo', 'later'):
+            response = self.process(
+                {'id': 1, 'method': method, 'params': ['hi']})
+            self.assertEqual(response['result'], 'hi')
+        response = self.process(
+            {'id': 2, 'method': 'slow_echo', 'params': {'msg': 'named'}})
+        self.assertEqual(response['result'], 'named')
+
+    def testErrors(self):
+        response = self.process({'id': 1, 'method': 'fail', 'params': []})
+        self.assertEqual(response['error']['message'], 'ValueError: broken')
+        response = self.process({'id': 2, 'method': 'nothere', 'params': []})
+        self.assertEqual(response['error']['message'],
+                         'method "nothere" does not exist')
+        response = self.process(
+            {'id': 3, 'method': 'slow_echo', 'params': [1, 2, 3]})
+        self.assertEqual(response['error']['message'],
+                         'invalid params for method "slow_echo"')
+        # the server answers these with a parse error and an invalid
+        # request
+        self.assertRaises(ValueError, run, self.service.process_async,
+                          '{"id": ')
+        self.assertRaises(KeyError, run, self.service.process_async, '{}')
+
+    def testBatch(self):
+        response = self.process([
+            {'jsonrpc': '2.0', 'id': 1, 'method': 'slow_echo',
+             'params': ['a', 0.05]},
+            {'jsonrpc': '2.0', 'id': 2, 'method': 'echo', 'params': ['b']},
+            {'jsonrpc': '2.0', 'method': 'echo', 'params': ['c']},
+            {'jsonrpc': '2.0', 'id': 3, 'method': 'nothere'},
+            'not a request',
+        ])
+        self.assertEqual([r.get('id') for r in response], [1, 2, 3, None])
+        self.assertEqual([r.get('result') for r in response[:2]],
+                         ['a', 'b'])
+        self.assertEqual([r['error']['code'] for r in response[2:]],
+                         [-32601, -32600])
+
+    def testEmptyBatches(self):
+        self.assertEqual(self.process([])['error']['code'], -32600)
+        self.assertEqual(self.process([
+            {'jsonrpc': '2.0', 'method': 'echo', 'params': ['a']},
+            {'jsonrpc': '2.0', 'method': 'fail', 'params': []},
+        ]), '')
+
+
+class Client(object):
+    """an HTTP/1.1 client sending raw requests"""
+
+    def __init__(self, port):
+        self.sock = socket.create_connection(('127.0.0.1', port), 5)
+        self.data = b''
+
+    def close(self):
+        self.sock.close()
+
+    def send(self, *requests):
+        self.sock.sendall(b''.join(requests))
+
+    def read(self, n):
+        while len(self.data) < n:
+            data = self.sock.recv(65536)
+            if not data:
+                raise EOFError
+            self.data += data
+        data, self.data = self.data[:n], self.data[n:]
+        return data
+
+    def response(self):
+        """returns the status, headers and body of the next response"""
+        while b'\r\n\r\n' not in self.data:
+            data = self.sock.recv(65536)
+            if not data:
+                raise EOFError
+            self.data += data
+        head, self.data = self.data.split(b'\r\n\r\n', 1)
+        lines = head.decode('latin-1').split('\r\n')
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = self.read(int(headers.get('content-length', 0)))
+        return int(lines[0].split()[1]), headers, body
+
+
+def post(body, path='/', method='POST'):
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode('utf-8')
+    return ('%s %s HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % (
+        method, path, len(body))).encode('latin-1') + body
+
+
+class ServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.service = make_service()
+        self.protocols = []
+        protocol = self.service.protocol
+        def record(path=None):
+            self.protocols.append(protocol(path))
+            return self.protocols[-1]
+        self.service.protocol = record
+        self.loop = asyncio.new_event_loop()
+        # serve() creates the server on the current event loop
+        asyncio.set_event_loop(self.loop)
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            self.service.serve('127.0.0.1', 0, '/rpc'), self.loop).result(5)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.client = Client(self.port)
+
+    def tearDown(self):
+        self.client.close()
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def testRequests(self):
+        self.client.send(post({'id': 1, 'method': 'echo', 'params': ['hi']},
+                              '/rpc'))
+        status, headers, body = self.client.response()
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body.decode('utf-8'))['result'], 'hi')
+
+        self.client.send(post(b'{"id": 1, "meth', '/rpc'))
+        status, headers, body = self.client.response()
+        self.assertEqual(json.loads(body.decode('utf-8'))['error']['code'],
+                         -32700)
+
+        self.client.send(post(b'"echo"', '/rpc'))
+        status, headers, body = self.client.response()
+        self.assertEqual(json.loads(body.decode('utf-8'))['error']['code'],
+                         -32600)
+
+        # only notifications
+        self.client.send(post([{'jsonrpc': '2.0', 'method': 'echo',
+                                'params': ['a']}], '/rpc'))
+        status, headers, body = self.client.response()
+        self.assertEqual((status, body), (204, b''))
+
+        self.client.send(post(b'', '/rpc', 'GET'))
+        self.assertEqual(self.client.response()[0], 405)
+        self.client.send(post({'id': 1, 'method': 'echo', 'params': ['hi']},
+                              '/other'))
+        self.assertEqual(self.client.response()[0], 404)
+
+    def testPipelining(self):
+        # the later requests finish first, but are answered in order
+        self.client.send(*[
+            post({'id': i, 'method': 'slow_echo',
+                  'params': [i, (10 - i) * 0.005]}, '/rpc')
+            for i in range(10)])
+        results = []
+        for i in range(10):
+            status, headers, body = self.client.response()
+            results.append(json.loads(body.decode('utf-8'))['result'])
+        self.assertEqual(results, list(range(10)))
+
+    def testBackpressure(self):
+        event = threading.Event()
+        self.service.add_method('wait', lambda: event.wait(5))
+        self.client.send(post({'id': 1, 'method': 'wait', 'params': []},
+                              '/rpc'),
+                         post({'id': 2, 'method': 'echo', 'params': [2]},
+                              '/rpc'))
+        deadline = time.time() + 5
+        while not (self.protocols and self.protocols[0].paused):
+            self.assertTrue(time.time() < deadline)
+            time.sleep(0.01)
+        protocol = self.protocols[0]
+        self.assertTrue(protocol.busy)
+        event.set()
+        ids = []
+        for i in range(2):
+            status, headers, body = self.client.response()
+            ids.append(json.loads(body.decode('utf-8'))['id'])
+        self.assertEqual(ids, [1, 2])
+        deadline = time.time() + 5
+        while protocol.paused:
+            self.assertTrue(time.time() < deadline)
+            time.sleep(0.01)
+
+    def testTooLarge(self):
+        self.client.send(b'POST /rpc HTTP/1.1\r\n'
+                         b'Content-Length: 99999999999\r\n\r\n')
+        status, headers, body = self.client.response()
+        self.assertEqual(status, 413)
+        self.assertEqual(headers['connection'], 'close')
+
+
+if __name__ == '__main__':
+    unittest.main()
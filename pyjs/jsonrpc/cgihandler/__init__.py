@@ -20,7 +20,10 @@
 
 from pyjs.jsonrpc import JSONRPCServiceBase, jsonremote
 import sys, os
-import Cookie
+try:
+    import Cookie
+except ImportError:
+    import http.cookies as Cookie
 
 def read_data():
     try:
@@ -30,8 +30,9 @@ from pyjs.jsonrpc import JSONRPCServiceBase
 
 class JSONRPCService(JSONRPCServiceBase):
 
-    def __init__(self, defaultPage=''):
-        JSONRPCServiceBase.__init__(self)
+    def __init__(self, defaultPage='', batch_workers=None, codec=None,
+                 debug=None):
+        JSONRPCServiceBase.__init__(self, batch_workers, codec, debug)
         self.defaultPage = defaultPage
 
     '''
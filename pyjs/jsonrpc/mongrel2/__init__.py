@@ -21,14 +21,12 @@
 from pyjs.jsonrpc import JSONRPCServiceBase, jsonremote
 
 class Mongrel2JSONRPCService(JSONRPCServiceBase):
-    def __init__(self, conn):
+    def __init__(self, conn, batch_workers=None, codec=None, debug=None):
         self.__conn = conn
-        JSONRPCServiceBase.__init__(self)
+        JSONRPCServiceBase.__init__(self, batch_workers, codec, debug)
 
     def __call__(self):
-        print "call"
         req = self.__conn.recv()
-        print req
         response = self.process(req.body)
         self.__conn.reply_http(req, response)
 
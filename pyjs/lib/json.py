@@ -50,16 +50,175 @@ JSONDecode:
 """
 
 
+# Where the engine has a native JSON object, JSON.parse and JSON.stringify
+# do the work: the reviver of JSON.parse makes the pyjs list and dict
+# objects as the values are parsed, and the pyjs list, tuple and dict are
+# replaced by arrays and objects in one walk before JSON.stringify.  What
+# they would not handle like the code below (invalid JSON, which parseJSON
+# may still accept, instances of other classes, longs which do not fit a
+# number) falls back to toJSONString & parseJSON.
+_native = JS("""typeof JSON == 'object' && JSON !== null
+                && typeof JSON['parse'] == 'function'
+                && typeof JSON['stringify'] == 'function'""")
+
+JS("""
+var $json_fallback = {};
+
+// makes the instances of cls like its __new__, but with one constructor
+// for all of them; calling the class costs far more than parsing
+var $json_instance = function(cls) {
+    var instance = function() {};
+    instance['prototype'] = cls;
+    return function() {
+        var obj = new instance();
+        obj['__class__'] = cls;
+        obj['__dict__'] = obj;
+        obj['__is_instance__'] = true;
+        return obj;
+    };
+};
+var $json_new_list = $json_instance(pyjslib['list']);
+var $json_new_dict = $json_instance(pyjslib['dict']);
+// under --enable-native-map the items of a dict are in a Map
+var $json_map = typeof pyjslib['dict']()['__map'] == 'object';
+
+var $json_to_py = function(key, value) {
+    if (value === null || typeof value != 'object') {
+        return value;
+    }
+    var obj;
+    if (value['constructor'] === Array) {
+        // the array is new, there is no need to copy it like list()
+        obj = $json_new_list();
+        obj['__array'] = value;
+        return obj;
+    }
+    var items;
+    if ($json_map) {
+        items = new Map();
+        for (var k in value) {
+            items['set']('$' + k, [k, value[k]]);
+        }
+        obj = $json_new_dict();
+        obj['__map'] = items;
+        return obj;
+    }
+    items = {};
+    for (var k in value) {
+        items['$' + k] = [k, value[k]];
+    }
+    obj = $json_new_dict();
+    obj['__object'] = items;
+    return obj;
+};
+
+var $json_to_py_object = function(key, value) {
+    if (value !== null && typeof value == 'object'
+        && value['constructor'] !== Array && value['__jsonclass__']) {
+        // the members, the hint too, are converted already
+        var class_name = value['__jsonclass__']['__array'][0];
+        delete value['__jsonclass__'];
+        return $pyjs_kwargs_call(
+            null, eval("$pyjs['loaded_modules']." + class_name),
+            null, $json_to_py(key, value), [{}]
+        );
+    }
+    return $json_to_py(key, value);
+};
+
+// returns value with the pyjs list, tuple and dict replaced by arrays and
+// objects, ready for JSON.stringify
+var $py_to_json = function(value) {
+    var result, i, n;
+    switch (typeof value) {
+        case 'object':
+            break;
+        case 'undefined':
+            return null;
+        case 'function':
+            throw $json_fallback;
+        default:
+            return value;
+    }
+    if (value === null) {
+        return value;
+    }
+    if (value instanceof pyjslib['list'] || value instanceof pyjslib['tuple']) {
+        value = value['__array'];
+    }
+    if (value['constructor'] === Array) {
+        n = value['length'];
+        result = new Array(n);
+        for (i = 0; i < n; i++) {
+            result[i] = $py_to_json(value[i]);
+        }
+        return result;
+    }
+    if (value instanceof pyjslib['dict']) {
+        result = {};
+        if ($json_map) {
+            value['__map']['forEach'](function(kv) {
+                result[kv[0]['toString']()] = $py_to_json(kv[1]);
+            });
+            return result;
+        }
+        var o = value['getObject']();
+        for (i in o) {
+            result[o[i][0]['toString']()] = $py_to_json(o[i][1]);
+        }
+        return result;
+    }
+    if (value['constructor'] === Object) {
+        result = {};
+        for (i in value) {
+            result[i] = $py_to_json(value[i]);
+        }
+        return result;
+    }
+    if (value['__number__']) {
+        n = value['valueOf']();
+        if (typeof n == 'number' && String(n) == String(value)) {
+            return n;
+        }
+    }
+    throw $json_fallback;
+};
+""")
+
 # toJSONString & parseJSON from http://www.json.org/json.js
 
 class JSONParser:
     def decode(self, s):
+        if _native:
+            JS("""
+            try {
+                return JSON['parse'](@{{s}}, $json_to_py);
+            } catch (e) {
+                if (!(e instanceof SyntaxError)) throw e;
+            }
+            """)
         return self.jsObjectToPy(self.parseJSON(s))
 
     def decodeAsObject(self, s, object_hook=None):
+        if _native:
+            JS("""
+            try {
+                return JSON['parse'](@{{s}}, $json_to_py_object);
+            } catch (e) {
+                if (!(e instanceof SyntaxError)) throw e;
+            }
+            """)
         return self.jsObjectToPyObject(self.parseJSON(s))
 
     def encode(self, obj):
+        if _native:
+            JS("""
+            try {
+                return JSON['stringify']($py_to_json(@{{obj}}));
+            } catch (e) {
+                if (e !== $json_fallback) throw e;
+            }
+            """)
         return self.toJSONString(obj)
 
     def jsObjectToPy(self, obj):
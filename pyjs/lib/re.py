@@ -64,12 +64,11 @@ def finditer(pattern, string, flags=0):
     return compile(pattern, flags).finditer(string)
 
 def compile(pattern, flags=0):
-    return SRE_Pattern(pattern, flags, _compile(pattern, flags))
+    return _compile(pattern, flags)
 
 def purge():
     # "Clear the regular expression cache"
     _cache.clear()
-    _cache_repl.clear()
 
 def template(pattern, flags=0):
     # "Compile a template pattern, returning a pattern object"
@@ -101,18 +100,92 @@ from __pyjamas__ import JS, debugger
 
 __inline_flags_re__ = JS(r"""new RegExp("[(][?][iLmsux]+[)]")""")
 
-_cache = {}
-_cache_repl = {}
-_MAXCACHE = 100
+# the number of compiled patterns kept by the cache; may be changed at
+# any time, the least recently used patterns are dropped on the next miss
+_MAXCACHE = 512
+
+class _LRUCache:
+    # Maps string keys to values, and drops the least recently used
+    # entries once there are more than maxsize.  The entries form a
+    # doubly linked list in JS, most recently used first, so that a hit
+    # costs a property lookup and a few pointer updates.
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        JS("""
+        var head = {};
+        head.prev = head.next = head;
+        @{{self}}._head = head;
+        @{{self}}._entries = {};
+        @{{self}}._size = 0;
+        """)
+
+    def __len__(self):
+        return JS("@{{self}}._size")
+
+    def get(self, key):
+        # Return the value of key, or None; the entry becomes the most
+        # recently used one.
+        JS("""
+        var entry = @{{self}}._entries['$' + @{{key}}];
+        if (typeof entry == 'undefined') {
+            return null;
+        }
+        var head = @{{self}}._head;
+        if (head.next !== entry) {
+            entry.prev.next = entry.next;
+            entry.next.prev = entry.prev;
+            entry.prev = head;
+            entry.next = head.next;
+            head.next.prev = entry;
+            head.next = entry;
+        }
+        return entry.value;
+        """)
+
+    def put(self, key, value, maxsize):
+        JS("""
+        var entries = @{{self}}._entries, head = @{{self}}._head;
+        var k = '$' + @{{key}}, entry = entries[k];
+        if (typeof entry == 'undefined') {
+            entry = {key: k};
+            entries[k] = entry;
+            @{{self}}._size++;
+        } else {
+            entry.prev.next = entry.next;
+            entry.next.prev = entry.prev;
+        }
+        entry.value = @{{value}};
+        entry.prev = head;
+        entry.next = head.next;
+        head.next.prev = entry;
+        head.next = entry;
+        while (@{{self}}._size > @{{maxsize}} && head.prev !== head) {
+            var last = head.prev;
+            last.prev.next = head;
+            head.prev = last.prev;
+            delete entries[last.key];
+            @{{self}}._size--;
+        }
+        """)
+
+_cache = _LRUCache()
 
 def _compile(pat, flags=0):
-    cachekey = (pat, flags)
+    cachekey = JS("@{{flags}} + ':' + @{{pat}}")
     p = _cache.get(cachekey)
     if p is not None:
         return p
+    p = SRE_Pattern(pat, flags, _translate(pat, flags))
+    _cache.put(cachekey, p, _MAXCACHE)
+    return p
 
+def _translate(pat, flags):
+    # Return the source and the flags of the JS RegExp for pat.
     flgs = ""
-    while True:
+    while pat.find('(?') >= 0:
         m = __inline_flags_re__.Exec(pat)
         if JS("@{{m}} === null"):
             m = None
@@ -167,12 +240,7 @@ def _compile(pat, flags=0):
             flgs += 'i'
         if flags & MULTILINE:
             flgs += 'm'
-    spat = r"([\s\S]*?)(" + pat + r")[\s\S]*"
-    p = JS(r"""new RegExp(@{{pat}}, @{{flgs}})"""), JS(r"""new RegExp(@{{spat}}, @{{flgs}})"""), JS(r"""new RegExp(@{{pat}}, "g"+@{{flgs}})""")
-    if len(_cache) >= _MAXCACHE:
-        _cache.clear()
-    _cache[cachekey] = p
-    return p
+    return pat, flgs
 
 class SRE_Match:
     def __init__(self, re, string, pos, endpos, groups, start, lastindex, lastgroup):
@@ -255,9 +323,18 @@ class SRE_Pattern:
     def __init__(self, pat, flags, code):
         self.pat = pat
         self.flags = flags
-        self.match_code = code[0]
-        self.search_code = code[1]
-        self.findall_code = code[2]
+        # the source and the flags of the JS RegExps, which are only
+        # created once they are used
+        self._source, self._flgs = code
+        self.match_code = None
+        self.search_code = None
+
+    def _compile_match(self):
+        self.match_code = JS("""new RegExp(@{{self}}._source, @{{self}}._flgs)""")
+
+    def _compile_search(self):
+        spat = r"([\s\S]*?)(" + self._source + r")[\s\S]*"
+        self.search_code = JS("""new RegExp(@{{spat}}, @{{self}}._flgs)""")
 
     def match(self, string, pos=0, endpos=None):
         # If zero or more characters at the beginning of string match this
@@ -267,6 +344,8 @@ class SRE_Pattern:
             string = string[:endpos]
         else:
             endpos = len(string)
+        if self.match_code is None:
+            self._compile_match()
         if pos == 0:
             groups = self.match_code.Exec(string)
             if JS("@{{groups}} === null"):
@@ -307,6 +386,8 @@ class SRE_Pattern:
         # pattern.
         if not endpos is None:
             string = string[:endpos]
+        if self.search_code is None:
+            self._compile_search()
         if pos == 0:
             groups = self.search_code.Exec(string)
             if JS("@{{groups}} === null"):
@@ -350,8 +431,6 @@ class SRE_Pattern:
                 all.append(tuple([group or '' for group in m.groups()]))
             pos = span[1]
         return all
-        # Next line bugs in FF2
-        return list(string[pos:].match(self.findall_code))
 
     def sub(self, repl, string, count=0):
         # Return the string obtained by replacing the leftmost non-overlapping
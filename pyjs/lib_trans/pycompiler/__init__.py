@@ -26,3 +26,4 @@ from pycompiler.visitor import walk
 #from pycompiler.pycodegen import compile, compileFile
 from pycompiler import ast
 from pycompiler import transformer
+from pycompiler import parsecache
@@ -21,7 +21,13 @@ def flatten_nodes(seq):
 nodes = {}
 
 class Node(object):
-    """Abstract base class for ast nodes."""
+    """Abstract base class for ast nodes.
+
+    The node classes use __slots__ to keep large trees small; attributes
+    which are not in the slots of a class still go to a __dict__, which is
+    only created for the nodes that get one."""
+    __slots__ = ('_lineno', '_context', '__dict__')
+
     def getChildren(self):
         pass # implemented by subclasses
     def __iter__(self):
@@ -35,7 +41,10 @@ class Node(object):
         return self._lineno
     def _set_lineno(self, lineno):
         if lineno is not None and not isinstance(lineno, int):
-            self._context = lineno
+            # a (prefix, (lineno, column)) context from the parser; only
+            # the position is kept, the prefix holds the comments and
+            # white space in front of the token
+            self._context = lineno[1]
             self._lineno = lineno[1][0]
         else:
             self._lineno = lineno
@@ -46,10 +55,16 @@ class Node(object):
         return repr(self)
 
 class EmptyNode(Node):
-    pass
+    __slots__ = ()
+
+class CollComp(Node):
+    """base class of the list, set and dict comprehensions"""
+    __slots__ = ()
 
 class Expression(Node):
     # Expression is an artificial node class to support "eval"
+    __slots__ = ('node',)
+
     nodes["expression"] = "Expression"
     def __init__(self, node):
         Node.__init__(self)
@@ -65,6 +80,8 @@ class Expression(Node):
         return "Expression(%s)" % (repr(self.node))
 
 class Add(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -80,6 +97,8 @@ class Add(Node):
         return "Add(%s, %s)" % (repr(self.left), repr(self.right))
 
 class And(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -96,6 +115,8 @@ class And(Node):
         return "And(%s)" % (repr(self.nodes),)
 
 class AssAttr(Node):
+    __slots__ = ('expr', 'attrname', 'flags')
+
     def __init__(self, expr, attrname, flags, lineno=None):
         self.expr = expr
         self.attrname = attrname
@@ -112,6 +133,8 @@ class AssAttr(Node):
         return "AssAttr(%s, %s, %s)" % (repr(self.expr), repr(self.attrname), repr(self.flags))
 
 class AssList(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -128,6 +151,8 @@ class AssList(Node):
         return "AssList(%s)" % (repr(self.nodes),)
 
 class AssName(Node):
+    __slots__ = ('name', 'flags')
+
     def __init__(self, name, flags, lineno=None):
         self.name = name
         self.flags = flags
@@ -143,6 +168,8 @@ class AssName(Node):
         return "AssName(%s, %s)" % (repr(self.name), repr(self.flags))
 
 class AssTuple(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -159,6 +186,8 @@ class AssTuple(Node):
         return "AssTuple(%s)" % (repr(self.nodes),)
 
 class Assert(Node):
+    __slots__ = ('test', 'fail')
+
     def __init__(self, test, fail, lineno=None):
         self.test = test
         self.fail = fail
@@ -181,6 +210,8 @@ class Assert(Node):
         return "Assert(%s, %s)" % (repr(self.test), repr(self.fail))
 
 class Assign(Node):
+    __slots__ = ('nodes', 'expr')
+
     def __init__(self, nodes, expr, lineno=None):
         self.nodes = nodes
         self.expr = expr
@@ -202,6 +233,8 @@ class Assign(Node):
         return "Assign(%s, %s)" % (repr(self.nodes), repr(self.expr))
 
 class AugAssign(Node):
+    __slots__ = ('node', 'op', 'expr')
+
     def __init__(self, node, op, expr, lineno=None):
         self.node = node
         self.op = op
@@ -218,6 +251,8 @@ class AugAssign(Node):
         return "AugAssign(%s, %s, %s)" % (repr(self.node), repr(self.op), repr(self.expr))
 
 class Backquote(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, lineno=None):
         self.expr = expr
         self.lineno = lineno
@@ -232,6 +267,8 @@ class Backquote(Node):
         return "Backquote(%s)" % (repr(self.expr),)
 
 class Bitand(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -248,6 +285,8 @@ class Bitand(Node):
         return "Bitand(%s)" % (repr(self.nodes),)
 
 class Bitor(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -264,6 +303,8 @@ class Bitor(Node):
         return "Bitor(%s)" % (repr(self.nodes),)
 
 class Bitxor(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -280,6 +321,8 @@ class Bitxor(Node):
         return "Bitxor(%s)" % (repr(self.nodes),)
 
 class Break(Node):
+    __slots__ = ()
+
     def __init__(self, lineno=None):
         self.lineno = lineno
 
@@ -293,6 +336,8 @@ class Break(Node):
         return "Break()"
 
 class CallFunc(Node):
+    __slots__ = ('node', 'args', 'star_args', 'dstar_args')
+
     def __init__(self, node, args, star_args, dstar_args, lineno=None):
         self.node = node
         self.args = args
@@ -322,6 +367,8 @@ class CallFunc(Node):
         return "CallFunc(%s, %s, %s, %s)" % (repr(self.node), repr(self.args), repr(self.star_args), repr(self.dstar_args))
 
 class Class(Node):
+    __slots__ = ('name', 'bases', 'doc', 'code', 'decorators')
+
     def __init__(self, name, bases, doc, code, decorators, lineno=None):
         self.name = name
         self.bases = bases
@@ -351,6 +398,8 @@ class Class(Node):
         return "Class(%s, %s, %s, %s, %s)" % (repr(self.name), repr(self.bases), repr(self.doc), repr(self.code), repr(self.decorators))
 
 class Compare(Node):
+    __slots__ = ('expr', 'ops')
+
     def __init__(self, expr, ops, lineno=None):
         self.expr = expr
         self.ops = ops
@@ -372,6 +421,8 @@ class Compare(Node):
         return "Compare(%s, %s)" % (repr(self.expr), repr(self.ops))
 
 class Const(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value, lineno=None):
         self.value = value
         self.lineno = lineno
@@ -386,6 +437,8 @@ class Const(Node):
         return "Const(%s)" % (repr(self.value),)
 
 class Continue(Node):
+    __slots__ = ()
+
     def __init__(self, lineno=None):
         self.lineno = lineno
 
@@ -399,6 +452,8 @@ class Continue(Node):
         return "Continue()"
 
 class Decorators(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -415,6 +470,8 @@ class Decorators(Node):
         return "Decorators(%s)" % (repr(self.nodes),)
 
 class Dict(Node):
+    __slots__ = ('items',)
+
     def __init__(self, items, lineno=None):
         self.items = items
         self.lineno = lineno
@@ -430,7 +487,35 @@ class Dict(Node):
     def __repr__(self):
         return "Dict(%s)" % (repr(self.items),)
 
+class DictComp(CollComp):
+    __slots__ = ('key', 'value', 'quals')
+
+    def __init__(self, key, value, quals, lineno=None):
+        self.key = key
+        self.value = value
+        self.quals = quals
+        self.lineno = lineno
+
+    def getChildren(self):
+        children = []
+        children.append(self.key)
+        children.append(self.value)
+        children.extend(flatten(self.quals))
+        return tuple(children)
+
+    def getChildNodes(self):
+        nodelist = []
+        nodelist.append(self.key)
+        nodelist.append(self.value)
+        nodelist.extend(flatten_nodes(self.quals))
+        return tuple(nodelist)
+
+    def __repr__(self):
+        return "DictComp(%s, %s, %s)" % (repr(self.key), repr(self.value), repr(self.quals))
+
 class Discard(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, lineno=None):
         self.expr = expr
         self.lineno = lineno
@@ -445,6 +530,8 @@ class Discard(Node):
         return "Discard(%s)" % (repr(self.expr),)
 
 class Div(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -460,6 +547,8 @@ class Div(Node):
         return "Div(%s, %s)" % (repr(self.left), repr(self.right))
 
 class Ellipsis(Node):
+    __slots__ = ()
+
     def __init__(self, lineno=None):
         self.lineno = lineno
 
@@ -473,6 +562,8 @@ class Ellipsis(Node):
         return "Ellipsis()"
 
 class Exec(Node):
+    __slots__ = ('expr', 'locals', 'globals')
+
     def __init__(self, expr, locals, globals, lineno=None):
         self.expr = expr
         self.locals = locals
@@ -499,6 +590,8 @@ class Exec(Node):
         return "Exec(%s, %s, %s)" % (repr(self.expr), repr(self.locals), repr(self.globals))
 
 class FloorDiv(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -514,6 +607,8 @@ class FloorDiv(Node):
         return "FloorDiv(%s, %s)" % (repr(self.left), repr(self.right))
 
 class For(Node):
+    __slots__ = ('assign', 'list', 'body', 'else_')
+
     def __init__(self, assign, list, body, else_, lineno=None):
         self.assign = assign
         self.list = list
@@ -542,6 +637,8 @@ class For(Node):
         return "For(%s, %s, %s, %s)" % (repr(self.assign), repr(self.list), repr(self.body), repr(self.else_))
 
 class From(Node):
+    __slots__ = ('modname', 'names', 'level')
+
     def __init__(self, modname, names, level, lineno=None):
         self.modname = modname
         self.names = names
@@ -558,6 +655,8 @@ class From(Node):
         return "From(%s, %s, %s)" % (repr(self.modname), repr(self.names), repr(self.level))
 
 class Function(Node):
+    __slots__ = ('decorators', 'name', 'argnames', 'defaults', 'varargs', 'kwargs', 'doc', 'code')
+
     def __init__(self, decorators, name, argnames, defaults, varargs, kwargs, doc, code, lineno=None):
         self.decorators = decorators
         self.name = name
@@ -594,9 +693,9 @@ class Function(Node):
     def __repr__(self):
         return "Function(%s, %s, %s, %s, %s, %s, %s, %s)" % (repr(self.decorators), repr(self.name), repr(self.argnames), repr(self.defaults), repr(self.varargs), repr(self.kwargs), repr(self.doc), repr(self.code))
 
-_Function = Function
-
 class GenExpr(Node):
+    __slots__ = ('code', 'argnames', 'varargs', 'kwargs')
+
     def __init__(self, code, lineno=None):
         self.code = code
         self.lineno = lineno
@@ -614,6 +713,8 @@ class GenExpr(Node):
         return "GenExpr(%s)" % (repr(self.code),)
 
 class GenExprFor(Node):
+    __slots__ = ('assign', 'iter', 'ifs', 'is_outmost')
+
     def __init__(self, assign, iter, ifs, lineno=None):
         self.assign = assign
         self.iter = iter
@@ -639,6 +740,8 @@ class GenExprFor(Node):
         return "GenExprFor(%s, %s, %s)" % (repr(self.assign), repr(self.iter), repr(self.ifs))
 
 class GenExprIf(Node):
+    __slots__ = ('test',)
+
     def __init__(self, test, lineno=None):
         self.test = test
         self.lineno = lineno
@@ -653,6 +756,8 @@ class GenExprIf(Node):
         return "GenExprIf(%s)" % (repr(self.test),)
 
 class GenExprInner(Node):
+    __slots__ = ('expr', 'quals')
+
     def __init__(self, expr, quals, lineno=None):
         self.expr = expr
         self.quals = quals
@@ -674,6 +779,8 @@ class GenExprInner(Node):
         return "GenExprInner(%s, %s)" % (repr(self.expr), repr(self.quals))
 
 class Getattr(Node):
+    __slots__ = ('expr', 'attrname')
+
     def __init__(self, expr, attrname, lineno=None):
         self.expr = expr
         self.attrname = attrname
@@ -689,6 +796,8 @@ class Getattr(Node):
         return "Getattr(%s, %s)" % (repr(self.expr), repr(self.attrname))
 
 class Global(Node):
+    __slots__ = ('names',)
+
     def __init__(self, names, lineno=None):
         self.names = names
         self.lineno = lineno
@@ -703,6 +812,8 @@ class Global(Node):
         return "Global(%s)" % (repr(self.names),)
 
 class If(Node):
+    __slots__ = ('tests', 'else_')
+
     def __init__(self, tests, else_, lineno=None):
         self.tests = tests
         self.else_ = else_
@@ -725,6 +836,8 @@ class If(Node):
         return "If(%s, %s)" % (repr(self.tests), repr(self.else_))
 
 class IfExp(Node):
+    __slots__ = ('test', 'then', 'else_')
+
     def __init__(self, test, then, else_, lineno=None):
         self.test = test
         self.then = then
@@ -741,6 +854,8 @@ class IfExp(Node):
         return "IfExp(%s, %s, %s)" % (repr(self.test), repr(self.then), repr(self.else_))
 
 class Import(Node):
+    __slots__ = ('names',)
+
     def __init__(self, names, lineno=None):
         self.names = names
         self.lineno = lineno
@@ -755,6 +870,8 @@ class Import(Node):
         return "Import(%s)" % (repr(self.names),)
 
 class Invert(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, lineno=None):
         self.expr = expr
         self.lineno = lineno
@@ -769,6 +886,8 @@ class Invert(Node):
         return "Invert(%s)" % (repr(self.expr),)
 
 class Keyword(Node):
+    __slots__ = ('name', 'expr')
+
     def __init__(self, name, expr, lineno=None):
         self.name = name
         self.expr = expr
@@ -784,6 +903,8 @@ class Keyword(Node):
         return "Keyword(%s, %s)" % (repr(self.name), repr(self.expr))
 
 class Lambda(Node):
+    __slots__ = ('argnames', 'defaults', 'varargs', 'kwargs', 'code')
+
     def __init__(self, argnames, defaults, varargs, kwargs, code, lineno=None):
         self.argnames = argnames
         self.defaults = defaults
@@ -813,6 +934,8 @@ class Lambda(Node):
         return "Lambda(%s, %s, %s, %s, %s)" % (repr(self.argnames), repr(self.defaults), repr(self.varargs), repr(self.kwargs), repr(self.code))
 
 class LeftShift(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -828,6 +951,8 @@ class LeftShift(Node):
         return "LeftShift(%s, %s)" % (repr(self.left), repr(self.right))
 
 class List(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -843,10 +968,9 @@ class List(Node):
     def __repr__(self):
         return "List(%s)" % (repr(self.nodes),)
 
-class CollComp(Node):
-    pass
-
 class ListComp(CollComp):
+    __slots__ = ('expr', 'quals')
+
     def __init__(self, expr, quals, lineno=None):
         self.expr = expr
         self.quals = quals
@@ -868,6 +992,8 @@ class ListComp(CollComp):
         return "ListComp(%s, %s)" % (repr(self.expr), repr(self.quals))
 
 class ListCompFor(Node):
+    __slots__ = ('assign', 'list', 'ifs')
+
     def __init__(self, assign, list, ifs, lineno=None):
         self.assign = assign
         self.list = list
@@ -892,6 +1018,8 @@ class ListCompFor(Node):
         return "ListCompFor(%s, %s, %s)" % (repr(self.assign), repr(self.list), repr(self.ifs))
 
 class ListCompIf(Node):
+    __slots__ = ('test',)
+
     def __init__(self, test, lineno=None):
         self.test = test
         self.lineno = lineno
@@ -905,52 +1033,9 @@ class ListCompIf(Node):
     def __repr__(self):
         return "ListCompIf(%s)" % (repr(self.test),)
 
-class SetComp(CollComp):
-    def __init__(self, expr, quals, lineno=None):
-        self.expr = expr
-        self.quals = quals
-        self.lineno = lineno
-
-    def getChildren(self):
-        children = []
-        children.append(self.expr)
-        children.extend(flatten(self.quals))
-        return tuple(children)
-
-    def getChildNodes(self):
-        nodelist = []
-        nodelist.append(self.expr)
-        nodelist.extend(flatten_nodes(self.quals))
-        return tuple(nodelist)
-
-    def __repr__(self):
-        return "SetComp(%s, %s)" % (repr(self.expr), repr(self.quals))
-
-class DictComp(CollComp):
-    def __init__(self, key, value, quals, lineno=None):
-        self.key = key
-        self.value = value
-        self.quals = quals
-        self.lineno = lineno
-
-    def getChildren(self):
-        children = []
-        children.append(self.key)
-        children.append(self.value)
-        children.extend(flatten(self.quals))
-        return tuple(children)
-
-    def getChildNodes(self):
-        nodelist = []
-        nodelist.append(self.key)
-        nodelist.append(self.value)
-        nodelist.extend(flatten_nodes(self.quals))
-        return tuple(nodelist)
-
-    def __repr__(self):
-        return "DictComp(%s, %s, %s)" % (repr(self.key), repr(self.value), repr(self.quals))
-
 class Mod(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -966,6 +1051,8 @@ class Mod(Node):
         return "Mod(%s, %s)" % (repr(self.left), repr(self.right))
 
 class Module(Node):
+    __slots__ = ('doc', 'node')
+
     def __init__(self, doc, node, lineno=None):
         self.doc = doc
         self.node = node
@@ -981,6 +1068,8 @@ class Module(Node):
         return "Module(%s, %s)" % (repr(self.doc), repr(self.node))
 
 class Mul(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -996,6 +1085,8 @@ class Mul(Node):
         return "Mul(%s, %s)" % (repr(self.left), repr(self.right))
 
 class Name(Node):
+    __slots__ = ('name',)
+
     def __init__(self, name, lineno=None):
         self.name = name
         self.lineno = lineno
@@ -1010,6 +1101,8 @@ class Name(Node):
         return "Name(%s)" % (repr(self.name),)
 
 class Not(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, lineno=None):
         self.expr = expr
         self.lineno = lineno
@@ -1024,6 +1117,8 @@ class Not(Node):
         return "Not(%s)" % (repr(self.expr),)
 
 class Or(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -1040,6 +1135,8 @@ class Or(Node):
         return "Or(%s)" % (repr(self.nodes),)
 
 class Pass(Node):
+    __slots__ = ()
+
     def __init__(self, lineno=None):
         self.lineno = lineno
 
@@ -1053,6 +1150,8 @@ class Pass(Node):
         return "Pass()"
 
 class Power(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -1068,6 +1167,8 @@ class Power(Node):
         return "Power(%s, %s)" % (repr(self.left), repr(self.right))
 
 class Print(Node):
+    __slots__ = ('nodes', 'dest')
+
     def __init__(self, nodes, dest, lineno=None):
         self.nodes = nodes
         self.dest = dest
@@ -1090,6 +1191,8 @@ class Print(Node):
         return "Print(%s, %s)" % (repr(self.nodes), repr(self.dest))
 
 class Printnl(Node):
+    __slots__ = ('nodes', 'dest', 'nl')
+
     def __init__(self, nodes, dest, nl, lineno=None):
         self.nodes = nodes
         self.dest = dest
@@ -1115,6 +1218,8 @@ class Printnl(Node):
         return "Printnl(%s, %s, %s)" % (repr(self.nodes), repr(self.dest), repr(self.nl))
 
 class Raise(Node):
+    __slots__ = ('expr1', 'expr2', 'expr3')
+
     def __init__(self, expr1, expr2, expr3, lineno=None):
         self.expr1 = expr1
         self.expr2 = expr2
@@ -1142,6 +1247,8 @@ class Raise(Node):
         return "Raise(%s, %s, %s)" % (repr(self.expr1), repr(self.expr2), repr(self.expr3))
 
 class Return(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value, lineno=None):
         self.value = value
         self.lineno = lineno
@@ -1156,6 +1263,8 @@ class Return(Node):
         return "Return(%s)" % (repr(self.value),)
 
 class RightShift(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -1171,6 +1280,8 @@ class RightShift(Node):
         return "RightShift(%s, %s)" % (repr(self.left), repr(self.right))
 
 class Set(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -1186,7 +1297,32 @@ class Set(Node):
     def __repr__(self):
         return "Set(%s)" % (repr(self.nodes),)
 
+class SetComp(CollComp):
+    __slots__ = ('expr', 'quals')
+
+    def __init__(self, expr, quals, lineno=None):
+        self.expr = expr
+        self.quals = quals
+        self.lineno = lineno
+
+    def getChildren(self):
+        children = []
+        children.append(self.expr)
+        children.extend(flatten(self.quals))
+        return tuple(children)
+
+    def getChildNodes(self):
+        nodelist = []
+        nodelist.append(self.expr)
+        nodelist.extend(flatten_nodes(self.quals))
+        return tuple(nodelist)
+
+    def __repr__(self):
+        return "SetComp(%s, %s)" % (repr(self.expr), repr(self.quals))
+
 class Slice(Node):
+    __slots__ = ('expr', 'flags', 'lower', 'upper')
+
     def __init__(self, expr, flags, lower, upper, lineno=None):
         self.expr = expr
         self.flags = flags
@@ -1215,6 +1351,8 @@ class Slice(Node):
         return "Slice(%s, %s, %s, %s)" % (repr(self.expr), repr(self.flags), repr(self.lower), repr(self.upper))
 
 class Sliceobj(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -1231,6 +1369,8 @@ class Sliceobj(Node):
         return "Sliceobj(%s)" % (repr(self.nodes),)
 
 class Stmt(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -1247,6 +1387,8 @@ class Stmt(Node):
         return "Stmt(%s)" % (repr(self.nodes),)
 
 class Sub(Node):
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right, lineno=None):
         self.left = left
         self.right = right
@@ -1262,6 +1404,8 @@ class Sub(Node):
         return "Sub(%s, %s)" % (repr(self.left), repr(self.right))
 
 class Subscript(Node):
+    __slots__ = ('expr', 'flags', 'subs')
+
     def __init__(self, expr, flags, subs, lineno=None):
         self.expr = expr
         self.flags = flags
@@ -1285,6 +1429,8 @@ class Subscript(Node):
         return "Subscript(%s, %s, %s)" % (repr(self.expr), repr(self.flags), repr(self.subs))
 
 class TryExcept(Node):
+    __slots__ = ('body', 'handlers', 'else_')
+
     def __init__(self, body, handlers, else_, lineno=None):
         self.body = body
         self.handlers = handlers
@@ -1310,6 +1456,8 @@ class TryExcept(Node):
         return "TryExcept(%s, %s, %s)" % (repr(self.body), repr(self.handlers), repr(self.else_))
 
 class TryFinally(Node):
+    __slots__ = ('body', 'final_')
+
     def __init__(self, body, final_, lineno=None):
         self.body = body
         self.final_ = final_
@@ -1325,6 +1473,8 @@ class TryFinally(Node):
         return "TryFinally(%s, %s)" % (repr(self.body), repr(self.final_))
 
 class Tuple(Node):
+    __slots__ = ('nodes',)
+
     def __init__(self, nodes, lineno=None):
         self.nodes = nodes
         self.lineno = lineno
@@ -1341,6 +1491,8 @@ class Tuple(Node):
         return "Tuple(%s)" % (repr(self.nodes),)
 
 class UnaryAdd(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, lineno=None):
         self.expr = expr
         self.lineno = lineno
@@ -1355,6 +1507,8 @@ class UnaryAdd(Node):
         return "UnaryAdd(%s)" % (repr(self.expr),)
 
 class UnarySub(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, lineno=None):
         self.expr = expr
         self.lineno = lineno
@@ -1369,6 +1523,8 @@ class UnarySub(Node):
         return "UnarySub(%s)" % (repr(self.expr),)
 
 class While(Node):
+    __slots__ = ('test', 'body', 'else_')
+
     def __init__(self, test, body, else_, lineno=None):
         self.test = test
         self.body = body
@@ -1394,6 +1550,8 @@ class While(Node):
         return "While(%s, %s, %s)" % (repr(self.test), repr(self.body), repr(self.else_))
 
 class With(Node):
+    __slots__ = ('expr', 'vars', 'body')
+
     def __init__(self, expr, vars, body, lineno=None):
         self.expr = expr
         self.vars = vars
@@ -1419,6 +1577,8 @@ class With(Node):
         return "With(%s, %s, %s)" % (repr(self.expr), repr(self.vars), repr(self.body))
 
 class Yield(Node):
+    __slots__ = ('value',)
+
     def __init__(self, value, lineno=None):
         self.value = value
         self.lineno = lineno
@@ -1432,6 +1592,8 @@ class Yield(Node):
     def __repr__(self):
         return "Yield(%s)" % (repr(self.value),)
 
+_Function = Function
+
 for name, obj in list(globals().items()):
     if isinstance(obj, type) and issubclass(obj, Node):
         nodes[name.lower()] = obj
@@ -0,0 +1,187 @@
+"""On-disk cache of the syntax trees built by parseFile.
+
+Tokenizing, parsing and transforming a large module takes far longer than
+loading its pickled tree, so parseFile stores the trees it builds in the
+directory named by the PYJS_PARSE_CACHE environment variable (by default
+~/.pyjs/parsecache; an empty value disables the cache).  Entries are keyed
+by the source text and by a digest of the parser and transformer sources,
+so a changed grammar or ast never loads stale trees.  Like the build
+cache, the least recently used entries are removed once the cache grows
+beyond its limit (PYJS_PARSE_CACHE_SIZE bytes, 256MB by default).
+"""
+
+import os
+import sys
+import time
+import tempfile
+import cPickle
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
+LIB_TRANS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sources which determine the trees built from a given text
+GRAMMAR_FILES = ['pytoken.py', 'pysymbol.py',
+                 os.path.join('pyparser', '__init__.py'),
+                 os.path.join('pyparser', 'driver.py'),
+                 os.path.join('pyparser', 'grammar2x.py'),
+                 os.path.join('pyparser', 'parse.py'),
+                 os.path.join('pyparser', 'tokenize.py'),
+                 os.path.join('pycompiler', 'ast.py'),
+                 os.path.join('pycompiler', 'transformer.py')]
+
+DEFAULT_PATH = os.path.join('~', '.pyjs', 'parsecache')
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+_grammar_version = None
+_cache = None
+
+
+def grammar_version():
+    """returns a digest of the parser and transformer sources"""
+    global _grammar_version
+    if _grammar_version is None:
+        h = md5(repr(sys.version_info[:2]))
+        for name in GRAMMAR_FILES:
+            path = os.path.join(LIB_TRANS_PATH, name)
+            if os.path.isfile(path):
+                f = open(path, 'rb')
+                h.update(name)
+                h.update(f.read())
+                f.close()
+        _grammar_version = h.hexdigest()
+    return _grammar_version
+
+
+class ParseCache(object):
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, src):
+        return md5(grammar_version() + src).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + '.pickle')
+
+    def get(self, key):
+        """returns the tree stored for key, or None"""
+        path = self.entry_path(key)
+        try:
+            f = open(path, 'rb')
+        except IOError:
+            return None
+        try:
+            try:
+                tree = cPickle.load(f)
+            except Exception:
+                # truncated or written by an incompatible version
+                return None
+        finally:
+            f.close()
+        try:
+            # the modification time records the last use
+            os.utime(path, None)
+        except OSError:
+            pass
+        return tree
+
+    def put(self, key, tree):
+        path = self.entry_path(key)
+        dir_name = os.path.dirname(path)
+        try:
+            if not os.path.isdir(dir_name):
+                try:
+                    os.makedirs(dir_name)
+                except OSError:
+                    # created by a concurrent build
+                    if not os.path.isdir(dir_name):
+                        raise
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=dir_name)
+        except OSError:
+            # the cache is not writable; parsing works without it
+            return
+        f = os.fdopen(fd, 'wb')
+        try:
+            try:
+                cPickle.dump(tree, f, cPickle.HIGHEST_PROTOCOL)
+            finally:
+                f.close()
+        except RuntimeError:
+            # nested too deeply to be pickled
+            os.unlink(tmp_path)
+            return
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # windows does not replace existing files; the entry is
+            # already there, written by a concurrent build
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def parse(self, src, parse):
+        """returns the tree for src, building it with parse(src) and
+        storing it if it is not in the cache yet"""
+        key = self.key(src)
+        tree = self.get(key)
+        if tree is None:
+            self.misses += 1
+            tree = parse(src)
+            self.put(key, tree)
+        else:
+            self.hits += 1
+        return tree
+
+    def trim(self):
+        """removes the least recently used entries until the cache is no
+        larger than max_size"""
+        if not self.max_size:
+            return
+        entries = []
+        total = 0
+        now = time.time()
+        for root, dirs, files in os.walk(self.path):
+            for fname in files:
+                path = os.path.join(root, fname)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if fname.endswith('.tmp') and now - st.st_mtime < 3600:
+                    # still being written by a concurrent build
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        if total <= self.max_size:
+            return
+        entries.sort()
+        for mtime, size, path in entries:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_size:
+                break
+
+
+def get_parse_cache():
+    """returns the ParseCache configured by PYJS_PARSE_CACHE and
+    PYJS_PARSE_CACHE_SIZE, or None"""
+    global _cache
+    path = os.environ.get('PYJS_PARSE_CACHE', DEFAULT_PATH)
+    if not path:
+        return None
+    max_size = int(os.environ.get('PYJS_PARSE_CACHE_SIZE', DEFAULT_MAX_SIZE))
+    if _cache is None or _cache.path != os.path.abspath(
+            os.path.expanduser(path)):
+        _cache = ParseCache(path, max_size)
+    _cache.max_size = max_size
+    return _cache
@@ -29,14 +29,20 @@ parseFile(path) -> AST
 # and replace OWNER, ORGANIZATION, and YEAR as appropriate.
 
 import sys
+import time
 from pycompiler.ast import *
 import pyparser as parser
 import pysymbol as symbol
 import pytoken as token
+from pycompiler import parsecache
 
 class WalkerError(Exception):
     pass
 
+# seconds spent building parse trees and transforming them into ast trees,
+# for build profiling
+timings = {'parse': 0.0, 'transform': 0.0}
+
 from compiler.consts import CO_VARARGS, CO_VARKEYWORDS
 from compiler.consts import OP_ASSIGN, OP_DELETE, OP_APPLY
 
@@ -48,7 +54,10 @@ def parseFile(path):
     # version of the API.
     src = f.read() + "\n"
     f.close()
-    return parse(src)
+    cache = parsecache.get_parse_cache()
+    if cache is None:
+        return parse(src)
+    return cache.parse(src, parse)
 
 def parse(buf, mode="exec"):
     if mode == "exec" or mode == "single":
@@ -129,7 +138,13 @@ class Transformer:
 
     def parsesuite(self, text):
         """Return a modified parse tree for the given suite text."""
-        return self.transform(parser.suite(text))
+        start = time.time()
+        tree = parser.suite(text)
+        parsed = time.time()
+        tree = self.transform(tree)
+        timings['parse'] += parsed - start
+        timings['transform'] += time.time() - parsed
+        return tree
 
     def parseexpr(self, text):
         """Return a modified parse tree for the given expression text."""
@@ -13,7 +13,9 @@ how this parsing engine works.
 import pytoken as token
 import pysymbol as symbol
 
-class Node:
+class Node(object):
+    __slots__ = ('type', 'value', 'context', 'children')
+
     def __init__(self, type, value, context, children):
         self.type = type
         self.value = value
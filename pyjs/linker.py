@@ -1,11 +1,17 @@
 import os
 import sys
+import time
 import pyjs.util as util
 import logging
 import pyjs
 import subprocess
+import signal
+import traceback
+from optparse import OptionParser
 from pyjs import options
 from pyjs import translator
+from pyjs import buildcache
+from pyjs import buildprofile
 if translator.name == 'proto':
     builtin_module = 'pyjslib'
 elif translator.name == 'dict':
@@ -15,6 +21,12 @@ else:
 translate_cmd = 'translator.py'
 translate_cmd_opts = ['--use-translator=%s' % translator.name]
 
+try:
+    import multiprocessing
+    enable_multiprocessing = True
+except ImportError:
+    enable_multiprocessing = False
+
 
 PYLIB_PATH = os.path.join(os.path.dirname(__file__), 'lib')
 BUILTIN_PATH = os.path.join(os.path.dirname(__file__), 'builtin')
@@ -60,6 +72,25 @@ def get_translator_opts(args):
                 opts.append(nk.replace('en', 'dis', 1))
     return opts
 
+_normalized_opts_cache = {}
+def normalize_translator_opts(args):
+    """returns the compile options exactly as translator.py sees them
+    when it is run with get_translator_opts(args)"""
+    key = tuple(sorted(args.items()))
+    if not key in _normalized_opts_cache:
+        parser = OptionParser()
+        translator.add_compile_options(parser)
+        opts, _ = parser.parse_args(get_translator_opts(args))
+        _normalized_opts_cache[key] = translator.get_compile_options(opts)
+    return _normalized_opts_cache[key]
+
+def print_translating(platform, file_name):
+    if platform is not None:
+        platform = "[%s] " % platform
+    else:
+        platform = ''
+    print("Translating file %s:" % platform, file_name)
+
 def parse_outfile(out_file):
     deps = []
     jslibs = []
@@ -91,6 +122,14 @@ def parse_outfile(out_file):
 
     return deps, jslibs
 
+def read_deps(out_file):
+    """returns the imports of a translated module from its dependency
+    manifest, or from out_file itself if there is no up to date manifest"""
+    deps = util.read_deps_manifest(out_file)
+    if deps is None:
+        return parse_outfile(out_file)
+    return deps
+
 def out_translate(platform, file_names, out_file, module_name,
                    translator_args, incremental):
     do_translate = False    # flag for incremental translate mode
@@ -101,11 +140,7 @@ def out_translate(platform, file_names, out_file, module_name,
         # check for any files that need built
         for file_name in file_names:
             if is_modified(file_name,out_file):
-                if platform is not None:
-                    platform = "[%s] " % platform
-                else:
-                    platform = ''
-                print("Translating file %s:" % platform, file_name)
+                print_translating(platform, file_name)
                 do_translate = True
                 break
     if not incremental or do_translate:
@@ -142,12 +177,219 @@ def out_translate(platform, file_names, out_file, module_name,
         print(stdout_value)
         return [], []
 
-    deps, js_libs = parse_outfile(out_file)
+    deps, js_libs = read_deps(out_file)
     # use this to create dependencies for Makefiles.  maybe.
     #print "translate", out_file, deps, js_libs, stdout_value
 
     return deps, js_libs
 
+def _pool_init():
+    # ^C is handled by the linker process, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _pool_translate(job):
+    file_names, out_file, module_name, translator_args = job
+    try:
+        deps, js_libs = translator.translate(file_names, out_file,
+                                             module_name, **translator_args)
+    except Exception:
+        return None, None, traceback.format_exc()
+    return deps, js_libs, None
+
+class TranslatorPool(object):
+    """translator_func which runs translator.translate() inside a pool of
+    worker processes, instead of starting translator.py for every module.
+
+    Modules passed to prefetch() are translated in the background while
+    the linker carries on; calling the pool returns the result for one
+    module, waiting for it if needed.  The linker still visits modules in
+    the same order, so the output is the same as with out_translate."""
+
+    def __init__(self, processes=0):
+        if not processes:
+            try:
+                processes = multiprocessing.cpu_count()
+            except NotImplementedError:
+                processes = 1
+        self.processes = processes
+        self.pool = None
+        self.pending = {}
+
+    def _modified(self, platform, file_names, out_file):
+        for file_name in file_names:
+            if is_modified(file_name, out_file):
+                print_translating(platform, file_name)
+                return True
+        return False
+
+    def _submit(self, file_names, out_file, module_name, translator_args):
+        opts = normalize_translator_opts(translator_args)
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.processes, _pool_init)
+        job = (list(file_names), out_file, module_name, opts)
+        return self.pool.apply_async(_pool_translate, (job,))
+
+    def prefetch(self, platform, file_names, out_file, module_name,
+                 translator_args, incremental):
+        if out_file in self.pending or translator_args.get('list_imports'):
+            return
+        if incremental and not self._modified(platform, file_names, out_file):
+            return
+        self.pending[out_file] = self._submit(file_names, out_file,
+                                              module_name, translator_args)
+
+    def __call__(self, platform, file_names, out_file, module_name,
+                 translator_args, incremental):
+        if translator_args.get('list_imports', None):
+            return out_translate(platform, file_names, out_file, module_name,
+                                 translator_args, incremental)
+        result = self.pending.pop(out_file, None)
+        if result is None:
+            if incremental and not self._modified(platform, file_names,
+                                                  out_file):
+                return read_deps(out_file)
+            result = self._submit(file_names, out_file, module_name,
+                                  translator_args)
+        deps, js_libs, error = result.get()
+        if error:
+            sys.stderr.write(error)
+            raise translator.TranslationError(
+                'general fail in translator process')
+        return deps, js_libs
+
+    def close(self):
+        if self.pool is None:
+            return
+        if self.pending:
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
+        self.pool = None
+        self.pending = {}
+
+class ServerTranslator(object):
+    """translator_func which has the modules translated by a
+    translator_server.TranslatorServer listening on socket_path.  If there
+    is no server, the modules are translated by out_translate."""
+
+    def __init__(self, socket_path):
+        from pyjs import translator_server
+        self.translator_server = translator_server
+        self.client = translator_server.TranslatorClient(socket_path)
+        self.available = None
+
+    def connect(self):
+        if self.available is None:
+            import socket
+            try:
+                self.client.connect()
+                self.available = True
+            except socket.error, e:
+                print("translator server not available (%s), "
+                      "starting translator.py" % e)
+                self.available = False
+        return self.available
+
+    def __call__(self, platform, file_names, out_file, module_name,
+                 translator_args, incremental):
+        if translator_args.get('list_imports', None) or not self.connect():
+            return out_translate(platform, file_names, out_file, module_name,
+                                 translator_args, incremental)
+        if incremental:
+            for file_name in file_names:
+                if is_modified(file_name, out_file):
+                    print_translating(platform, file_name)
+                    break
+            else:
+                return read_deps(out_file)
+        import socket
+        name = normalize_translator_opts(translator_args)['translator']
+        try:
+            return self.client.translate(file_names, out_file, module_name,
+                                         name, **translator_args)
+        except (socket.error,
+                self.translator_server.TranslatorMismatch), e:
+            print("translator server not available (%s), "
+                  "starting translator.py" % e)
+            self.available = False
+            self.client.close()
+        return out_translate(platform, file_names, out_file, module_name,
+                             translator_args, False)
+
+    def close(self):
+        self.client.close()
+
+class CachedTranslator(object):
+    """translator_func wrapper which looks modules up in a
+    buildcache.BuildCache by the content of their sources and the compile
+    options, instead of comparing modification times.  Cache misses are
+    translated by translator_func and stored."""
+
+    def __init__(self, translator_func, cache):
+        self.translator_func = translator_func
+        self.cache = cache
+        self.keys = {}
+        self.prefetched = set()
+        # whether the module of the last call came from the cache
+        self.last_hit = None
+
+    def key(self, file_names, out_file, module_name, translator_args):
+        if not out_file in self.keys:
+            # profiling does not change the javascript
+            translator_args = dict(translator_args,
+                                   profile_translation=False)
+            opts = get_translator_opts(
+                normalize_translator_opts(translator_args))
+            self.keys[out_file] = self.cache.key(file_names, module_name,
+                                                 opts)
+        return self.keys[out_file]
+
+    def prefetch(self, platform, file_names, out_file, module_name,
+                 translator_args, incremental):
+        prefetch = getattr(self.translator_func, 'prefetch', None)
+        if prefetch is None or translator_args.get('list_imports'):
+            return
+        key = self.key(file_names, out_file, module_name, translator_args)
+        if not key in self.cache:
+            print_translating(platform, file_names[0])
+            self.prefetched.add(out_file)
+            prefetch(platform, file_names, out_file, module_name,
+                     translator_args, False)
+
+    def __call__(self, platform, file_names, out_file, module_name,
+                 translator_args, incremental):
+        if translator_args.get('list_imports', None):
+            return self.translator_func(platform, file_names, out_file,
+                                        module_name, translator_args,
+                                        incremental)
+        key = self.key(file_names, out_file, module_name, translator_args)
+        entry = self.cache.get(key)
+        self.last_hit = entry is not None
+        if entry is not None:
+            deps, js_libs, js = entry
+            f = open(out_file, 'wb')
+            f.write(js)
+            f.close()
+            util.write_deps_manifest(out_file, deps, js_libs)
+            return deps, js_libs
+        if not out_file in self.prefetched:
+            print_translating(platform, file_names[0])
+        deps, js_libs = self.translator_func(platform, file_names, out_file,
+                                             module_name, translator_args,
+                                             False)
+        f = open(out_file, 'rb')
+        js = f.read()
+        f.close()
+        self.cache.put(key, deps, js_libs, js)
+        return deps, js_libs
+
+    def close(self):
+        self.cache.trim()
+        close = getattr(self.translator_func, 'close', None)
+        if close is not None:
+            close()
+
 _path_cache= {}
 def module_path(name, path, platform=None):
     if name == '__pyjamas__' or name == '__javascript__':
@@ -223,7 +465,11 @@ class BaseLinker(object):
                  translator_arguments={},
                  compile_inplace=False,
                  list_imports=False,
-                 translator_func=out_translate):
+                 translator_func=out_translate,
+                 translator_jobs=None,
+                 translator_server=None,
+                 build_cache=None,
+                 profile_build=None):
         modules = [mod.replace(os.sep, '.') for mod in modules]
         self.compiler = compiler
         self.js_path = os.path.abspath(output)
@@ -241,31 +487,78 @@ class BaseLinker(object):
         self.platforms = platforms
         self.path = path + [PYLIB_PATH]
         self.translator_arguments = translator_arguments
+        if translator_server and translator_func is out_translate:
+            if translator_jobs is not None:
+                print("--translator-jobs is ignored, the modules are "
+                      "translated by the translator server")
+            translator_func = ServerTranslator(translator_server)
+        if translator_jobs is not None and translator_func is out_translate:
+            if enable_multiprocessing:
+                translator_func = TranslatorPool(translator_jobs)
+            else:
+                print("multiprocessing not available.")
+        if build_cache is not None:
+            translator_func = CachedTranslator(translator_func, build_cache)
+        self.build_cache = build_cache
         self.translator_func = translator_func
         self.compile_inplace = compile_inplace
         self.top_module_path = None
         self.remove_files = {}
         self.list_imports = list_imports
+        self.profile_build = profile_build
+        self.profile = None
 
     def __call__(self):
         try:
+            if self.profile_build and not self.list_imports:
+                self.profile = buildprofile.BuildProfile(self.profile_build)
+                self.translator_arguments = dict(self.translator_arguments,
+                                                 profile_translation=True)
             self.visited_modules = {}
             self.done = {}
             self.dependencies = {}
+            self.sources = {}
+            self.source_outputs = {}
+            self.module_js_libs = {}
             self.visit_start()
             for platform in [None] + self.platforms:
                 self.visit_start_platform(platform)
+                start = time.time()
                 old_path = self.path
                 self.path = [BUILTIN_PATH, PYLIB_PATH, PYJAMASLIB_PATH]
                 self.visit_modules([builtin_module], platform)
                 self.path = old_path
                 self.visit_modules(self.modules, platform)
+                self.profile_phase('translate', platform, start)
                 if not self.list_imports:
+                    start = time.time()
                     self.visit_end_platform(platform)
+                    self.profile_phase('link', platform, start)
             if not self.list_imports:
+                start = time.time()
                 self.visit_end()
+                self.profile_phase('finish', None, start)
         except translator.TranslationError, e:
             raise
+        finally:
+            self.close_translator()
+        if self.profile is not None:
+            self.profile.write(self.output)
+
+    def profile_phase(self, name, platform, start):
+        if self.profile is not None:
+            self.profile.add_phase(name, platform, time.time() - start)
+
+    def close_translator(self):
+        close = getattr(self.translator_func, 'close', None)
+        if close is not None:
+            close()
+        # only the proto translator parses with the parse cache
+        compiler = getattr(translator, 'compiler', None)
+        if compiler is not None:
+            parse_cache = compiler.parsecache.get_parse_cache()
+            if parse_cache is not None:
+                parse_cache.trim()
 
     def visit_modules(self, module_names, platform=None, parent_file = None):
         prefix = ''
@@ -290,6 +583,7 @@ class BaseLinker(object):
                     abs_name = os.path.split(parent_file)[0]
                     abs_name = '.'.join(abs_name[len(parent_base)+1:].split(os.sep))
 
+        resolved = []
         for mn in all_names:
             p = None
             if abs_name:
@@ -313,41 +607,75 @@ class BaseLinker(object):
                     # prevent package overrides
                     if override_path and not override_path.endswith('__init__.py'):
                         override_paths.append(override_path)
+            resolved.append((p, override_paths, mn))
+        self.prefetch_modules(resolved, platform)
+        for p, override_paths, mn in resolved:
             self.visit_module(p, override_paths, platform, module_name=mn)
 
-    def visit_module(self, file_path, overrides, platform,
-                     module_name):
+    def prefetch_modules(self, modules, platform):
+        """hands the modules about to be visited to the translator_func,
+        if it can translate them in the background"""
+        prefetch = getattr(self.translator_func, 'prefetch', None)
+        if prefetch is None or self.list_imports:
+            return
+        for file_path, overrides, module_name in modules:
+            if file_path.endswith('.js'):
+                continue
+            out_file = self.module_out_file(file_path, overrides, platform,
+                                            module_name)
+            if (   out_file is None
+                or out_file in self.done.get(platform, [])
+                or not self.must_translate(out_file, overrides, platform)
+               ):
+                continue
+            prefetch(platform, [file_path] + overrides, out_file,
+                     module_name, self.translator_arguments,
+                     self.keep_lib_files)
+
+    def module_out_file(self, file_path, overrides, platform, module_name):
+        """returns the output file for a module, or None if file_path
+        does not provide module_name"""
         dir_name, file_name = os.path.split(file_path)
         if (     not file_name.endswith('.js')
              and file_name.split('.')[0] != module_name.split('.')[-1]
            ):
             if file_name == "__init__.py":
                 if os.path.basename(dir_name) != module_name.split('.')[-1]:
-                    return
+                    return None
             else:
-                return
-        self.merge_resources(dir_name)
+                return None
         if platform and overrides:
             plat_suffix = '.__%s__' % platform
         else:
             plat_suffix = ''
         if self.compile_inplace:
             mod_part, extension = os.path.splitext(file_path)
-            out_file = mod_part + plat_suffix + pyjs.MOD_SUFFIX
-        else:
-            out_file = os.path.join(self.output, 'lib',
-                                    module_name + plat_suffix + pyjs.MOD_SUFFIX)
-        if out_file in self.done.get(platform, []):
-            return
+            return mod_part + plat_suffix + pyjs.MOD_SUFFIX
+        return os.path.join(self.output, 'lib',
+                            module_name + plat_suffix + pyjs.MOD_SUFFIX)
 
+    def must_translate(self, out_file, overrides, platform):
         # translate if
         #  -    no platform
         #  - or if we have an override
         #  - or the module is used in an override only
-        if (   platform is None
-            or (platform and overrides)
-            or (out_file not in self.done.get(None,[]))
-           ):
+        return (   platform is None
+                or (platform and overrides)
+                or (out_file not in self.done.get(None,[]))
+               )
+
+    def visit_module(self, file_path, overrides, platform,
+                     module_name):
+        dir_name, file_name = os.path.split(file_path)
+        out_file = self.module_out_file(file_path, overrides, platform,
+                                        module_name)
+        if out_file is None:
+            return
+        self.merge_resources(dir_name)
+        if out_file in self.done.get(platform, []):
+            return
+
+        if self.must_translate(out_file, overrides, platform):
             if file_name.endswith('.js'):
                 if not self.list_imports:
                     fp = open(out_file, 'w')
@@ -361,12 +689,18 @@ class BaseLinker(object):
             else:
                 logging.info('Translating module:%s platform:%s out:%r' % (
                     module_name, platform or '-', out_file))
+                start = time.time()
                 deps, js_libs = self.translator_func(platform,
                                                      [file_path] +  overrides,
                                                      out_file,
                                                      module_name,
                                                      self.translator_arguments,
                                                      self.keep_lib_files)
+                if self.profile is not None:
+                    self.profile.add_module(
+                        platform, module_name, [file_path] + overrides,
+                        out_file, time.time() - start,
+                        getattr(self.translator_func, 'last_hit', None))
                 #deps, js_libs = translator.translate(self.compiler,
                 #                            [file_path] +  overrides,
                 #                            out_file,
@@ -393,10 +727,15 @@ class BaseLinker(object):
                     else:
                         raise RuntimeError( "Unknown js lib mode: %r" % mode )
 
-                if '.' in module_name:
-                    for i, dep in enumerate(deps):
-                        if module_path(dep, path=[dir_name]):
-                            deps[i] = '.'.join(module_name.split('.')[:-1] + [dep])
+                self.resolve_relative_deps(module_name, dir_name, deps)
+                self.sources[out_file] = (platform, [file_path] + overrides,
+                                          module_name)
+                self.module_js_libs[out_file] = js_libs
+                for source in [file_path] + overrides:
+                    outputs = self.source_outputs.setdefault(
+                        os.path.abspath(source), [])
+                    if out_file not in outputs:
+                        outputs.append(out_file)
         else:
             deps = self.dependencies[out_file]
         if out_file not in self.done.setdefault(platform, []):
@@ -406,6 +745,57 @@ class BaseLinker(object):
         if deps:
             self.visit_modules(deps, platform, file_path)
 
+    def resolve_relative_deps(self, module_name, dir_name, deps):
+        if '.' in module_name:
+            for i, dep in enumerate(deps):
+                if module_path(dep, path=[dir_name]):
+                    deps[i] = '.'.join(module_name.split('.')[:-1] + [dep])
+
+    def reverse_dependencies(self):
+        """returns the names of the modules importing each module"""
+        importers = {}
+        for out_file, deps in self.dependencies.items():
+            if not out_file in self.sources:
+                continue
+            module_name = self.sources[out_file][2]
+            for dep in deps:
+                importers.setdefault(dep, set()).add(module_name)
+        return importers
+
+    def rebuild(self, changed_files):
+        """retranslates only the modules built from changed_files, after
+        a complete build.  Returns the platforms whose output includes
+        them, or None if a complete build is needed because a file is not
+        part of the build or the imports of a module changed."""
+        if self.list_imports or not self.keep_lib_files:
+            return None
+        out_files = []
+        for file_name in changed_files:
+            outputs = self.source_outputs.get(os.path.abspath(file_name))
+            if not outputs:
+                return None
+            out_files += [o for o in outputs if o not in out_files]
+        importers = self.reverse_dependencies()
+        try:
+            for out_file in out_files:
+                platform, file_names, module_name = self.sources[out_file]
+                deps, js_libs = self.translator_func(
+                    platform, file_names, out_file, module_name,
+                    self.translator_arguments, self.keep_lib_files)
+                self.resolve_relative_deps(
+                    module_name, os.path.dirname(file_names[0]), deps)
+                if (   deps != self.dependencies[out_file]
+                    or js_libs != self.module_js_libs[out_file]
+                   ):
+                    return None
+                logging.info('Rebuilt module:%s imported by:%s' % (
+                    module_name,
+                    ', '.join(sorted(importers.get(module_name, [])))))
+        finally:
+            self.close_translator()
+        return [platform for platform in self.platforms
+                if [o for o in out_files if o in self.done.get(platform, [])]]
+
     def merge_resources(self, dir_name):
         """gets a directory path for each module visited, this can be
         used to collect resources e.g. public folders"""
@@ -429,6 +819,14 @@ class BaseLinker(object):
         pass
 
 
+def get_build_cache(options):
+    """returns the BuildCache selected by the linker options, or None"""
+    if not options.build_cache:
+        return None
+    return buildcache.BuildCache(options.build_cache,
+                                 options.build_cache_size * 1024 * 1024)
+
+
 mappings = options.Mappings()
 get_linker_options = mappings.link
 add_linker_options = mappings.bind
@@ -445,12 +843,91 @@ mappings.unlinked_modules = (
     ['--dynamic-load'],
     ['--dynamic'],
     [],
-    dict(help='shared modules linked DURING runtime (on-demand), regex; SYNC XHR',
+    dict(help='shared modules linked DURING runtime (on-demand), regex; SYNC XHR, or ASYNC with dynamic.load_modules',
          type='string',
          action='append',
          metavar='REGEX',
          default=[])
 )
+mappings.split_modules = (
+    ['--split-module'],
+    [],
+    [],
+    dict(help='entry modules of chunks linked DURING runtime (on-demand), with the modules only they import, regex; see --dynamic-load',
+         type='string',
+         action='append',
+         metavar='REGEX',
+         default=[])
+)
+mappings.tree_shaking_keep = (
+    ['--tree-shaking-keep'],
+    [],
+    [],
+    dict(help='functions and classes kept by --enable-tree-shaking, regex matching module.name; for names built at runtime',
+         type='string',
+         action='append',
+         metavar='REGEX',
+         default=[])
+)
+mappings.minify = (
+    ['--minify'],
+    [],
+    [],
+    dict(help='minify the code of the app files and chunks, see pyjs.minifier',
+         default=False)
+)
+mappings.precompress = (
+    ['--precompress'],
+    [],
+    [],
+    dict(help='write gzip (and brotli, if installed) compressed copies of the app files, chunks and html files',
+         default=False)
+)
+mappings.translator_jobs = (
+    ['--translator-jobs'],
+    ['--jobs'],
+    [],
+    dict(help='translate in-process using N worker processes (0: one per CPU)',
+         type='int',
+         metavar='N',
+         default=None)
+)
+mappings.translator_server = (
+    ['--translator-server'],
+    [],
+    [],
+    dict(help='translate with the translator server listening on this unix socket, see pyjs.translator_server',
+         type='string',
+         metavar='SOCKET',
+         default=os.environ.get('PYJS_TRANSLATOR_SERVER'))
+)
+mappings.build_cache = (
+    ['--build-cache'],
+    [],
+    [],
+    dict(help='cache translated modules by content in this directory',
+         type='string',
+         metavar='PATH',
+         default=os.environ.get('PYJS_BUILD_CACHE'))
+)
+mappings.build_cache_size = (
+    ['--build-cache-size'],
+    [],
+    [],
+    dict(help='build cache size limit in MiB',
+         type='int',
+         metavar='MB',
+         default=512)
+)
+mappings.profile_build = (
+    ['--profile-build'],
+    [],
+    [],
+    dict(help='write per-module and per-phase build timings and sizes to FILE (JSON) and print a summary',
+         type='string',
+         metavar='FILE',
+         default=None)
+)
 mappings.js_includes = (
     ['--static-link'],
     ['-j', '--include-js'],
@@ -0,0 +1,420 @@
+"""Javascript minifier for the code written by the linker.
+
+minify() removes the comments and the whitespace which is not needed,
+keeping the line breaks where javascript would insert a semicolon.  The
+parameters and variables of functions are renamed to short names, except
+in functions which are (or contain) eval or with statements, as their
+names may be looked up at runtime; names used as keys of object literals
+or labels, and the parameters of catch clauses are not renamed either.
+Property names and strings are never changed.
+
+With debugging enabled, the translated code pushes and pops $pyjs.track
+in every function; these statements are replaced by calls of the
+functions in TRACK_HELPERS, which have to be defined before the code
+runs, and line numbers which are overwritten at once are left out.
+
+compress() writes the gzip (and brotli, if the brotli module is
+installed) precompressed files a web server may send instead.
+"""
+
+import re
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TOKEN = re.compile(r'''
+    (?P<newline>\n)
+  | (?P<space>[ \t\r\f\v]+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\\n]|\\[\s\S])*'|"(?:[^"\\\n]|\\[\s\S])*")
+  | (?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_$\x80-\xff][\w$\x80-\xff]*)
+  | (?P<punct>>>>=|===|!==|>>>|<<=|>>=|[-+*/%&|^<>!=]=|\+\+|--|&&|\|\||<<|>>
+              |[-+*/%&|^<>!=~?:;,.(){}\[\]])
+  | (?P<other>.)
+''', re.S | re.X)
+
+REGEXP = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+
+# after these, a slash starts a regular expression instead of a division
+REGEXP_KEYWORDS = set(['return', 'typeof', 'case', 'do', 'else', 'in',
+                       'instanceof', 'new', 'delete', 'void', 'throw'])
+
+RESERVED = set('''
+    break case catch class const continue debugger default delete do else
+    enum export extends false finally for function if implements import in
+    instanceof interface let new null package private protected public
+    return static super switch this throw true try typeof var void while
+    with yield arguments eval undefined NaN Infinity
+'''.split())
+
+NAME_START = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+NAME_CHARS = NAME_START + '0123456789_$'
+
+TRACK_HELPERS = """\
+$pyjs['track_push'] = function(module, lineno) {
+    $pyjs['track'] = {'module': module, 'lineno': lineno};
+    $pyjs['trackstack']['push']($pyjs['track']);
+};
+$pyjs['track_copy'] = function() {
+    $pyjs['track'] = {'module': $pyjs['track']['module'],
+                      'lineno': $pyjs['track']['lineno']};
+    $pyjs['trackstack']['push']($pyjs['track']);
+};
+$pyjs['track_pop'] = function() {
+    $pyjs['trackstack']['pop']();
+    $pyjs['track'] = $pyjs['trackstack']['pop']();
+    $pyjs['trackstack']['push']($pyjs['track']);
+};"""
+
+TRACK_PUSH = re.compile(
+    r"""(?<=[;{}\n])\$pyjs\['track'\]=\{'module':('[\w.$]*'),'lineno':(\d+)\};"""
+    r"""\$pyjs\['trackstack'\]\['push'\]\(\$pyjs\['track'\]\);""")
+TRACK_COPY = re.compile(
+    r"""(?<=[;{}\n])\$pyjs\['track'\]=\{'module':\$pyjs\['track'\]\['module'\],"""
+    r"""'lineno':\$pyjs\['track'\]\['lineno'\]\};"""
+    r"""\$pyjs\['trackstack'\]\['push'\]\(\$pyjs\['track'\]\);""")
+TRACK_POP = re.compile(
+    r"""(?<=[;{}\n])\$pyjs\['trackstack'\]\['pop'\]\(\);"""
+    r"""\$pyjs\['track'\]=\$pyjs\['trackstack'\]\['pop'\]\(\);"""
+    r"""\$pyjs\['trackstack'\]\['push'\]\(\$pyjs\['track'\]\);""")
+TRACK_LINENO = re.compile(
+    r"""(?<=[;{}\n])\$pyjs\['track'\]\['lineno'\]=\d+;"""
+    r"""(?=\$pyjs\['track'\]\['lineno'\]=\d+;)""")
+
+
+class Token(object):
+
+    __slots__ = ('kind', 'value', 'newline')
+
+    def __init__(self, kind, value, newline):
+        self.kind = kind
+        self.value = value
+        # whether a line break precedes the token
+        self.newline = newline
+
+
+def tokenize(code):
+    """returns the tokens of code, without whitespace and comments"""
+    tokens = []
+    newline = False
+    pos = 0
+    end = len(code)
+    match = TOKEN.match
+    while pos < end:
+        if (    code[pos] == '/' and not code[pos+1:pos+2] in ('/', '*')
+            and regexp_allowed(tokens)
+           ):
+            m = REGEXP.match(code, pos)
+            if m is not None:
+                tokens.append(Token('regexp', m.group(), newline))
+                newline = False
+                pos = m.end()
+                continue
+        m = match(code, pos)
+        kind = m.lastgroup
+        value = m.group()
+        pos = m.end()
+        if kind == 'newline':
+            newline = True
+        elif kind == 'space':
+            pass
+        elif kind == 'comment':
+            if value.startswith('/*@') or value.startswith('/*!'):
+                # conditional compilation and licenses
+                tokens.append(Token('comment', value, newline))
+                newline = False
+            elif '\n' in value:
+                newline = True
+        else:
+            tokens.append(Token(kind, value, newline))
+            newline = False
+    return tokens
+
+
+def regexp_allowed(tokens):
+    if not tokens:
+        return True
+    last = tokens[-1]
+    if last.kind == 'punct':
+        return last.value not in (')', ']', '}')
+    if last.kind == 'name':
+        return last.value in REGEXP_KEYWORDS
+    return last.kind == 'comment'
+
+
+class Scope(object):
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.names = {}
+        # names which must not be renamed, in this scope and its parents
+        self.fixed = set()
+        self.renamable = True
+        self.renamed = {}
+        self.children = []
+        if parent is not None:
+            parent.children.append(self)
+
+    def declare(self, name):
+        self.names.setdefault(name, 0)
+
+    def lookup(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.names:
+                return scope
+            scope = scope.parent
+        return None
+
+    def fix(self, name):
+        scope = self
+        while scope is not None:
+            scope.fixed.add(name)
+            scope = scope.parent
+
+    def dynamic(self):
+        scope = self
+        while scope is not None:
+            scope.renamable = False
+            scope = scope.parent
+
+
+def scan_scopes(tokens):
+    """returns the scope of each token, None for the top-level code, and
+    the function scopes"""
+    scopes = [None] * len(tokens)
+    functions = []
+    # (scope, depth of braces at which the body of the scope ends)
+    stack = []
+    scope = None
+    depth = 0
+    i = 0
+    n = len(tokens)
+    # in a var statement: depth of brackets at which names are declared
+    var_depth = None
+    var_name = False
+    while i < n:
+        token = tokens[i]
+        value = token.value
+        if token.kind == 'name' and value == 'function':
+            declaration = (i == 0 or tokens[i-1].value in (';', '{', '}')
+                           or tokens[i].newline)
+            j = i + 1
+            name = None
+            if j < n and tokens[j].kind == 'name':
+                name = tokens[j].value
+                j += 1
+            new_scope = Scope(scope)
+            functions.append(new_scope)
+            if name is not None:
+                if declaration and scope is not None:
+                    scope.declare(name)
+                    scope.fix(name)
+                new_scope.fix(name)
+            for k in range(i, j):
+                scopes[k] = scope
+            # parameters
+            if j < n and tokens[j].value == '(':
+                scopes[j] = new_scope
+                j += 1
+                while j < n and tokens[j].value != ')':
+                    if tokens[j].kind == 'name':
+                        new_scope.declare(tokens[j].value)
+                    scopes[j] = new_scope
+                    j += 1
+                if j < n:
+                    scopes[j] = new_scope
+                    j += 1
+            if j < n and tokens[j].value == '{':
+                scopes[j] = new_scope
+                stack.append((scope, depth, var_depth, var_name))
+                depth += 1
+                scope = new_scope
+                var_depth = None
+                var_name = False
+                i = j + 1
+                continue
+            i = j
+            continue
+        scopes[i] = scope
+        if token.kind == 'punct':
+            if value in ('(', '[', '{'):
+                depth += 1
+            elif value in (')', ']', '}'):
+                depth -= 1
+                if var_depth is not None and depth < var_depth:
+                    var_depth = None
+                if stack and value == '}' and depth == stack[-1][1]:
+                    scope, depth, var_depth, var_name = stack.pop()
+            elif value == ',' and var_depth is not None and depth == var_depth:
+                var_name = True
+            elif value == ';' and var_depth is not None and depth == var_depth:
+                var_depth = None
+        elif token.kind == 'name':
+            if value == 'var':
+                var_depth = depth
+                var_name = True
+            elif var_name:
+                var_name = False
+                if scope is not None:
+                    scope.declare(value)
+            elif value == 'in' and var_depth is not None and depth == var_depth:
+                var_depth = None
+            elif value in ('eval', 'with'):
+                if scope is not None:
+                    scope.dynamic()
+            elif value == 'catch' and i + 2 < n and tokens[i+1].value == '(':
+                if scope is not None:
+                    scope.fix(tokens[i+2].value)
+        i += 1
+    return scopes, functions
+
+
+def short_names(used):
+    """yields the short names which are not in used"""
+    length = 1
+    while True:
+        for name in _names(length):
+            if not name in used and not name in RESERVED:
+                yield name
+        length += 1
+
+
+def _names(length):
+    if length == 1:
+        for c in NAME_START:
+            yield c
+        return
+    for prefix in _names(length - 1):
+        for c in NAME_CHARS:
+            yield prefix + c
+
+
+def rename_locals(tokens):
+    """renames the variables and parameters of the functions in tokens"""
+    scopes, functions = scan_scopes(tokens)
+    used = set([t.value for t in tokens if t.kind == 'name'])
+    references = []
+    for i, token in enumerate(tokens):
+        if token.kind != 'name':
+            continue
+        scope = scopes[i]
+        if scope is None:
+            continue
+        if i > 0 and tokens[i-1].value == '.':
+            continue
+        if (    i + 1 < len(tokens) and tokens[i+1].value == ':'
+            and i > 0 and tokens[i-1].value in ('{', ',')
+           ):
+            # key of an object literal, or a label
+            scope.fix(token.value)
+            continue
+        declared = scope.lookup(token.value)
+        if declared is not None:
+            declared.names[token.value] += 1
+            references.append((i, declared))
+
+    names = short_names(used)
+    generated = []
+    def generated_name(index):
+        while len(generated) <= index:
+            generated.append(names.next())
+        return generated[index]
+
+    def assign(scope, start):
+        if scope.renamable:
+            candidates = [(count, name) for name, count in scope.names.items()
+                          if not name in scope.fixed]
+            candidates.sort(key=lambda c: (-c[0], c[1]))
+            for count, name in candidates:
+                scope.renamed[name] = generated_name(start)
+                start += 1
+        for child in scope.children:
+            assign(child, start)
+
+    for scope in functions:
+        if scope.parent is None:
+            assign(scope, 0)
+    for i, scope in references:
+        new_name = scope.renamed.get(tokens[i].value)
+        if new_name is not None:
+            tokens[i].value = new_name
+
+
+ENDS_STATEMENT = set(['name', 'number', 'string', 'regexp'])
+STARTS_STATEMENT = set(['name', 'number', 'string', 'regexp'])
+
+
+def join(tokens):
+    """returns the code of tokens with as little whitespace as possible"""
+    out = []
+    last = None
+    for token in tokens:
+        value = token.value
+        if last is not None:
+            if token.newline and (
+                    (   last.kind in ENDS_STATEMENT
+                     or last.value in (')', ']', '}', '++', '--'))
+                and (   token.kind in STARTS_STATEMENT
+                     or value in ('(', '[', '{', '+', '-', '++', '--', '!',
+                                  '~'))
+               ):
+                out.append('\n')
+            elif last.kind == 'comment' or token.kind == 'comment':
+                out.append('\n')
+            elif (   (    last.kind in ('name', 'number', 'regexp')
+                      and token.kind in ('name', 'number'))
+                  or (last.kind == 'number' and value[0] == '.')
+                  or (last.value in ('+', '++') and value[0] == '+')
+                  or (last.value in ('-', '--') and value[0] == '-')
+                  or (last.value == '--' and value[0] == '>')
+                  or (last.value == '<' and value[0] == '!')
+                 ):
+                out.append(' ')
+        out.append(value)
+        last = token
+    return ''.join(out)
+
+
+def minify(code, rename=True, track=True):
+    """returns the minified code; see the module documentation"""
+    tokens = tokenize(code)
+    if rename:
+        rename_locals(tokens)
+    code = join(tokens)
+    if track and "$pyjs['track']" in code:
+        code = TRACK_LINENO.sub('', code)
+        code = TRACK_PUSH.sub(r"$pyjs['track_push'](\1,\2);", code)
+        code = TRACK_COPY.sub("$pyjs['track_copy']();", code)
+        code = TRACK_POP.sub("$pyjs['track_pop']();", code)
+    return code
+
+
+def compress(path):
+    """writes the precompressed files of path; returns their paths and
+    sizes"""
+    f = open(path, 'rb')
+    data = f.read()
+    f.close()
+    written = []
+    gz_path = path + '.gz'
+    f = open(gz_path, 'wb')
+    # without a timestamp, the file only changes with path
+    gz = gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=f,
+                       mtime=0)
+    gz.write(data)
+    gz.close()
+    f.close()
+    written.append((gz_path, len(open(gz_path, 'rb').read())))
+    if brotli is not None:
+        br_path = path + '.br'
+        compressed = brotli.compress(data)
+        f = open(br_path, 'wb')
+        f.write(compressed)
+        f.close()
+        written.append((br_path, len(compressed)))
+    return written
@@ -152,8 +152,9 @@ class Mappings(object):
             spec['type'] = default_type
         if default in tf or default_type is not None:
             tfs = ' [%default]'
-        spec['help'] = pat % {'tfs': tfs,
-                              'help': spec['help']}
+        if spec['help'] != SUPPRESS_HELP:
+            spec['help'] = pat % {'tfs': tfs,
+                                  'help': spec['help']}
         if spec['action'] != 'callback':
             spec['callback'] = self._opt_set
             spec['callback_kwargs'] = {'_action': spec['action'],
@@ -379,6 +380,28 @@ mappings.number_classes = (
     dict(help='enable float/int/long as classes',
          default=False)
 )
+mappings.native_map = (
+    ['--enable-native-map'],
+    ['--native-map'],
+    [],
+    dict(help='enable dict/set backed by javascript Map',
+         default=False)
+)
+mappings.tree_shaking = (
+    ['--enable-tree-shaking'],
+    ['--tree-shaking'],
+    [],
+    dict(help='enable removing the functions and classes nothing refers to, when linking',
+         default=False)
+)
+# internal, set by pyjsbuild --profile-build for the translator processes
+mappings.profile_translation = (
+    ['--enable-profile-translation'],
+    [],
+    [],
+    dict(help=SUPPRESS_HELP,
+         default=False)
+)
 mappings.create_locals = (
     ['--enable-locals'],
     ['--create-locals'],
@@ -83,7 +83,8 @@ class PyV8Linker(linker.BaseLinker):
     def __init__(self, *args, **kwargs):
         kwargs['platforms'] = [PLATFORM]
         super(PyV8Linker, self).__init__(*args, **kwargs)
-        self.translator_func = self._translator_func
+        if self.build_cache is None:
+            self.translator_func = self._translator_func
 
     def _translator_func(self, platform, file_names, out_file, module_name,
                          translator_args, incremental):
@@ -100,7 +101,7 @@ class PyV8Linker(linker.BaseLinker):
                     cached = False
                     break
         if cached:
-            deps, js_libs = linker.parse_outfile(out_file)
+            deps, js_libs = linker.read_deps(out_file)
             return deps, js_libs
         deps, js_libs = linker.out_translate(platform, file_names, out_file,
                                              module_name, translator_args,
@@ -171,4 +172,5 @@ class PyV8Linker(linker.BaseLinker):
         out_file.write(APP_TEMPLATE % locals())
         out_file.close()
 
-add_linker_options = linker.add_linker_options
\ No newline at end of file
+add_linker_options = linker.add_linker_options
+get_build_cache = linker.get_build_cache
\ No newline at end of file
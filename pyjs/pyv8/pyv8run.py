@@ -25,7 +25,7 @@ pyjs.path += [os.path.join(pyjspth, 'library'),
 
 
 from pyjs import translator
-from linker import PLATFORM, PyV8Linker, add_linker_options
+from linker import PLATFORM, PyV8Linker, add_linker_options, get_build_cache
 from jsglobal import Global
 
 class JSRuntimeError(Exception):
@@ -114,7 +114,9 @@ def main():
                         platforms=[PLATFORM],
                         path=pyjs.path,
                         compiler=translator.compiler,
-                        translator_arguments=translator_arguments)
+                        translator_arguments=translator_arguments,
+                        build_cache=get_build_cache(options),
+                        profile_build=options.profile_build)
     linker()
 
     fp = open(linker.out_file_mod, 'r')
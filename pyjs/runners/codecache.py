@@ -0,0 +1,131 @@
+"""Cache of the code objects compiled by the pyjd importer.
+
+Merging a module with its platform override (e.g. DOM.py with
+DOM.hulahop.py) means parsing both with the compiler package, which takes
+far longer than loading the marshalled code.  The code is stored in the
+directory named by the PYJD_IMPORT_CACHE environment variable (by default
+importcache in the pyjd home, ~/.pyjd; an empty value disables the cache),
+so that it also works for read-only installations.  Entries are keyed by
+the names and contents of the base module and its overrides, and written
+atomically, so concurrent launches never load a partial entry.
+"""
+
+import os
+import sys
+import imp
+import marshal
+import tempfile
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import md5
+
+_cache = None
+
+
+class CodeCache(object):
+
+    def __init__(self, path):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, file_names):
+        """returns the key of the code merged from file_names, the module
+        followed by its overrides, or None if one cannot be read"""
+        h = md5(imp.get_magic())
+        h.update(sys.version)
+        for file_name in file_names:
+            try:
+                f = open(file_name, 'rb')
+            except IOError:
+                return None
+            try:
+                h.update(os.path.abspath(file_name))
+                h.update('\0')
+                h.update(f.read())
+                h.update('\0')
+            finally:
+                f.close()
+        return h.hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.path, key[:2], key + '.pyjdc')
+
+    def get(self, key):
+        """returns the code stored for key, or None"""
+        try:
+            f = open(self.entry_path(key), 'rb')
+        except IOError:
+            return None
+        try:
+            try:
+                if f.read(4) != imp.get_magic():
+                    return None
+                return marshal.load(f)
+            except (EOFError, ValueError, TypeError):
+                # truncated by a full disk, or damaged
+                return None
+        finally:
+            f.close()
+
+    def put(self, key, code):
+        path = self.entry_path(key)
+        dir_name = os.path.dirname(path)
+        try:
+            if not os.path.isdir(dir_name):
+                try:
+                    os.makedirs(dir_name)
+                except OSError:
+                    # created by a concurrent launch
+                    if not os.path.isdir(dir_name):
+                        raise
+            fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=dir_name)
+        except OSError:
+            # the cache is not writable; importing works without it
+            return
+        f = os.fdopen(fd, 'wb')
+        try:
+            f.write(imp.get_magic())
+            marshal.dump(code, f)
+        finally:
+            f.close()
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # windows does not replace existing files; the entry is
+            # already there, written by a concurrent launch
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def compile(self, file_names, compile):
+        """returns the code merged from file_names, compiling it with
+        compile() and storing it if it is not in the cache yet"""
+        key = self.key(file_names)
+        code = None
+        if key is not None:
+            code = self.get(key)
+        if code is None:
+            self.misses += 1
+            code = compile()
+            if key is not None:
+                self.put(key, code)
+        else:
+            self.hits += 1
+        return code
+
+
+def get_code_cache(home):
+    """returns the CodeCache configured by PYJD_IMPORT_CACHE, by default
+    in the pyjd home directory, or None"""
+    global _cache
+    path = os.environ.get('PYJD_IMPORT_CACHE',
+                          os.path.join(home, 'importcache'))
+    if not path:
+        return None
+    if _cache is None or _cache.path != os.path.abspath(
+            os.path.expanduser(path)):
+        _cache = CodeCache(path)
+    return _cache
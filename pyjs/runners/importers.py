@@ -36,11 +36,33 @@ _suffix = '.py' + _suffix_char
 _c_suffixes = filter(lambda x: x[2] == imp.C_EXTENSION, imp.get_suffixes())
 
 from modcompile import PlatformParser, Module
+import codecache
 
 pp = PlatformParser(verbose=False)
 pp.platform =  pyjd.engine
 parser = PlatformParser(verbose=False, chain_plat=pp)
 
+def _compile(modname, filename):
+    "Parse a module merged with its platform override and compile it."
+    mod, filename = parser.parseModule(modname, filename)
+    code = Module(mod, filename)
+    code.compile()
+    return code.getCode()
+
+def _cached_import(modname, filename):
+    """Return the code of a module from the code cache in the pyjd home,
+    compiling it if needed, or None if the cache is disabled."""
+    home = getattr(pyjd, 'home', os.path.join(os.path.expanduser('~'),
+                                              '.pyjd'))
+    cache = codecache.get_code_cache(home)
+    if cache is None:
+        return None
+    file_names = [filename]
+    platform_file = parser.checkOverridePlatformFile(filename)
+    if platform_file:
+        file_names.append(platform_file)
+    return cache.compile(file_names, lambda: _compile(modname, filename))
+
 def _timestamp(pathname):
     "Return the file modification time as a Long."
     try:
@@ -74,6 +96,13 @@ def _fs_import(dir, modname, fqname):
                 return 0, module, values
 
     filename = pathname + '.py'
+    if os.path.isfile(filename):
+        code = _cached_import(modname, filename)
+        if code is not None:
+            values['__file__'] = filename
+            return ispkg, code, values
+
+    # no source, or no code cache: use the .pyc files next to the sources
     filenamec = pathname + _suffix
     t_py = _timestamp(filename)
     t_pyc = _timestamp(filenamec)
@@ -129,11 +158,7 @@ def _fs_import(dir, modname, fqname):
 
     if code is None:
         filename = pathname + '.py'
-        "compiling", filename
-        mod, filename = parser.parseModule(modname, filename)
-        code = Module(mod, filename)
-        code.compile()
-        code = code.getCode()
+        code = _compile(modname, filename)
 
         if platform_file and t_p_py:
             out_t_py = t_p_py
@@ -15,5 +15,38 @@ def test_suite():
     util = DocFileSuite('util.txt',
                 optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
                         )
-    s = unittest.TestSuite((translator, browser, sm, util))
+    buildcache = DocFileSuite('buildcache.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    jsonrpc = DocFileSuite('jsonrpc.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    translator_server = DocFileSuite('translator_server.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    treeshaker = DocFileSuite('treeshaker.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    minifier = DocFileSuite('minifier.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    parsecache = DocFileSuite('parsecache.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    watcher = DocFileSuite('watcher.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    chart = DocFileSuite('chart.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    codecache = DocFileSuite('codecache.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    jsonservice = DocFileSuite('jsonservice.txt',
+                optionflags=doctest.NORMALIZE_WHITESPACE | doctest.ELLIPSIS,
+                        )
+    s = unittest.TestSuite((translator, browser, sm, util, buildcache,
+                            jsonrpc, translator_server, treeshaker,
+                            minifier, parsecache, watcher, chart,
+                            codecache, jsonservice))
     return s
@@ -3129,6 +3129,7 @@ if os.environ.has_key('PYJS_SYSPATH'):
     sys.path[0:0] = [os.environ['PYJS_SYSPATH']]
 
 import pyjs
+from pyjs import util
 
 LIBRARY_PATH = os.path.abspath(os.path.dirname(__file__))
 
@@ -3179,8 +3180,12 @@ def translate(sources, output_file, module_name=None, **kw):
     else:
         output = file(output_file, 'w')
     output.write(translator.get_javascript())
+    deps = sorted(translator.imported_modules.keys())
+    js_libs = sorted(translator.imported_js.keys())
     output.close()
-    return sorted(translator.imported_modules.keys()), sorted(translator.imported_js.keys())
+    if output_file != '-':
+        util.write_deps_manifest(output_file, deps, js_libs)
+    return deps, js_libs
 
 
 class ImportVisitor(object):
@@ -15,6 +15,7 @@
 
 import sys
 import types
+import time
 import os
 import copy
 from six.moves import cStringIO as StringIO
@@ -39,6 +40,7 @@ from pycompiler.visitor import ASTVisitor
 
 
 import pyjs
+from pyjs import util
 
 escaped_subst = re.compile('@{{(!?[ a-zA-Z0-9_\.]*)}}')
 
@@ -640,6 +642,16 @@ class __Pyjamas__(object):
             return "new $p['int'](%s)" % expr, False
         return expr, False
 
+    def NATIVE_MAP(self, translator, node, *args, **kwargs):
+        if len(node.args) != 0:
+            raise TranslationError(
+                "NATIVE_MAP function doesn't support arguments",
+                node.node)
+        opt_var = translator.decorator_compiler_options['NativeMap'][0][0]
+        if getattr(translator, opt_var):
+            return 'true', False
+        return 'false', False
+
 
 def native_js_func(func):
     __Pyjamas__.register_native_js_func(func.__name__, func)
@@ -715,6 +727,21 @@ class Klass:
         self.functions.add(function_name)
 
 
+class OutputBuffer(object):
+    """collects the generated code as a list of fragments, which are only
+    joined by getvalue(); a faster replacement for StringIO"""
+
+    def __init__(self):
+        self.fragments = []
+        self.write = self.fragments.append
+        self.softspace = 0
+
+    def getvalue(self):
+        value = ''.join(self.fragments)
+        self.fragments[:] = [value]
+        return value
+
+
 class TranslationError(Exception):
     def __init__(self, msg, node='', module_name=''):
         if node:
@@ -772,10 +799,118 @@ class Translator(object):
         'OperatorFuncs': [('operator_funcs', True)],
         'noNumberClasses': [('number_classes', False)],
         'NumberClasses': [('number_classes', True)],
+        'noNativeMap': [('native_map', False)],
+        'NativeMap': [('native_map', True)],
     }
 
     pyjslib_prefix = "$p"
 
+    # Statement and expression handlers, as (ast class name, method name)
+    # pairs.  A node is handled by the first class it is an instance of;
+    # the handler found for each node class is remembered in the matching
+    # *_handler_cache, so the tables are only searched once per class.
+    module_handlers = (
+        ('Function', '_function'),
+        ('Class', '_class'),
+        ('Import', '_import_module'),
+        ('From', '_from_module'),
+        ('Discard', '_discard'),
+        ('Assign', '_assign'),
+        ('AugAssign', '_augassign'),
+        ('If', '_if'),
+        ('For', '_for'),
+        ('While', '_while'),
+        ('Subscript', '_subscript_stmt'),
+        ('Global', '_global'),
+        ('Printnl', '_print'),
+        ('Print', '_print'),
+        ('TryExcept', '_tryExcept'),
+        ('TryFinally', '_tryFinally'),
+        ('With', '_with'),
+        ('Raise', '_raise'),
+        ('Assert', '_assert'),
+        ('Stmt', '_stmt'),
+        ('AssAttr', '_assattr'),
+        ('AssName', '_assname'),
+        ('AssTuple', '_asstuple_stmt'),
+        ('Slice', '_slice_stmt'),
+    )
+    module_handler_cache = {}
+
+    stmt_handlers = (
+        ('Return', '_return'),
+        ('Yield', '_yield'),
+        ('Break', '_break'),
+        ('Continue', '_continue'),
+        ('Assign', '_assign'),
+        ('AugAssign', '_augassign'),
+        ('Discard', '_discard'),
+        ('If', '_if'),
+        ('For', '_for'),
+        ('While', '_while'),
+        ('Subscript', '_subscript_stmt'),
+        ('Global', '_global'),
+        ('Pass', '_pass'),
+        ('Function', '_function'),
+        ('Printnl', '_print'),
+        ('Print', '_print'),
+        ('TryExcept', '_tryExcept'),
+        ('TryFinally', '_tryFinally'),
+        ('With', '_with'),
+        ('Raise', '_raise'),
+        ('Import', '_import'),
+        ('From', '_from'),
+        ('AssAttr', '_assattr'),
+        ('Exec', '_exec'),
+        ('Assert', '_assert'),
+        ('Class', '_class'),
+        ('Slice', '_slice_stmt'),
+        ('AssName', '_assname_stmt'),
+        ('AssTuple', '_asstuple_stmt'),
+    )
+    stmt_handler_cache = {}
+
+    expr_handlers = (
+        ('Const', '_const_expr'),
+        ('Mul', '_mul'),
+        ('Add', '_add'),
+        ('Sub', '_sub'),
+        ('Div', '_div'),
+        ('FloorDiv', '_floordiv'),
+        ('Mod', '_mod'),
+        ('Power', '_power'),
+        ('UnaryAdd', '_unaryadd'),
+        ('UnarySub', '_unarysub'),
+        ('Not', '_not'),
+        ('Or', '_or'),
+        ('And', '_and'),
+        ('Invert', '_invert'),
+        ('LeftShift', '_bitshiftleft'),
+        ('RightShift', '_bitshiftright'),
+        ('Bitand', '_bitand'),
+        ('Bitxor', '_bitxor'),
+        ('Bitor', '_bitor'),
+        ('Compare', '_compare'),
+        ('CallFunc', '_callfunc_expr'),
+        ('Name', '_name_expr'),
+        ('Subscript', '_subscript'),
+        ('Getattr', '_getattr_expr'),
+        ('List', '_list'),
+        ('Dict', '_dict'),
+        ('Tuple', '_tuple'),
+        ('Set', '_set'),
+        ('Sliceobj', '_sliceobj'),
+        ('Slice', '_slice'),
+        ('Lambda', '_lambda'),
+        # -> Daniel KLUEV VERSION - instead of ListComp / _listcomp
+        ('CollComp', '_collcomp'),
+        ('IfExp', '_if_expr'),
+        ('Yield', '_yield_expr'),
+        ('Backquote', '_backquote'),
+        ('GenExpr', '_genexpr'),
+    )
+    expr_handler_cache = {}
+
     def __init__(self, compiler,
                  module_name, module_file_name, src, mod, output,
                  dynamic=0, findFile=None, **kw):
@@ -875,7 +1010,7 @@ class Translator(object):
             attribute_checking = False
 
         save_output = self.output
-        self.output = StringIO()
+        self.output = OutputBuffer()
 
         mod.lineno = 1
         self.track_lineno(mod, True)
@@ -885,59 +1020,17 @@ class Translator(object):
             self.is_generator = False
             self.track_lineno(child)
             assert self.top_level
-            if isinstance(child, self.ast.Function):
-                self._function(child, None)
-            elif isinstance(child, self.ast.Class):
-                self._class(child)
-            elif isinstance(child, self.ast.Import):
-                self._import(child, None, True)
-            elif isinstance(child, self.ast.From):
-                self._from(child, None, True)
-            elif isinstance(child, self.ast.Discard):
-                self._discard(child, None)
-            elif isinstance(child, self.ast.Assign):
-                self._assign(child, None)
-            elif isinstance(child, self.ast.AugAssign):
-                self._augassign(child, None)
-            elif isinstance(child, self.ast.If):
-                self._if(child, None)
-            elif isinstance(child, self.ast.For):
-                self._for(child, None)
-            elif isinstance(child, self.ast.While):
-                self._while(child, None)
-            elif isinstance(child, self.ast.Subscript):
-                self._subscript_stmt(child, None)
-            elif isinstance(child, self.ast.Global):
-                self._global(child, None)
-            elif isinstance(child, self.ast.Printnl):
-                self._print(child, None)
-            elif isinstance(child, self.ast.Print):
-                self._print(child, None)
-            elif isinstance(child, self.ast.TryExcept):
-                self._tryExcept(child, None)
-            elif isinstance(child, self.ast.TryFinally):
-                self._tryFinally(child, None)
-            elif isinstance(child, self.ast.With):
-                self._with(child, None)
-            elif isinstance(child, self.ast.Raise):
-                self._raise(child, None)
-            elif isinstance(child, self.ast.Assert):
-                self._assert(child, None)
-            elif isinstance(child, self.ast.Stmt):
-                self._stmt(child, None, True)
-            elif isinstance(child, self.ast.AssAttr):
-                self._assattr(child, None)
-            elif isinstance(child, self.ast.AssName):
-                self._assname(child, None)
-            elif isinstance(child, self.ast.AssTuple):
-                for node in child.nodes:
-                    self._stmt(node, None)
-            elif isinstance(child, self.ast.Slice):
-                self.w( self.spacing() + self._slice(child, None))
-            else:
-                raise TranslationError(
-                    "unsupported type (in __init__)",
-                    child, self.module_name)
+            handler = (self.module_handler_cache.get(child.__class__)
+                       or self.find_handler(self.module_handlers,
+                                            self.module_handler_cache,
+                                            child, '__init__'))
+            shakeable = self.tree_shaking and self.shakeable_name(child)
+            if shakeable:
+                # the linker removes the definition if nothing refers to it
+                self.w( self.spacing() + "/* pyjs:def %s */" % shakeable)
+            getattr(self, handler)(child, None)
+            if shakeable:
+                self.w( self.spacing() + "/* pyjs:end %s */" % shakeable)
 
         captured_output = self.output.getvalue()
         self.output = save_output
@@ -951,7 +1044,7 @@ class Translator(object):
             self.w( self.constant_decl())
         if captured_output.find("@ATTRIB_REMAP_DECLARATION@") >= 0:
             captured_output = captured_output.replace("@ATTRIB_REMAP_DECLARATION@", self.attrib_remap_decl())
-        self.w( captured_output, False)
+        self.w( captured_output, False, translate=False)
 
         if attribute_checking:
             self.w( self.dedent() + "} catch ($pyjs_attr_err) {throw @{{_errorMapping}}($pyjs_attr_err);};")
@@ -974,6 +1067,56 @@ class Translator(object):
             self.w( 'PYJS_JS: %s' % repr(self.imported_js))
             self.w( '*/')
 
+    def shakeable_name(self, node):
+        """returns the name of a top-level function or class, if defining
+        it has no side effects; None otherwise"""
+        ast = self.ast
+        def pure(expr):
+            if isinstance(expr, (ast.Const, ast.Name)):
+                return True
+            if isinstance(expr, ast.Getattr):
+                return pure(expr.expr)
+            if isinstance(expr, (ast.Tuple, ast.List)):
+                return not [n for n in expr.nodes if not pure(n)]
+            if isinstance(expr, ast.UnarySub):
+                return pure(expr.expr)
+            return False
+        def pure_function(func):
+            return (    not func.decorators
+                    and not [d for d in func.defaults if not pure(d)])
+        if isinstance(node, ast.Function):
+            if not pure_function(node):
+                return None
+        elif isinstance(node, ast.Class):
+            if getattr(node, 'decorators', None):
+                return None
+            if [b for b in node.bases if not pure(b)]:
+                return None
+            for child in node.code.nodes:
+                if isinstance(child, ast.Function):
+                    if not pure_function(child):
+                        return None
+                elif isinstance(child, ast.Assign):
+                    # the metaclass may do anything
+                    if [n for n in child.nodes
+                        if not isinstance(n, ast.AssName)
+                           or n.name == '__metaclass__']:
+                        return None
+                    if not pure(child.expr):
+                        return None
+                elif isinstance(child, ast.Discard):
+                    if not isinstance(child.expr, ast.Const):
+                        return None
+                elif not isinstance(child, ast.Pass):
+                    return None
+        else:
+            return None
+        if (   node.name in pyjs_vars_remap
+            or node.name in pyjs_attrib_remap
+           ):
+            return None
+        return node.name
+
     def set_compile_options(self, opts):
         opts = dict(all_compile_options, **opts)
         for opt, value in opts.iteritems():
@@ -992,17 +1135,29 @@ class Translator(object):
             self.operator_funcs = True
 
     def w(self, txt, newline=True, output=None, translate=True):
-        if translate and txt:
+        """writes txt to the output like print >> self.output, txt
+        would; the @{{name}} references in txt are resolved, unless
+        translate is False because txt has already been written once"""
+        if translate and txt and '@{{' in txt:
             txt = self.translate_escaped_names(txt, None) # TODO: current_klss
-        output = output or self.output
         assert(isinstance(newline, bool))
+        output = self.output
+        write = output.write
+        if newline and txt is None:
+            write('\n')
+            output.softspace = 0
+            return
+        if not isinstance(txt, basestring):
+            txt = str(txt)
+        if getattr(output, 'softspace', 0):
+            write(' ')
+        write(txt)
         if newline:
-            if txt is None:
-                print >> self.output
-                return
-            print >> self.output, txt
+            write('\n')
+            output.softspace = 0
         else:
-            print >> self.output, txt,
+            # print >>output, txt, leaves a space pending
+            output.softspace = not txt or txt[-1] not in '\t\n\r\x0b\x0c'
 
     def uniqid(self, prefix = ""):
         if not self.__unique_ids__.has_key(prefix):
@@ -1552,7 +1707,7 @@ $generator['$genfunc'] = function () {
 
             self.w( self.__generator_code_str % locals())
             self.indent()
-            self.w( code)
+            self.w( code, translate=False)
             self.w( self.spacing() + "return;")
             self.w( self.dedent() + "};")
             self.w( self.spacing() + "return $generator;")
@@ -2177,6 +2332,12 @@ var %s = arguments['length'] >= %d ? arguments[arguments['length']-1] : argument
             ass_name = name[1] or name[0]
             self._doImport(((sub, ass_name),), current_klass, root_level, True, absPath)
 
+    def _import_module(self, node, current_klass):
+        self._import(node, current_klass, True)
+
+    def _from_module(self, node, current_klass):
+        self._from(node, current_klass, True)
+
     def _function(self, node, current_klass, force_local=False):
         if self.is_class_definition:
             return self._method(node, current_klass)
@@ -2238,7 +2399,7 @@ var %s = arguments['length'] >= %d ? arguments[arguments['length']-1] : argument
 
         self.top_level = False
         save_output = self.output
-        self.output = StringIO()
+        self.output = OutputBuffer()
         if self.source_tracking:
             self.w( self.spacing() + "$pyjs['track']={'module':'%s','lineno':%d};$pyjs['trackstack']['push']($pyjs['track']);" % (self.module_name, node.lineno))
         self.track_lineno(node, True)
@@ -2246,7 +2407,7 @@ var %s = arguments['length'] >= %d ? arguments[arguments['length']-1] : argument
             self._stmt(child, None)
         if not self.has_yield and self.source_tracking and self.has_js_return:
             self.source_tracking = False
-            self.output = StringIO()
+            self.output = OutputBuffer()
             for child in node.code:
                 self._stmt(child, None)
         elif self.has_yield:
@@ -2254,7 +2415,7 @@ var %s = arguments['length'] >= %d ? arguments[arguments['length']-1] : argument
                 self.source_tracking = False
             self.is_generator = True
             self.generator_states = [0]
-            self.output = StringIO()
+            self.output = OutputBuffer()
             self.indent()
             if self.source_tracking:
                 self.w( self.spacing() + "$pyjs['track']={'module':'%s','lineno':%d};$pyjs['trackstack']['push']($pyjs['track']);" % (self.module_name, node.lineno))
@@ -2273,7 +2434,7 @@ var %s = arguments['length'] >= %d ? arguments[arguments['length']-1] : argument
         if self.is_generator:
             self.generator(captured_output)
         else:
-            self.w( captured_output, False)
+            self.w( captured_output, False, translate=False)
 
             # we need to return null always, so it is not undefined
             if node.code.nodes:
@@ -2731,7 +2892,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
             body_nodes[0:0] = [self.ast.Assign([v.vars],
                                                self.ast.Name(withvar))]
         save_output = self.output
-        self.output = StringIO()
+        self.output = OutputBuffer()
         self.indent()
 
         for node in body_nodes:
@@ -2745,7 +2906,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
                dict(expr=expr,
                     __with=self.pyjslib_name('__with'),
                     withvar=withvar))
-        self.w(captured_output.getvalue().rstrip())
+        self.w(captured_output.getvalue().rstrip(), translate=False)
         self.w(self.spacing() + "});")
 
     def _getattr(self, v, current_klass, use_getattr=None):
@@ -3038,7 +3199,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
 
         self.top_level = False
         save_output = self.output
-        self.output = StringIO()
+        self.output = OutputBuffer()
         if self.source_tracking:
             self.w( self.spacing() + "$pyjs['track']={'module':'%s', 'lineno':%d};$pyjs['trackstack']['push']($pyjs['track']);" % (self.module_name, node.lineno))
         self.track_lineno(node, True)
@@ -3046,7 +3207,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
             self._stmt(child, current_klass)
         if not self.has_yield and self.source_tracking and self.has_js_return:
             self.source_tracking = False
-            self.output = StringIO()
+            self.output = OutputBuffer()
             for child in node.code:
                 self._stmt(child, None)
         elif self.has_yield:
@@ -3054,7 +3215,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
                 self.source_tracking = False
             self.is_generator = True
             self.generator_states = [0]
-            self.output = StringIO()
+            self.output = OutputBuffer()
             self.indent()
             if self.source_tracking:
                 self.w( self.spacing() + "$pyjs['track']={'module':'%s','lineno':%d};$pyjs['trackstack']['push']($pyjs['track']);" % (self.module_name, node.lineno))
@@ -3073,7 +3234,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
         if self.is_generator:
             self.generator(captured_output)
         else:
-            self.w( captured_output, False)
+            self.w( captured_output, False, translate=False)
 
             # we need to return null always, so it is not undefined
             if node.code.nodes:
@@ -3127,80 +3288,42 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
     def _exec(self, node, current_klass):
         pass
 
+    def find_handler(self, handlers, cache, node, context):
+        """returns the name of the method in handlers that translates node,
+        and remembers it in cache for the class of node"""
+        for class_name, handler in handlers:
+            if isinstance(node, getattr(self.ast, class_name)):
+                cache[node.__class__] = handler
+                return handler
+        raise TranslationError(
+            "unsupported type (in %s)" % context, node, self.module_name)
+
     def _stmt(self, node, current_klass):
         self.track_lineno(node)
+        handler = (self.stmt_handler_cache.get(node.__class__)
+                   or self.find_handler(self.stmt_handlers,
+                                        self.stmt_handler_cache,
+                                        node, '_stmt'))
+        getattr(self, handler)(node, current_klass)
 
-        if isinstance(node, self.ast.Return):
-            self._return(node, current_klass)
-        elif isinstance(node, self.ast.Yield):
-            self._yield(node, current_klass)
-        elif isinstance(node, self.ast.Break):
-            self._break(node, current_klass)
-        elif isinstance(node, self.ast.Continue):
-            self._continue(node, current_klass)
-        elif isinstance(node, self.ast.Assign):
-            self._assign(node, current_klass)
-        elif isinstance(node, self.ast.AugAssign):
-            self._augassign(node, current_klass)
-        elif isinstance(node, self.ast.Discard):
-            self._discard(node, current_klass)
-        elif isinstance(node, self.ast.If):
-            self._if(node, current_klass)
-        elif isinstance(node, self.ast.For):
-            self._for(node, current_klass)
-        elif isinstance(node, self.ast.While):
-            self._while(node, current_klass)
-        elif isinstance(node, self.ast.Subscript):
-            self._subscript_stmt(node, current_klass)
-        elif isinstance(node, self.ast.Global):
-            self._global(node, current_klass)
-        elif isinstance(node, self.ast.Pass):
-            pass
-        elif isinstance(node, self.ast.Function):
-            self._function(node, current_klass)
-        elif isinstance(node, self.ast.Printnl):
-           self._print(node, current_klass)
-        elif isinstance(node, self.ast.Print):
-           self._print(node, current_klass)
-        elif isinstance(node, self.ast.TryExcept):
-            self._tryExcept(node, current_klass)
-        elif isinstance(node, self.ast.TryFinally):
-            self._tryFinally(node, current_klass)
-        elif isinstance(node, self.ast.With):
-            self._with(node, current_klass)
-        elif isinstance(node, self.ast.Raise):
-            self._raise(node, current_klass)
-        elif isinstance(node, self.ast.Import):
-            self._import(node, current_klass)
-        elif isinstance(node, self.ast.From):
-            self._from(node, current_klass)
-        elif isinstance(node, self.ast.AssAttr):
-            self._assattr(node, current_klass)
-        elif isinstance(node, self.ast.Exec):
-            self._exec(node, current_klass)
-        elif isinstance(node, self.ast.Assert):
-            self._assert(node, current_klass)
-        elif isinstance(node, self.ast.Class):
-            self._class(node, current_klass)
-        #elif isinstance(node, self.ast.CallFunc):
-        #    self._callfunc(node, current_klass)
-        elif isinstance(node, self.ast.Slice):
-            self.w( self.spacing() + self._slice(node, current_klass))
-        elif isinstance(node, self.ast.AssName):
-            # TODO: support other OP_xxx types and move this to
-            # a separate function
-            if node.flags == "OP_DELETE":
-                name = self._lhsFromName(node.name, current_klass)
-                self.w( self.spacing() + "@{{_del}}(%s);" % name)
-            else:
-                raise TranslationError(
-                    "unsupported AssName type (in _stmt)", node, self.module_name)
-        elif isinstance(node, self.ast.AssTuple):
-            for node in node.nodes:
-                self._stmt(node, current_klass)
+    def _pass(self, node, current_klass):
+        pass
+
+    def _slice_stmt(self, node, current_klass):
+        self.w( self.spacing() + self._slice(node, current_klass))
+
+    def _assname_stmt(self, node, current_klass):
+        # TODO: support other OP_xxx types
+        if node.flags == "OP_DELETE":
+            name = self._lhsFromName(node.name, current_klass)
+            self.w( self.spacing() + "@{{_del}}(%s);" % name)
         else:
             raise TranslationError(
-                "unsupported type (in _stmt)", node, self.module_name)
+                "unsupported AssName type (in _stmt)", node, self.module_name)
+
+    def _asstuple_stmt(self, node, current_klass):
+        for node in node.nodes:
+            self._stmt(node, current_klass)
 
 
     def get_start_line(self, node, lineno):
@@ -3519,8 +3642,12 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
             self.w( self.spacing() + "$generator_state[%d] = 0;" % (len(self.generator_states)+1,))
             self.generator_switch_case(increment=True)
             self.generator_add_state()
-        for i in range(len(node.tests)):
-            test, consequence = node.tests[i]
+        # branches which are known to be never taken at compile time are
+        # left out, e.g. the code of an option which is off
+        tests = [(test, consequence) for test, consequence in node.tests
+                 if not self.is_false_at_compile_time(test)]
+        for i in range(len(tests)):
+            test, consequence = tests[i]
             if i == 0:
                 keyword = "if"
             else:
@@ -3529,7 +3656,13 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
             self.lookup_stack[-1]
             self._if_test(keyword, test, consequence, node, current_klass)
 
-        if node.else_:
+        if node.else_ and not tests:
+            # only the else branch is left
+            for child in node.else_.nodes:
+                self._stmt(child, current_klass)
+            node = None
+
+        if node is not None and node.else_:
             keyword = "else"
             test = None
             consequence = node.else_
@@ -3540,6 +3673,22 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
         self.generator_del_state()
         self.is_generator = save_is_generator
 
+    def is_false_at_compile_time(self, test):
+        """whether test is NATIVE_MAP() of __pyjamas__ (or starts an and
+        with it) while native_map is off"""
+        if isinstance(test, self.ast.And):
+            test = test.nodes[0]
+        if (   not isinstance(test, self.ast.CallFunc)
+            or not isinstance(test.node, self.ast.Name)
+            or test.node.name != 'NATIVE_MAP'
+            or test.args
+           ):
+            return False
+        if self.lookup(test.node.name)[0] != '__pyjamas__':
+            return False
+        opt_var = self.decorator_compiler_options['NativeMap'][0][0]
+        return not getattr(self, opt_var)
+
     def _if_test(self, keyword, test, consequence, node, current_klass):
         if test:
             expr = self.expr(test, current_klass)
@@ -4112,7 +4261,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
         resultvar = self.uniqid("$collcomp")
         self.add_lookup('variable', resultvar, resultvar)
         save_output = self.output
-        self.output = StringIO()
+        self.output = OutputBuffer()
         if isinstance(node, self.ast.ListComp):
             tnode = self.ast.Discard(
                 self.ast.CallFunc(
@@ -4192,7 +4341,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
             raise TranslationError(
                 "varargs not supported (in _genexpr)", node, self.module_name)
         save_output = self.output
-        self.output = StringIO()
+        self.output = OutputBuffer()
         self.indent()
         self.generator_switch_open()
         self.generator_switch_case(increment=False)
@@ -4218,7 +4367,7 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
         self.generator_switch_close()
 
         captured_output = self.output.getvalue()
-        self.output = StringIO()
+        self.output = OutputBuffer()
         self.w( "function(){")
         self.generator(captured_output)
         self.w( self.dedent() + "}()")
@@ -4271,163 +4420,107 @@ var %(e)s_name = (typeof %(e)s['__name__'] == 'undefined' ? %(e)s['name'] : %(e)
     def _backquote(self, node, current_klass):
         return "@{{repr}}(%s)" % self.expr(node.expr, current_klass)
 
-    def expr(self, node, current_klass):
-        if isinstance(node, self.ast.Const):
-            return self._const(node)
-        # @@@ not sure if the parentheses should be here or in individual operator functions - JKT
-        elif isinstance(node, self.ast.Mul):
-            return self._mul(node, current_klass)
-        elif isinstance(node, self.ast.Add):
-            return self._add(node, current_klass)
-        elif isinstance(node, self.ast.Sub):
-            return self._sub(node, current_klass)
-        elif isinstance(node, self.ast.Div):
-            return self._div(node, current_klass)
-        elif isinstance(node, self.ast.FloorDiv):
-            return self._floordiv(node, current_klass)
-        elif isinstance(node, self.ast.Mod):
-            return self._mod(node, current_klass)
-        elif isinstance(node, self.ast.Power):
-            return self._power(node, current_klass)
-        elif isinstance(node, self.ast.UnaryAdd):
-            return self._unaryadd(node, current_klass)
-        elif isinstance(node, self.ast.UnarySub):
-            return self._unarysub(node, current_klass)
-        elif isinstance(node, self.ast.Not):
-            return self._not(node, current_klass)
-        elif isinstance(node, self.ast.Or):
-            return self._or(node, current_klass)
-        elif isinstance(node, self.ast.And):
-            return self._and(node, current_klass)
-        elif isinstance(node, self.ast.Invert):
-            return self._invert(node, current_klass)
-        elif isinstance(node,self.ast.LeftShift):
-            return self._bitshiftleft(node, current_klass)
-        elif isinstance(node, self.ast.RightShift):
-            return self._bitshiftright(node, current_klass)
-        elif isinstance(node, self.ast.Bitand):
-            return self._bitand(node, current_klass)
-        elif isinstance(node, self.ast.Bitxor):
-            return self._bitxor(node, current_klass)
-        elif isinstance(node, self.ast.Bitor):
-            return self._bitor(node, current_klass)
-        elif isinstance(node, self.ast.Compare):
-            return self._compare(node, current_klass)
-        elif isinstance(node, self.ast.CallFunc):
-            return self._callfunc(node, current_klass, optlocal_var=True)
-        elif isinstance(node, self.ast.Name):
-            return self._name(node, current_klass, optlocal_var=True)
-        elif isinstance(node, self.ast.Subscript):
-            return self._subscript(node, current_klass)
-        elif isinstance(node, self.ast.Getattr):
-            attr_ = self._getattr(node, current_klass)
-            if len(attr_) == 1:
-                return attr_[0]
-            attr = self.attrib_join(attr_)
-            attr_left = self.attrib_join(attr_[:-1])
-            attr_right = attr_[-1]
-            attrstr = attr
-            v = self.uniqid('$attr')
-            vl = self.uniqid('$attr')
-            self.add_lookup('variable', v, v)
-            self.add_lookup('variable', vl, vl)
-            if self.bound_methods or self.descriptors:
-                getattr_condition = """(%(v)s=(%(vl)s=%(attr_left)s)['%(attr_right)s']) == null || ((%(vl)s['__is_instance__']) && typeof %(v)s == 'function')"""
-                if self.descriptors:
-                    getattr_condition += """ || (typeof %(v)s['__get__'] == 'function')"""
-                attr_code = """\
+    def _const_expr(self, node, current_klass):
+        return self._const(node)
+
+    def _callfunc_expr(self, node, current_klass):
+        return self._callfunc(node, current_klass, optlocal_var=True)
+
+    def _name_expr(self, node, current_klass):
+        return self._name(node, current_klass, optlocal_var=True)
+
+    def _getattr_expr(self, node, current_klass):
+        attr_ = self._getattr(node, current_klass)
+        if len(attr_) == 1:
+            return attr_[0]
+        attr = self.attrib_join(attr_)
+        attr_left = self.attrib_join(attr_[:-1])
+        attr_right = attr_[-1]
+        attrstr = attr
+        v = self.uniqid('$attr')
+        vl = self.uniqid('$attr')
+        self.add_lookup('variable', v, v)
+        self.add_lookup('variable', vl, vl)
+        if self.bound_methods or self.descriptors:
+            getattr_condition = """(%(v)s=(%(vl)s=%(attr_left)s)['%(attr_right)s']) == null || ((%(vl)s['__is_instance__']) && typeof %(v)s == 'function')"""
+            if self.descriptors:
+                getattr_condition += """ || (typeof %(v)s['__get__'] == 'function')"""
+            attr_code = """\
 (""" + getattr_condition + """?
 \t@{{getattr}}(%(vl)s, '%(attr_right)s'):
 \t%(attr)s)\
 """
-                attr_code = ('\n'+self.spacing()+"\t\t").join(attr_code.split('\n'))
-            else:
-                attr_code = "%(attr)s"
-            attr_code = attr_code % locals()
-            s = self.spacing()
+            attr_code = ('\n'+self.spacing()+"\t\t").join(attr_code.split('\n'))
+        else:
+            attr_code = "%(attr)s"
+        attr_code = attr_code % locals()
+        s = self.spacing()
 
-            orig_attr = attr
+        orig_attr = attr
 
-            if not self.attribute_checking:
-                attr = attr_code
-            else:
-                if attr.find('(') < 0 and not self.debug:
-                    attrstr = attr.replace("\n", "\n\\")
-                    attr = """(typeof %(attr)s=='undefined'?
+        if not self.attribute_checking:
+            attr = attr_code
+        else:
+            if attr.find('(') < 0 and not self.debug:
+                attrstr = attr.replace("\n", "\n\\")
+                attr = """(typeof %(attr)s=='undefined'?
 %(s)s\t\t(function(){throw TypeError("%(attrstr)s is undefined");})():
 %(s)s\t\t%(attr_code)s)""" % locals()
-                else:
-                    attr_ = attr
-                    if self.source_tracking or self.debug:
-                        _source_tracking = self.source_tracking
-                        _debug = self.debug
-                        _attribute_checking = self.attribute_checking
-                        self.attribute_checking = self.source_tracking = self.debug = False
-                        attr_ = self.attrib_join(self._getattr(node, current_klass))
-                        self.source_tracking = _source_tracking
-                        self.debug = _debug
-                        self.attribute_checking = _attribute_checking
-                    attrstr = attr_.replace("\n", "\\\n")
-                    attr = """(function(){
+            else:
+                attr_ = attr
+                if self.source_tracking or self.debug:
+                    _source_tracking = self.source_tracking
+                    _debug = self.debug
+                    _attribute_checking = self.attribute_checking
+                    self.attribute_checking = self.source_tracking = self.debug = False
+                    attr_ = self.attrib_join(self._getattr(node, current_klass))
+                    self.source_tracking = _source_tracking
+                    self.debug = _debug
+                    self.attribute_checking = _attribute_checking
+                attrstr = attr_.replace("\n", "\\\n")
+                attr = """(function(){
 %(s)s\tvar $pyjs__testval=%(attr_code)s;
 %(s)s\treturn (typeof $pyjs__testval=='undefined'?
 %(s)s\t\t(function(){throw TypeError(\"%(attrstr)s is undefined");})():
 %(s)s\t\t$pyjs__testval);
 %(s)s})()""" % locals()
-            if True: # not self.attribute_checking or self.inline_code:
-                return attr
-            bound_methods = self.bound_methods and "true" or "false"
-            descriptors = self.descriptors and "true" or "false"
-            attribute_checking = self.attribute_checking and "true" or "false"
-            source_tracking = self.source_tracking and "true" or "false"
-            attr = """\
+        if True: # not self.attribute_checking or self.inline_code:
+            return attr
+        bound_methods = self.bound_methods and "true" or "false"
+        descriptors = self.descriptors and "true" or "false"
+        attribute_checking = self.attribute_checking and "true" or "false"
+        source_tracking = self.source_tracking and "true" or "false"
+        attr = """\
 @{{__getattr_check}}(%(attr)s, %(attr_left)s, %(attr_right)s,\
 "%(attrstr)s", %(bound_methods)s, %(descriptors)s, %(attribute_checking)s,\
 %(source_tracking)s)
-                """ % locals()
-            return attr
-        elif isinstance(node, self.ast.List):
-            return self._list(node, current_klass)
-        elif isinstance(node, self.ast.Dict):
-            return self._dict(node, current_klass)
-        elif isinstance(node, self.ast.Tuple):
-            return self._tuple(node, current_klass)
-        elif isinstance(node, self.ast.Set):
-            return self._set(node, current_klass)
-        elif isinstance(node, self.ast.Sliceobj):
-            return self._sliceobj(node, current_klass)
-        elif isinstance(node, self.ast.Slice):
-            return self._slice(node, current_klass)
-        elif isinstance(node, self.ast.Lambda):
-            return self._lambda(node, current_klass)
-        # -> Daniel KLUEV VERSION - instead of _listcomp below
-        elif isinstance(node, self.ast.CollComp):
-            return self._collcomp(node, current_klass)
-        #elif isinstance(node, self.ast.ListComp): # kees version
-        #    return self._listcomp(node, current_klass)
-        elif isinstance(node, self.ast.IfExp):
-            return self._if_expr(node, current_klass)
-        elif isinstance(node, self.ast.Yield):
-            return self._yield_expr(node, current_klass)
-        elif isinstance(node, self.ast.Backquote):
-            return self._backquote(node, current_klass)
-        elif isinstance(node, self.ast.GenExpr):
-            return self._genexpr(node, current_klass)
-        else:
-            raise TranslationError(
-                "unsupported type (in expr)", node, self.module_name)
+            """ % locals()
+        return attr
+
+    def expr(self, node, current_klass):
+        handler = (self.expr_handler_cache.get(node.__class__)
+                   or self.find_handler(self.expr_handlers,
+                                        self.expr_handler_cache,
+                                        node, 'expr'))
+        return getattr(self, handler)(node, current_klass)
 
 
 
 def translate(sources, output_file, module_name=None, **kw):
     kw = dict(all_compile_options, **kw)
     list_imports = kw.get('list_imports', False)
+    profile_translation = kw.get('profile_translation', False)
     sources = map(os.path.abspath, sources)
     if not module_name:
         module_name, extension = os.path.splitext(os.path.basename(sources[0]))
 
     trees = []
     tree= None
+    start = time.time()
+    parse_timings = dict(compiler.transformer.timings)
+    parse_cache = compiler.parsecache.get_parse_cache()
+    if parse_cache is not None:
+        parse_cache_hits = parse_cache.hits
     for src in sources:
         current_tree = compiler.parseFile(src)
         flags = set()
@@ -4456,8 +4549,26 @@ def translate(sources, output_file, module_name=None, **kw):
     else:
         output = file(output_file, 'w')
 
+    parsed = time.time()
     t = Translator(compiler,
                    module_name, sources[0], src, tree, output, **kw)
+    if output is not output_file and output is not sys.stdout:
+        output.close()
+        profile = None
+        if profile_translation:
+            # where the time went, for pyjsbuild --profile-build
+            profile = dict(
+                read=parsed - start,
+                codegen=time.time() - parsed,
+            )
+            for phase in ('parse', 'transform'):
+                profile[phase] = (compiler.transformer.timings[phase]
+                                  - parse_timings[phase])
+            if parse_cache is not None:
+                profile['parse_cache_hits'] = (parse_cache.hits
+                                               - parse_cache_hits)
+        util.write_deps_manifest(output_file, t.imported_modules,
+                                 t.imported_js, profile)
     return t.imported_modules, t.imported_js
 
 def merge(ast, module_name, tree1, tree2, flags):
@@ -0,0 +1,276 @@
+"""Long-running translator, listening on a unix socket.
+
+Starting translator.py for every module means importing the translator and
+building the parser tables over and over; the server does it once, and
+translates pyjslib on start so that the caches of the translator are warm
+as well.  pyjsbuild uses it with --translator-server (or the
+PYJS_TRANSLATOR_SERVER environment variable), and editors may talk to it
+directly.  Only the user who started the server may connect to the socket.
+After pyjs is upgraded, the server has to be restarted.
+
+    python -m pyjs.translator_server [--socket PATH] [--use-translator=dict]
+
+Each request is a json object on one line, answered by a json object on
+one line; a connection may be used for any number of requests:
+
+    {"sources": ["/abs/mod.py", "/abs/mod.mozilla.py"],
+     "module_name": "mod", "output": "/abs/output/lib/mod.js",
+     "options": {"debug": true}, "translator": "proto"}
+
+sources are the module and its overrides, output is the file to write
+(and its dependency manifest); without it, the javascript is returned in
+"js".  options are compile options as in pyjs.options, the others keep
+their defaults.  translator, if given, is the translator the client
+expects, proto or dict; a server running the other one refuses the
+request.  The answer holds the result of translate(), the imported
+modules and javascript files, or an error:
+
+    {"deps": ["pyjslib", "sys"], "js_libs": []}
+    {"error": "TranslationError: ...", "traceback": "..."}
+    {"error": "...", "translator": "dict"}
+"""
+
+import os
+import sys
+import socket
+import threading
+import traceback
+import SocketServer
+from cStringIO import StringIO
+from optparse import OptionParser
+try:
+    import json
+except ImportError:
+    import simplejson as json
+
+from pyjs import translator, linker
+
+DEFAULT_SOCKET = os.environ.get(
+    'PYJS_TRANSLATOR_SERVER',
+    os.path.join(os.path.expanduser('~'), '.pyjs', 'translator.sock'))
+
+
+def _str(s):
+    if isinstance(s, unicode):
+        return s.encode('utf-8')
+    return s
+
+
+class TranslatorMismatch(Exception):
+    """raised by TranslatorClient.translate when the server runs another
+    translator than the one asked for"""
+
+
+def translate_request(request):
+    """translates the module of request, see the module documentation;
+    returns the answer"""
+    sources = [_str(src) for src in request['sources']]
+    if not sources:
+        raise ValueError('no sources')
+    module_name = _str(request.get('module_name'))
+    output = _str(request.get('output'))
+    options = {}
+    for k, v in request.get('options', {}).items():
+        options[_str(k)] = _str(v)
+    # as translator.py would see them, with the defaults of the others
+    options = linker.normalize_translator_opts(options)
+    if output is None:
+        js = StringIO()
+        deps, js_libs = translator.translate(sources, js, module_name,
+                                             **options)
+        return dict(deps=deps, js_libs=js_libs, js=js.getvalue())
+    deps, js_libs = translator.translate(sources, output, module_name,
+                                         **options)
+    return dict(deps=deps, js_libs=js_libs)
+
+
+class RequestHandler(SocketServer.StreamRequestHandler):
+
+    def handle(self):
+        for line in iter(self.rfile.readline, ''):
+            if not line.strip():
+                continue
+            answer = self.server.process(line)
+            self.wfile.write(json.dumps(answer) + '\n')
+            self.wfile.flush()
+
+
+class TranslatorServer(SocketServer.ThreadingMixIn,
+                       SocketServer.UnixStreamServer):
+    """answers translate requests; the connections are served by threads,
+    the translations are done one at a time"""
+
+    daemon_threads = True
+
+    def __init__(self, path, handler=RequestHandler):
+        self.path = os.path.abspath(path)
+        self.lock = threading.Lock()
+        self.remove_stale_socket()
+        dir_name = os.path.dirname(self.path)
+        if not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+        umask = os.umask(077)
+        try:
+            SocketServer.UnixStreamServer.__init__(self, self.path, handler)
+        finally:
+            os.umask(umask)
+
+    def remove_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            try:
+                s.connect(self.path)
+            except socket.error:
+                # left behind by a server which did not shut down
+                os.unlink(self.path)
+                return
+        finally:
+            s.close()
+        raise socket.error('a translator server listens on %s' % self.path)
+
+    def warm_up(self):
+        """translates the builtin module, building the parser tables and
+        the caches of the translator"""
+        builtin = os.path.join(linker.BUILTIN_PATH,
+                               linker.builtin_module + '.py')
+        if os.path.isfile(builtin):
+            translator.translate([builtin], StringIO(),
+                                 linker.builtin_module,
+                                 **linker.normalize_translator_opts({}))
+
+    def process(self, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('request is not an object')
+        except ValueError, e:
+            return dict(error='invalid request: %s' % e)
+        requested = request.get('translator')
+        if requested is not None and requested != translator.name:
+            return dict(error='the server runs the %s translator, not %s'
+                              % (translator.name, requested),
+                        translator=translator.name)
+        self.lock.acquire()
+        try:
+            try:
+                return translate_request(request)
+            except Exception, e:
+                return dict(error='%s: %s' % (e.__class__.__name__, e),
+                            traceback=traceback.format_exc())
+        finally:
+            self.lock.release()
+
+    def server_close(self):
+        SocketServer.UnixStreamServer.server_close(self)
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class TranslatorClient(object):
+    """connection to a TranslatorServer"""
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.path = path
+        self.socket = None
+        self.rfile = None
+
+    def connect(self):
+        """connects to the server; raises socket.error if there is none"""
+        if self.socket is not None:
+            return
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            s.connect(self.path)
+        except socket.error:
+            s.close()
+            raise
+        self.socket = s
+        self.rfile = s.makefile('rb')
+
+    def request(self, request):
+        self.connect()
+        try:
+            self.socket.sendall(json.dumps(request) + '\n')
+            line = self.rfile.readline()
+        except socket.error:
+            self.close()
+            raise
+        if not line:
+            self.close()
+            raise socket.error('translator server closed the connection')
+        return json.loads(line)
+
+    def translate(self, sources, output=None, module_name=None,
+                  translator_name=None, **options):
+        """returns the imported modules and javascript files like
+        translator.translate, and the javascript if output is None; with
+        translator_name, raises TranslatorMismatch if the server runs
+        another translator.  The TranslationError of a failed translation
+        includes the traceback from the server."""
+        request = dict(sources=[os.path.abspath(src) for src in sources],
+                       module_name=module_name, options=options)
+        if output is not None:
+            request['output'] = os.path.abspath(output)
+        if translator_name is not None:
+            request['translator'] = translator_name
+        answer = self.request(request)
+        if 'translator' in answer:
+            raise TranslatorMismatch(_str(answer['error']))
+        if 'error' in answer:
+            message = answer['error']
+            if 'traceback' in answer:
+                # where it failed in the server process
+                message = '%s\n%s' % (message, answer['traceback'])
+            raise translator.TranslationError(message)
+        deps = [str(dep) for dep in answer['deps']]
+        js_libs = [tuple([_str(p) for p in js]) for js in answer['js_libs']]
+        if output is None:
+            return deps, js_libs, _str(answer['js'])
+        return deps, js_libs
+
+    def close(self):
+        if self.socket is None:
+            return
+        self.rfile.close()
+        self.socket.close()
+        self.socket = self.rfile = None
+
+
+def main():
+    parser = OptionParser(usage="%prog [options]")
+    parser.add_option("-s", "--socket", dest="socket",
+                      default=DEFAULT_SOCKET,
+                      help="unix socket to listen on (default %default)")
+    parser.add_option("--no-warm-up", dest="warm_up", default=True,
+                      action="store_false",
+                      help="do not translate pyjslib on start")
+    # the option is picked up by pyjs.translator itself, on import
+    parser.add_option("--use-translator", dest="translator",
+                      choices=['proto', 'dict'],
+                      help="translator to serve, proto or dict "
+                           "(default proto); give it as "
+                           "--use-translator=dict")
+    options, args = parser.parse_args()
+    if args:
+        parser.error("no arguments expected")
+
+    server = TranslatorServer(options.socket)
+    try:
+        if options.warm_up:
+            server.warm_up()
+        print "translator server (%s) listening on %s" % (translator.name,
+                                                          server.path)
+        sys.stdout.flush()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Removes the top-level functions and classes nothing refers to.
+
+With --enable-tree-shaking, the translator marks the top-level functions
+and classes whose definition has no side effects:
+
+    /* pyjs:def name */
+    $m['name'] = function(...) {...};
+    /* pyjs:end name */
+
+After translation, the linker looks for the names the code of the whole
+application refers to: javascript strings (the attributes of the
+generated code, the names given to getattr(), the entries of __all__) and
+the attributes after a dot.  A definition is kept if code which is kept
+refers to its name, starting with the code outside of the definitions
+and the other javascript files of the application; the others are removed
+from the app files.  The names of a module imported with "from module
+import *" are all kept.
+
+Names which are only built at runtime, e.g. by getattr(module, name) with
+a computed name or by javascript code, are not seen; the definitions have
+to be kept with --tree-shaking-keep.
+"""
+
+import re
+
+DEFINITION = re.compile(r'^[ \t]*/\* pyjs:def ([\w$]+) \*/\n(.*?)'
+                        r'^[ \t]*/\* pyjs:end \1 \*/\n', re.M | re.S)
+MARKER = re.compile(r'^[ \t]*/\* pyjs:(?:def|end) [\w$]+ \*/\n', re.M)
+NAME = re.compile(r'''['"]([A-Za-z_$][\w$]*)['"]|\.([A-Za-z_$][\w$]*)''')
+IMPORT_ALL = re.compile(r"""__import_all__'\]\('([\w.]+)', '([\w.]+)'"""
+                        r"""|__import_all__'\]\('([\w.]+)'""")
+
+
+def referenced_names(code):
+    """returns the names code refers to"""
+    names = set()
+    for quoted, attr in NAME.findall(code):
+        names.add(quoted or attr)
+    return names
+
+
+def imported_all(code):
+    """returns the modules code imports all names of, with their names
+    in the context of the importing module"""
+    modules = set()
+    for name, context, plain in IMPORT_ALL.findall(code):
+        if plain:
+            modules.add(plain)
+        else:
+            modules.add(name)
+            modules.add(context + '.' + name)
+    return modules
+
+
+def shake(modules, other_code=(), keep=()):
+    """modules maps the names of the modules to their code, other_code
+    are the other javascript sources of the application and keep regular
+    expressions matching the module.name of definitions to keep.
+    Returns the code of the modules without the definitions nothing
+    refers to, and the names removed from each module."""
+    keep = [re.compile(k) for k in keep]
+    definitions = {}
+    names = set()
+    all_names = set()
+    for code in other_code:
+        names |= referenced_names(code)
+        all_names |= imported_all(code)
+    for module_name, code in modules.items():
+        found = []
+        for match in DEFINITION.finditer(code):
+            found.append((match.group(1), match.start(), match.end()))
+        definitions[module_name] = found
+        outside = DEFINITION.sub('', code)
+        names |= referenced_names(outside)
+        all_names |= imported_all(outside)
+
+    # the definitions which are not kept (yet), by name
+    pending = {}
+    kept = set()
+    for module_name, found in definitions.items():
+        for i, (name, start, end) in enumerate(found):
+            if [k for k in keep if k.match(module_name + '.' + name)]:
+                kept.add((module_name, i))
+            else:
+                pending.setdefault(name, []).append((module_name, i))
+
+    def keep_definition(module_name, i):
+        name, start, end = definitions[module_name][i]
+        code = modules[module_name][start:end]
+        kept.add((module_name, i))
+        return referenced_names(code), imported_all(code)
+
+    for module_name, i in list(kept):
+        new_names, new_all = keep_definition(module_name, i)
+        names |= new_names
+        all_names |= new_all
+    todo = list(names)
+    done_all = set()
+    while todo or all_names - done_all:
+        for module_name in all_names - done_all:
+            done_all.add(module_name)
+            for i in range(len(definitions.get(module_name, []))):
+                if not (module_name, i) in kept:
+                    todo.append(definitions[module_name][i][0])
+        while todo:
+            name = todo.pop()
+            for module_name, i in pending.pop(name, []):
+                new_names, new_all = keep_definition(module_name, i)
+                todo.extend(new_names - names)
+                names |= new_names
+                all_names |= new_all
+
+    shaken = {}
+    removed = {}
+    for module_name, code in modules.items():
+        parts = []
+        removed[module_name] = []
+        pos = 0
+        for i, (name, start, end) in enumerate(definitions[module_name]):
+            if (module_name, i) in kept:
+                continue
+            parts.append(code[pos:start])
+            pos = end
+            removed[module_name].append(name)
+        parts.append(code[pos:])
+        shaken[module_name] = MARKER.sub('', ''.join(parts))
+    return shaken, removed
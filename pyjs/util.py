@@ -2,6 +2,7 @@ import os
 import shutil
 import re
 import logging
+import json
 
 DEFAULT_SKIP_FILES=re.compile(
     r"^(.*%(sep)s)?("
@@ -59,3 +60,52 @@ def copy_exists(srcname, dstname, symlinks=False):
     if errors:
         print errors
 
+
+
+def deps_manifest_path(out_file):
+    return os.path.splitext(out_file)[0] + '.deps.json'
+
+def write_deps_manifest(out_file, deps, js_libs, profile=None):
+    """writes the imports of a translated module next to out_file, so that
+    linkers do not need to read the javascript to find them.  profile is
+    an optional dict of translation timings"""
+    manifest = {'deps': list(deps), 'js': [list(js) for js in js_libs]}
+    if profile:
+        manifest['profile'] = profile
+    f = open(deps_manifest_path(out_file), 'w')
+    json.dump(manifest, f, separators=(',', ':'))
+    f.close()
+
+def read_deps_manifest(out_file):
+    """returns (deps, js_libs) written by write_deps_manifest, or None if
+    there is no manifest or it is older than out_file"""
+    path = deps_manifest_path(out_file)
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(out_file):
+            return None
+        f = open(path)
+    except (IOError, OSError):
+        return None
+    try:
+        manifest = json.load(f)
+    except ValueError:
+        return None
+    finally:
+        f.close()
+    deps = [str(dep) for dep in manifest['deps']]
+    js_libs = [tuple([p.encode('utf-8') for p in js]) for js in manifest['js']]
+    return deps, js_libs
+
+def read_translation_profile(out_file):
+    """returns the timings stored by write_deps_manifest, or None"""
+    try:
+        f = open(deps_manifest_path(out_file))
+    except IOError:
+        return None
+    try:
+        manifest = json.load(f)
+    except ValueError:
+        return None
+    finally:
+        f.close()
+    return manifest.get('profile')
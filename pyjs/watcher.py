@@ -0,0 +1,154 @@
+# file modification watchers used by pyjsbuild --auto-build
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+
+try:
+    import ctypes
+    import ctypes.util
+except ImportError:
+    ctypes = None
+
+
+class PollingWatcher(object):
+    """walks the tree every interval seconds and reports the files whose
+    modification time changed"""
+
+    def __init__(self, root, skip_dirs=(), interval=1):
+        self.root = root
+        self.skip_dirs = [os.path.abspath(d) for d in skip_dirs]
+        self.interval = interval
+        self.mtimes = {}
+        self.scan()
+
+    def scan(self):
+        changed = []
+        for root, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs
+                       if os.path.abspath(os.path.join(root, d))
+                       not in self.skip_dirs]
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if self.mtimes.get(path) != mtime:
+                    self.mtimes[path] = mtime
+                    changed.append(path)
+        return changed
+
+    def __iter__(self):
+        while True:
+            time.sleep(self.interval)
+            changed = self.scan()
+            if changed:
+                for path in changed:
+                    print('mtime changed for %s.' % path)
+                yield changed
+
+
+class InotifyWatcher(object):
+    """reports the files written in the tree, using the linux inotify
+    interface instead of walking it"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, root, skip_dirs=(), delay=0.1):
+        if ctypes is None or not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify not available')
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.inotify_add_watch = libc.inotify_add_watch
+        self.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p,
+                                           ctypes.c_uint32]
+        self.fd = libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init failed')
+        self.root = root
+        self.skip_dirs = [os.path.abspath(d) for d in skip_dirs]
+        self.delay = delay
+        self.watches = {}
+        self.add_tree(root)
+
+    def add_tree(self, path):
+        for root, dirs, files in os.walk(path):
+            dirs[:] = [d for d in dirs
+                       if os.path.abspath(os.path.join(root, d))
+                       not in self.skip_dirs]
+            mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+            wd = self.inotify_add_watch(self.fd, root, mask)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(),
+                              'inotify_add_watch failed for %s' % root)
+            self.watches[wd] = root
+
+    def read_events(self):
+        """returns the written files, or None if events were lost"""
+        changed = []
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+                break
+            except OSError, e:
+                if e.errno != errno.EINTR:
+                    raise
+        pos = 0
+        while pos < len(buf):
+            wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(buf, pos)
+            pos += self.EVENT_HEADER.size
+            name = buf[pos:pos + length].rstrip('\0')
+            pos += length
+            if mask & self.IN_Q_OVERFLOW:
+                return None
+            if not wd in self.watches:
+                continue
+            path = os.path.join(self.watches[wd], name)
+            if mask & self.IN_ISDIR:
+                if (    mask & (self.IN_CREATE | self.IN_MOVED_TO)
+                    and os.path.abspath(path) not in self.skip_dirs
+                   ):
+                    try:
+                        self.add_tree(path)
+                    except OSError:
+                        # removed again before we could watch it
+                        pass
+            elif mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                if not path in changed:
+                    changed.append(path)
+        return changed
+
+    def __iter__(self):
+        """yields lists of written files; None means that events were
+        lost and anything may have changed"""
+        while True:
+            changed = self.read_events()
+            # editors often write several files at once: collect them
+            # into one batch
+            while select.select([self.fd], [], [], self.delay)[0]:
+                more = self.read_events()
+                if changed is None or more is None:
+                    changed = None
+                else:
+                    changed += [p for p in more if p not in changed]
+            if changed is None or changed:
+                yield changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def get_watcher(root, skip_dirs=()):
+    """returns an InotifyWatcher where available, else a PollingWatcher"""
+    try:
+        return InotifyWatcher(root, skip_dirs)
+    except OSError:
+        return PollingWatcher(root, skip_dirs)
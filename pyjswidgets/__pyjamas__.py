@@ -82,3 +82,6 @@ def debugger():
 
 def INT(i):
     return int(i)
+
+def NATIVE_MAP():
+    return False
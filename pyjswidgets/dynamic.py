@@ -161,26 +161,91 @@ def ajax_import(url, namespace=None, names=None):
         module = __imported__[url]
     else:
         req = load(url, None, None, False)
-        module = None
-        name_getter = []
-        if names is None:
-            names = []
-        for name in names:
-            name_getter.append("$pyjs$moduleObject['%s'] = %s;" % (name, name))
+        module = eval_module(url, req.responseText, names)
+    inject(module, namespace, names)
+
+def eval_module(url, text, names=None):
+    setCompilerOptions("noDebug")
+    name_getter = []
+    if names is None:
+        names = []
+    for name in names:
+        name_getter.append("$pyjs$moduleObject['%s'] = %s;" % (name, name))
 
-        script = """(function ( ) {
+    script = """(function ( ) {
 $pyjs$moduleObject={};
 %s;
 %s
 return $pyjs$moduleObject;
-})();""" % (req.responseText, "\n".join(name_getter))
-        try:
-            module = eval(script)
-        except:
-            e = sys.exc_info()
-            raise AjaxError("Error in %s: %s" % (url, e.message))
-        __imported__[url] = module
-    inject(module, namespace, names)
+})();""" % (text, "\n".join(name_getter))
+    try:
+        module = eval(script)
+    except:
+        e = sys.exc_info()
+        raise AjaxError("Error in %s: %s" % (url, e.message))
+    __imported__[url] = module
+    return module
+
+#
+#  load_modules(names, on_load, on_error)
+#
+#  Fetches the modules linked at runtime, and the modules they import, with
+#  parallel asynchronous requests, so that importing them afterwards does
+#  not wait for the server.  The modules are not initialized.
+#
+#  @param names      names of the modules
+#  @param on_load    function called without parameters when they are loaded
+#  @param on_error   function called with the url and the status of the
+#                    request of a file which could not be loaded; by default
+#                    AjaxError is raised
+#
+
+def load_modules(names, on_load=None, on_error=None):
+    setCompilerOptions("noDebug")
+    graph = JS("$pyjs['module_graph']")
+    urls = []
+    if JS("typeof @{{graph}} != 'undefined'"):
+        for name in names:
+            if JS("!@{{graph}}['hasOwnProperty'](@{{name}})"):
+                continue
+            for dep in list(JS("@{{graph}}[@{{name}}][1]")):
+                url = JS("@{{graph}}[@{{dep}}][0]")
+                if (    JS("typeof $pyjs['loaded_modules'][@{{dep}}] == 'undefined'")
+                    and not __imported__.has_key(url)
+                    and not url in urls
+                   ):
+                    urls.append(url)
+    pending = [len(urls)]
+    if not urls:
+        if not on_load is None:
+            on_load()
+        return
+
+    def loaded(url, req):
+        if req.status == 200 or (req.status == 0 and req.responseText):
+            if not __imported__.has_key(url):
+                eval_module(url, req.responseText)
+        elif on_error is None:
+            raise AjaxError("Asynchronous error in %s" % url, req.status)
+        else:
+            on_error(url, req.status)
+            return
+        pending[0] -= 1
+        if pending[0] == 0 and not on_load is None:
+            on_load()
+
+    def request(url):
+        req = createHttpRequest()
+        def onreadystatechange(evnt):
+            if req.readyState == 4:
+                loaded(url, req)
+        # next line is in JS() for IE6
+        JS("@{{req}}['onreadystatechange'] = @{{onreadystatechange}};")
+        req.open("GET", url, True)
+        req.send(None)
+
+    for url in urls:
+        request(url)
 
 
 # From here, just converted from dynamicajax.js
@@ -9,6 +9,8 @@
 
 import sys
 from HTTPRequest import HTTPRequest
+from pyjamas import DeferredCommand
+from pyjamas.Timer import Timer
 
 try:
     # included in python 2.6...
@@ -45,12 +47,16 @@ class JSONService(object):
     content_type = 'application/json-rpc'
     accept = 'application/json-rpc'
 
-    def __init__(self, url, handler=None, headers=None):
+    def __init__(self, url, handler=None, headers=None, batch=None):
         """
         Create a JSON remote service object. The url is the URL that will
         receive POST data with the JSON request. See the JSON-RPC spec for
         more information.
 
+        With batch, True or a JSONBatch, the requests and notifications
+        are not posted right away but collected and sent together as a
+        JSON-RPC 2.0 batch; see JSONBatch.
+
         The handler object should implement::
 
             onRemoteResponse(value, requestInfo)
@@ -73,6 +79,9 @@ class JSONService(object):
         self.headers = headers if headers is not None else {}
         if not self.headers.get("Accept"):
             self.headers["Accept"] = self.accept
+        if batch is True:
+            batch = JSONBatch()
+        self.batch = batch or None
 
     def callMethod(self, method, params, handler = None):
         if handler is None:
@@ -118,12 +127,10 @@ class JSONService(object):
                "method": method,
                "params": params
               }
-        msg_data = dumps(msg)
-        if not HTTPRequest().asyncPost(self.url, msg_data, self,
-                                       False, self.content_type,
-                                       self.headers):
-            return -1
-        return 1
+        if self.batch is not None:
+            self.batch.add(self, msg, None)
+            return 1
+        return self.postMessage(msg, None)
 
     def sendRequest(self, method, params, handler):
         id = nextRequestID()
@@ -132,15 +139,105 @@ class JSONService(object):
                "method": method,
                "params": params
               }
-        msg_data = dumps(msg)
 
         request_info = JSONRequestInfo(id, method, handler)
-        if not HTTPRequest().asyncPost(self.url, msg_data,
-                                       JSONResponseTextHandler(request_info),
+        if self.batch is not None:
+            self.batch.add(self, msg, request_info)
+            return id
+        if self.postMessage(msg, request_info) < 0:
+            return -1
+        return id
+
+    def postMessage(self, msg, request_info):
+        """posts a request, a notification if request_info is None, or
+        a list of them"""
+        if request_info is None:
+            handler = self
+        elif isinstance(msg, list):
+            handler = JSONBatchResponseTextHandler(request_info)
+        else:
+            handler = JSONResponseTextHandler(request_info)
+        msg_data = dumps(msg)
+        if not HTTPRequest().asyncPost(self.url, msg_data, handler,
                                        False, self.content_type,
                                        self.headers):
             return -1
-        return id
+        return 1
+
+
+class JSONBatch(object):
+    """
+    Collects the requests and notifications of the services using it and
+    posts them as one JSON-RPC 2.0 batch.  The calls made in the same
+    event handler go into one batch: it is sent once the handler returns
+    (through DeferredCommand), or delayMillis later, or as soon as it
+    holds maxSize calls.  The responses are handed to the handler of
+    each request.
+
+    A batch is posted to the url of the service which made its first
+    call, so share a JSONBatch only between services of the same url;
+    JSONProxy does so for its methods.
+    """
+
+    def __init__(self, maxSize=20, delayMillis=0):
+        self.maxSize = maxSize
+        self.delayMillis = delayMillis
+        self.service = None
+        self.messages = []
+        self.requests = []
+        self.scheduled = False
+        self.timer = None
+
+    def add(self, service, msg, request_info):
+        if self.service is None:
+            self.service = service
+        self.messages.append(msg)
+        if request_info is not None:
+            self.requests.append(request_info)
+        if len(self.messages) >= self.maxSize:
+            self.flush()
+        elif not self.scheduled:
+            self.scheduled = True
+            if self.delayMillis:
+                self.timer = Timer(self.delayMillis, self)
+            else:
+                DeferredCommand.add(self)
+
+    def execute(self):
+        self.flush()
+
+    def onTimer(self, timer):
+        self.flush()
+
+    def flush(self):
+        """posts the collected calls"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.scheduled = False
+        service = self.service
+        messages = self.messages
+        requests = self.requests
+        self.service = None
+        self.messages = []
+        self.requests = []
+        if not messages:
+            return
+        if len(messages) == 1:
+            # servers without batch support understand a single call
+            if requests:
+                request_info = requests[0]
+            else:
+                request_info = None
+            result = service.postMessage(messages[0], request_info)
+        elif requests:
+            result = service.postMessage(messages, requests)
+        else:
+            result = service.postMessage(messages, None)
+        if result < 0:
+            for request_info in requests:
+                JSONResponseTextHandler(request_info).onError(
+                    "Request could not be sent", 0)
 
 
 class JSONRequestInfo(object):
@@ -188,7 +285,9 @@ class JSONResponseTextHandler(object):
                         )
             self.request.handler.onRemoteError(0, error, self.request)
             return
+        self.onResponse(response)
 
+    def onResponse(self, response):
         if not response:
             error = dict(
                          code=-32603,
@@ -233,9 +332,47 @@ class JSONResponseTextHandler(object):
                     )
         self.request.handler.onRemoteError(error_code, error, self.request)
 
+class JSONBatchResponseTextHandler(object):
+    """hands the responses to a batch to the handlers of its requests"""
+
+    def __init__(self, requests):
+        self.requests = requests
+
+    def onCompletion(self, json_str):
+        try:
+            responses = _decode_response(json_str)
+        except:
+            responses = None
+        if not isinstance(responses, list):
+            # the server rejected the whole batch; every request gets the
+            # response, usually an error
+            for request in self.requests:
+                JSONResponseTextHandler(request).onCompletion(json_str)
+            return
+        by_id = {}
+        for response in responses:
+            if isinstance(response, dict) and response.get("id") is not None:
+                by_id[response["id"]] = response
+        for request in self.requests:
+            handler = JSONResponseTextHandler(request)
+            if request.id in by_id:
+                handler.onResponse(by_id[request.id])
+            else:
+                error = dict(
+                             code=-32603,
+                             message="No response in batch",
+                             data=None,
+                            )
+                request.handler.onRemoteError(0, error, request)
+
+    def onError(self, error_str, error_code):
+        for request in self.requests:
+            JSONResponseTextHandler(request).onError(error_str, error_code)
+
 class ServiceProxy(JSONService):
-    def __init__(self, serviceURL, serviceName=None, headers=None):
-        JSONService.__init__(self, serviceURL, headers=headers)
+    def __init__(self, serviceURL, serviceName=None, headers=None,
+                 batch=None):
+        JSONService.__init__(self, serviceURL, headers=headers, batch=batch)
         self.__serviceName = serviceName
 
     def __call__(self, *params, **kwargs):
@@ -262,21 +399,23 @@ class ServiceProxy(JSONService):
 
 # reserved names: callMethod, onCompletion
 class JSONProxy(JSONService):
-    def __init__(self, url, methods=None, headers=None):
+    def __init__(self, url, methods=None, headers=None, batch=None):
         self._serviceURL = url
         self.methods = methods
         self.headers = {} if headers is None else headers
         # Init with JSONService, for the use of callMethod
-        JSONService.__init__(self, url, headers=self.headers)
+        JSONService.__init__(self, url, headers=self.headers, batch=batch)
         self._registerMethods(methods)
 
     def _registerMethods(self, methods):
         if methods:
             for method in methods:
+                # the methods share the batch of the proxy
                 setattr(self,
                         method,
                         getattr(ServiceProxy(self._serviceURL, method,
-                                             headers=self.headers),
+                                             headers=self.headers,
+                                             batch=self.batch),
                                 '__call__')
                        )
 
@@ -22,6 +22,8 @@ import math
 from pyjamas.ui import HasHorizontalAlignment
 from pyjamas.ui import HasVerticalAlignment
 
+from pyjamas.chart import IllegalArgumentException
+
 # Validates multipliers used to simplify computing the
 # upper left corner location of symbols and labels to
 # properly reflect their alignment relative to the
@@ -21,6 +21,7 @@ import time
 
 from pyjamas.ui.HTML import HTML
 
+from pyjamas.chart import IllegalArgumentException
 from pyjamas.chart import NumberFormat
 from pyjamas.chart import DateTimeFormat
 from pyjamas.chart import Double
@@ -1609,8 +1610,9 @@ class Axis:
         **
         *"""
         if ticksPerGridline <= 0:
-            raise IllegalArgumentException("ticksPerGridline=" +
-            ticksPerGridline + "; ticksPerGridline must be > 0")
+            raise IllegalArgumentException(
+            "ticksPerGridline=%s; ticksPerGridline must be > 0" %
+            ticksPerGridline)
 
         self.chartDecorationsChanged = True
         self.ticksPerGridline = ticksPerGridline
@@ -1645,8 +1647,8 @@ class Axis:
         *"""
         self.chartDecorationsChanged = True
         if ticksPerLabel <= 0:
-            raise IllegalArgumentException("ticksPerLabel=" +
-                        ticksPerLabel + "; ticksPerLabel must be > 0")
+            raise IllegalArgumentException(
+            "ticksPerLabel=%s; ticksPerLabel must be > 0" % ticksPerLabel)
 
         self.ticksPerLabel = ticksPerLabel
 
@@ -1935,7 +1937,7 @@ class XAxis(Axis):
             nPoints = c.getNPoints()
             for j in range(nPoints):
                 result = self.maxIgnoreNaNAndMaxValue(result,
-                                    c.getPoint(j).getX())
+                                    c.getPointX(j))
 
 
         if result == -Double.MAX_VALUE:
@@ -1952,7 +1954,7 @@ class XAxis(Axis):
 
             nPoints = c.getNPoints()
             for j in range(nPoints):
-                result = self.minIgnoreNaNAndMaxValue(result, c.getPoint(j).getX())
+                result = self.minIgnoreNaNAndMaxValue(result, c.getPointX(j))
 
 
         if result == Double.MAX_VALUE:
@@ -2056,7 +2058,7 @@ class Y2Axis(Axis):
                 nPoints = c.getNPoints()
                 for j in range(nPoints):
                     result = self.maxIgnoreNaNAndMaxValue(result,
-                                                        c.getPoint(j).getY())
+                                                        c.getPointY(j))
 
 
 
@@ -2076,7 +2078,7 @@ class Y2Axis(Axis):
                 nPoints = c.getNPoints()
                 for j in range(nPoints):
                     result = self.minIgnoreNaNAndMaxValue(result,
-                                                    c.getPoint(j).getY())
+                                                    c.getPointY(j))
 
 
         if result == Double.MAX_VALUE:
@@ -2155,7 +2157,7 @@ class YAxis(Axis):
                 nPoints = c.getNPoints()
                 for j in range(nPoints):
                     result = self.maxIgnoreNaNAndMaxValue(result,
-                    c.getPoint(j).getY())
+                    c.getPointY(j))
 
 
 
@@ -2175,7 +2177,7 @@ class YAxis(Axis):
                 nPoints = c.getNPoints()
                 for j in range(nPoints):
                     result = self.minIgnoreNaNAndMaxValue(result,
-                    c.getPoint(j).getY())
+                    c.getPointY(j))
 
 
 
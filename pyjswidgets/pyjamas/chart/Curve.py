@@ -20,6 +20,7 @@
 import math
 
 from pyjamas.chart import Double
+from pyjamas.chart import IllegalArgumentException
 from pyjamas.chart.Point import Point
 from pyjamas.chart.Symbol import Symbol
 
@@ -95,7 +96,14 @@ class Curve:
         self.wasCanvasRendered = False
         self.visible = True
         self.legendHTML = None
-        self.points = []
+        # the points are stored by column; Point objects are only
+        # created by getPoint, and kept in pointObjects (None otherwise)
+        self.xValues = []
+        self.yValues = []
+        self.pointObjects = []
+        # index of next point in the same hit-test band, see
+        # bandSeparatePoints
+        self.iNextInBand = []
         # symbol defines how every point on this curve is rendered
         self.symbol = Symbol(self)
 
@@ -126,12 +134,86 @@ class Curve:
         if arg3 is None:
             x = arg1
             y = arg2
-            self.points.append(Point(self, x, y))
+            self.xValues.append(x)
+            self.yValues.append(y)
+            self.pointObjects.append(None)
+            self.iNextInBand.append(NAI)
         else:
             iPoint = arg1
             x = arg2
             y = arg3
-            self.points.insert(iPoint, Point(self, x, y))
+            self.xValues.insert(iPoint, x)
+            self.yValues.insert(iPoint, y)
+            self.pointObjects.insert(iPoint, None)
+            self.iNextInBand.insert(iPoint, NAI)
+            self.renumberPoints(iPoint)
+
+
+    """*
+    * Replaces the points of this curve by points with the
+    * specified x and y coordinates, invalidating the curve
+    * once.  Much faster than <tt>clearPoints</tt> followed by
+    * an <tt>addPoint</tt> for every point.
+    *
+    * @param xs the x-coordinates of the points (model units)
+    * @param ys the y-coordinates of the points (model units),
+    *   as many as x-coordinates
+    *
+    * @see #appendPoints appendPoints
+    * @see #addPoint(double, double) addPoint(double,double)
+    * @see #clearPoints clearPoints
+    """
+    def setPoints(self, xs, ys):
+        if len(xs) != len(ys):
+            raise IllegalArgumentException(
+                "xs and ys must have the same length (%d != %d)" % \
+                        (len(xs), len(ys)))
+        if self == self.getParent().getTouchedCurve():
+            self.chart.plotPanel.touch(None)
+
+        self.invalidate()
+        self.detachPoints(0)
+        self.xValues = list(xs)
+        self.yValues = list(ys)
+        self.pointObjects = [None] * len(self.xValues)
+        self.iNextInBand = [NAI] * len(self.xValues)
+
+    """*
+    * Adds points with the specified x and y coordinates at the
+    * end of this curve, invalidating the curve once.
+    *
+    * @param xs the x-coordinates of the points (model units)
+    * @param ys the y-coordinates of the points (model units),
+    *   as many as x-coordinates
+    *
+    * @see #setPoints setPoints
+    * @see #addPoint(double, double) addPoint(double,double)
+    """
+    def appendPoints(self, xs, ys):
+        if len(xs) != len(ys):
+            raise IllegalArgumentException(
+                "xs and ys must have the same length (%d != %d)" % \
+                        (len(xs), len(ys)))
+        self.invalidate()
+        self.xValues.extend(xs)
+        self.yValues.extend(ys)
+        self.pointObjects.extend([None] * len(xs))
+        self.iNextInBand.extend([NAI] * len(xs))
+
+    # updates the indexes of the Point objects at or after iPoint
+    def renumberPoints(self, iPoint):
+        for i in range(iPoint, len(self.pointObjects)):
+            p = self.pointObjects[i]
+            if p is not None:
+                p.iPoint = i
+
+    # Point objects at or after iPoint keep their coordinates, but no
+    # longer belong to this curve
+    def detachPoints(self, iPoint):
+        for i in range(iPoint, len(self.pointObjects)):
+            p = self.pointObjects[i]
+            if p is not None:
+                p.detach(self.xValues[i], self.yValues[i])
 
 
     """*
@@ -149,8 +231,11 @@ class Curve:
             self.chart.plotPanel.touch(None)
 
         self.invalidate()
-        del self.points
-        self.points = []
+        self.detachPoints(0)
+        self.xValues = []
+        self.yValues = []
+        self.pointObjects = []
+        self.iNextInBand = []
 
 
 
@@ -299,9 +384,8 @@ class Curve:
     * <p>
     *
     * <pre>
-    Point p = None
-    forloop (int iPoint = bandList[iBand]; iPoint != NAI; iPoint = p.getINextInBand()) {
-        p = getPoint(iPoint)
+    forloop (int iPoint = bandList[iBand]; iPoint != NAI; iPoint = iNextInBand[iPoint]) {
+        x = getPointX(iPoint)
         # do something requiring points in a given band...
 
 
@@ -325,19 +409,19 @@ class Curve:
         for i in range(nBands):
             self.bandList[i] = NAI
 
+        iNextInBand = self.iNextInBand
         for iPoint in range(self.getNPoints()):
             iBand = self.getBand(iPoint, self.bandThickness)
-            p = self.getPoint(iPoint)
             if NAI == iBand:
                 # point isn't rendered at all, so isn't in a band (a next
                 # link pointing to self means "I'm not in any band"). To let
                 # us skip over these points quickly during rendering.
-                p.setINextInBand(iPoint)
+                iNextInBand[iPoint] = iPoint
 
             else:
                 # Add point to front of list for whatever band it's in
                 # (note that point order therefore gets reversed).
-                p.setINextInBand(self.bandList[iBand])
+                iNextInBand[iPoint] = self.bandList[iBand]
                 self.bandList[iBand] = iPoint
 
 
@@ -426,7 +510,6 @@ class Curve:
         # Every point whose symbol touches the brush must be in one
         # of these bands. Search them to find closest touching point.
         for iBand in range(iBandFirst, iBandLast+1):
-            p = None
             iPoint = self.bandList[iBand]
             while iPoint != NAI:
                 if iPoint < 0  or  iPoint >= self.getNPoints():
@@ -437,7 +520,6 @@ class Curve:
                         " xBrush="+xBrush+" yBrush="+yBrush+" brushWidth="+brushWidth +
                         " brushHeight=" +brushHeight + " bandThickness=" + self.bandThickness)
 
-                p = self.getPoint(iPoint)
                 if symType.isIntersecting(self.chart.plotPanel,
                                           self.getSymbol(), iPoint,
                                           self.onY2(), xBrush, yBrush,
@@ -463,7 +545,7 @@ class Curve:
 
 
 
-                iPoint = p.getINextInBand()
+                iPoint = self.iNextInBand[iPoint]
 
 
 
@@ -512,7 +594,7 @@ class Curve:
     * @see #clearPoints clearPoints
     """
     def getNPoints(self):
-        return len(self.points)
+        return len(self.xValues)
 
 
     """*
@@ -545,12 +627,35 @@ class Curve:
         if iPoint is None:
             iPoint = self.getNPoints()-1
 
-        if iPoint < 0  or  iPoint >= len(self.points):
+        if iPoint < 0  or  iPoint >= len(self.xValues):
             raise IllegalArgumentException(
-            "Point index iPoint=" + iPoint + ". " +
-            "is either < 0 or >= the number of points on the curve.")
+            "Point index iPoint=%d is either < 0 or >= the number of "
+            "points on the curve." % iPoint)
+
+        p = self.pointObjects[iPoint]
+        if p is None:
+            p = Point(self, self.xValues[iPoint], self.yValues[iPoint])
+            p.iPoint = iPoint
+            self.pointObjects[iPoint] = p
+        return p
 
-        return self.points[iPoint]
+    """*
+    * Returns the x-coordinate of the point at the specified
+    * index, without creating its <tt>Point</tt> object.
+    *
+    * @see #getPoint getPoint
+    """
+    def getPointX(self, iPoint):
+        return self.xValues[iPoint]
+
+    """*
+    * Returns the y-coordinate of the point at the specified
+    * index, without creating its <tt>Point</tt> object.
+    *
+    * @see #getPoint getPoint
+    """
+    def getPointY(self, iPoint):
+        return self.yValues[iPoint]
 
 
 
@@ -576,10 +681,12 @@ class Curve:
     * @see #getNPoints getNPoints
     """
     def getPointIndex(self, point):
-        try:
-            return self.points.index(point)
-        except ValueError:
+        if point is None  or  point.getParent() is not self:
+            return NAI
+        iPoint = point.iPoint
+        if iPoint == NAI  or  self.pointObjects[iPoint] is not point:
             return NAI
+        return iPoint
 
     """*
     ** Returns the symbol associated with this curve.
@@ -656,20 +763,27 @@ class Curve:
     * @see #getNPoints getNPoints
     """
     def removePointByIndex(self, iPoint):
-        if iPoint < 0  or  iPoint >= getNPoints():
+        if iPoint < 0  or  iPoint >= self.getNPoints():
             raise IllegalArgumentException(
-            "iPoint=" + iPoint + " iPoint arg must be >= 0 and < " +
-            getNPoints() + ", the number of points on the curve.")
+            "iPoint=%d iPoint arg must be >= 0 and < %d, the number of "
+            "points on the curve." % (iPoint, self.getNPoints()))
 
         self.invalidate()
 
         # simulate user moving away from point before it is deleted
         # (this assures that any required hoverCleanup gets called,
         #  and clears the otherwise dangling reference to the point)
-        if self.chart.plotPanel.touchedPoint == self.getPoint(iPoint):
-            self.chart.plotPanel.touch(None)
+        p = self.pointObjects[iPoint]
+        if p is not None:
+            if self.chart.plotPanel.touchedPoint == p:
+                self.chart.plotPanel.touch(None)
+            p.detach(self.xValues[iPoint], self.yValues[iPoint])
 
-        self.points.remove(iPoint)
+        self.xValues.pop(iPoint)
+        self.yValues.pop(iPoint)
+        self.pointObjects.pop(iPoint)
+        self.iNextInBand.pop(iPoint)
+        self.renumberPoints(iPoint)
 
 
     """*
@@ -684,16 +798,16 @@ class Curve:
     *
     """
     def removePoint(self, p):
+        if p is None:
+            raise IllegalArgumentException("p cannot be None.")
+
         if not isinstance(p, Point):
             self.removePointByIndex(p)
             return
 
-        if None == p:
-            raise IllegalArgumentException("p cannot be None.")
-
         index = self.getPointIndex(p)
         if NAI == index:
-            raise ValueError(
+            raise IllegalArgumentException(
                 "p must be a point on this curve (whose curveIndex is %d)" % \
                         self.getParent().getCurveIndex(self))
 
@@ -881,9 +995,8 @@ class Curve:
 
     # renders the specified point of this curve on the given panel
     def realizePoint(self, pp, grp, arp, iPoint):
-        p = self.points[iPoint]
-        x = p.getX()
-        y = p.getY()
+        x = self.xValues[iPoint]
+        y = self.yValues[iPoint]
         # skip points at undefined locations
         if (Double.NaN==(x))  or  (Double.NaN==(y)):
             return
@@ -891,24 +1004,27 @@ class Curve:
         prevX = Double.NaN
         prevY = Double.NaN
         if iPoint > 0:
-            prevP = self.points[iPoint-1]
-            prevX = prevP.getX()
-            prevY = prevP.getY()
+            prevX = self.xValues[iPoint-1]
+            prevY = self.yValues[iPoint-1]
 
         nextX = Double.NaN
         nextY = Double.NaN
-        nextP = None
         if iPoint < self.getNPoints()-1:
-            nextP = self.points[iPoint+1]
-            nextX = nextP.getX()
-            nextY = nextP.getY()
+            nextX = self.xValues[iPoint+1]
+            nextY = self.yValues[iPoint+1]
 
 
         # if point was not assigned to any band, it's not drawn
         # at all (undefined x or y, or off chart entirely)
-        drawMainSymbol = (p.getINextInBand() != iPoint)
+        drawMainSymbol = (self.iNextInBand[iPoint] != iPoint)
+
+        # only points that were asked for can have an annotation
+        p = self.pointObjects[iPoint]
+        annotation = None
+        if p is not None:
+            annotation = p.annotation
 
-        self.getSymbol().realizeSymbol(pp, grp, arp, p.getAnnotation(),
+        self.getSymbol().realizeSymbol(pp, grp, arp, annotation,
                                     self.onY2(),
                                     self.getActuallyClippedToPlotArea(),
                                     self.getParent().getClipToDecoratedChart(),
@@ -976,9 +1092,8 @@ class Curve:
         # Find min, max for x,y and record each keyword position used
         nPoints = self.getNPoints()
         for i in range(nPoints):
-            p = self.getPoint(i)
-            x = p.getX()
-            y = p.getY()
+            x = self.xValues[i]
+            y = self.yValues[i]
             if Double.MAX_VALUE == x:
                 pointAtXAxisMax = True
 
@@ -35,6 +35,7 @@ from pyjamas.ui.SimplePanel import SimplePanel
 from pyjamas.ui.UIObject import UIObject
 from pyjamas.ui.Widget import Widget
 
+from pyjamas.chart import IllegalArgumentException
 from pyjamas.chart.GChartConsts import NAI, DEFAULT_X_CHARTSIZE, DEFAULT_Y_CHARTSIZE
 from pyjamas.chart.GChartConsts import USE_CSS
 from pyjamas.chart.GChartConsts import Y_AXIS
@@ -295,8 +296,8 @@ class GChart (Composite, FocusHandler, KeyboardHandler,
     def setInitialPieSliceOrientation(self, orientation):
         if orientation < 0  or  orientation >=1:
             raise IllegalArgumentException(
-            "orientation="+orientation+"; "+
-            "orientation must be >=0 and < 1.")
+            "orientation=%s; orientation must be >=0 and < 1." %
+            orientation)
 
         self.initialPieSliceOrientation = orientation
         self.invalidateAllSlices()
@@ -830,11 +831,12 @@ class GChart (Composite, FocusHandler, KeyboardHandler,
 
         if iCurve > self.getNCurves():
             raise IllegalArgumentException(
-            "iCurve = " + iCurve +"; iCurve may not exceed self.getNCurves() (" + self.getNCurves() + ")")
+            "iCurve = %d; iCurve may not exceed self.getNCurves() (%d)" %
+            (iCurve, self.getNCurves()))
 
         elif iCurve < 0:
             raise IllegalArgumentException(
-            "iCurve = " + iCurve +"; iCurve may not be negative.")
+            "iCurve = %d; iCurve may not be negative." % iCurve)
 
         internalIndex = self.internalCurveIndex(iCurve)
         c = Curve(self, internalIndex)
@@ -1214,11 +1216,12 @@ class GChart (Composite, FocusHandler, KeyboardHandler,
 
         if iCurve >= self.getNCurves():
             raise IllegalArgumentException(
-            "iCurve = " + iCurve +"; iCurve may not exceed self.getNCurves()-1 (" + str(self.getNCurves()-1) + ")")
+            "iCurve = %d; iCurve may not exceed self.getNCurves()-1 (%d)" %
+            (iCurve, self.getNCurves()-1))
 
         elif iCurve < 0:
             raise IllegalArgumentException(
-            "iCurve = " + iCurve +"; iCurve may not be negative.")
+            "iCurve = %d; iCurve may not be negative." % iCurve)
 
         result = self.getSystemCurve(iCurve)
         return result
@@ -1868,11 +1871,12 @@ class GChart (Composite, FocusHandler, KeyboardHandler,
     def removeCurve(self, iCurve):
         if iCurve >= self.getNCurves():
             raise IllegalArgumentException(
-            "iCurve = " + iCurve +"; iCurve may not exceed self.getNCurves()-1 (" + (self.getNCurves()-1) + ")")
+            "iCurve = %d; iCurve may not exceed self.getNCurves()-1 (%d)" %
+            (iCurve, self.getNCurves()-1))
 
         elif iCurve < 0:
             raise IllegalArgumentException(
-            "iCurve = " + iCurve +"; iCurve may not be negative.")
+            "iCurve = %d; iCurve may not be negative." % iCurve)
 
 
         self.invalidateDependentSlices(iCurve)
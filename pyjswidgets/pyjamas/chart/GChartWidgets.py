@@ -34,6 +34,7 @@ from pyjamas.ui.SimplePanel import SimplePanel
 from pyjamas.ui.UIObject import UIObject
 from pyjamas.ui.Widget import Widget
 
+from pyjamas.chart import IllegalArgumentException
 from pyjamas.chart.GChartConsts import N_PRE_SYSTEM_CURVES
 from pyjamas.chart.GChartConsts import TRANSPARENT_BORDER_COLOR
 from pyjamas.chart.GChartConsts import HOVER_ANNOTATION_ID
@@ -208,7 +209,8 @@ class PartitionedAbsolutePanel (Composite):
     def remove(self, iWidget):
         if iWidget != self.nWidgets-1:
             raise IllegalArgumentException(
-            "iWidgets arg = " + iWidget + " nWidgets-1 (" + (self.nWidgets-1)+") is required.")
+            "iWidgets arg = %d nWidgets-1 (%d) is required." %
+            (iWidget, self.nWidgets-1))
 
         self.selectSubPanel(iWidget)
         result = self.subPanel.remove(iWidget % WIDGETS_PER_PANEL)
@@ -39,18 +39,29 @@ class Point:
     # Points to index of next point in a vertical or horizontal
     # band (used by the <tt>bandSeparatePoints</tt> method).
     def getINextInBand(self):
-        return self.iNextInBand
+        if self.iPoint == NAI:
+            return NAI
+        return self.curve.iNextInBand[self.iPoint]
 
     def setINextInBand(self, iNext):
-        self.iNextInBand = iNext
+        if self.iPoint != NAI:
+            self.curve.iNextInBand[self.iPoint] = iNext
 
+    # Points are created by Curve.getPoint; while on the curve, the
+    # coordinates are those of the curve at index iPoint.
     def __init__(self, curve, x, y):
         self.curve = curve
         self.x = x
         self.y = y
-        self.iNextInBand = NAI
+        self.iPoint = NAI
         self.annotation = None
 
+    # called by the curve when the point is removed from it
+    def detach(self, x, y):
+        self.x = x
+        self.y = y
+        self.iPoint = NAI
+
 
     """*
     ** Returns True if annotation will be rendered in a bold,
@@ -214,7 +225,9 @@ class Point:
     **
     *"""
     def getX(self):
-        return self.x
+        if self.iPoint == NAI:
+            return self.x
+        return self.curve.xValues[self.iPoint]
 
     """* Returns the y-coordinate of this point in "model units"
     ** (arbitrary, application-specific, units).
@@ -227,7 +240,9 @@ class Point:
     **
     *"""
     def getY(self):
-        return self.y
+        if self.iPoint == NAI:
+            return self.y
+        return self.curve.yValues[self.iPoint]
 
 
     """*
@@ -690,6 +705,8 @@ class Point:
     def setX(self, x):
         self.getParent().invalidate()
         self.x = x
+        if self.iPoint != NAI:
+            self.curve.xValues[self.iPoint] = x
 
 
     """*
@@ -713,6 +730,8 @@ class Point:
     def setY(self, y):
         self.getParent().invalidate()
         self.y = y
+        if self.iPoint != NAI:
+            self.curve.yValues[self.iPoint] = y
 
 
     def getAnnotation(self):
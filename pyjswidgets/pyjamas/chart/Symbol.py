@@ -23,6 +23,7 @@ import re
 
 from pyjamas.ui.Widget import Widget
 
+from pyjamas.chart import IllegalArgumentException
 from pyjamas.chart import GChartConsts
 from pyjamas.chart import Double
 from pyjamas.chart import SymbolType
@@ -1192,7 +1193,7 @@ class Symbol(object):
         if (not (Double.NaN==(fillSpacing))  and
             fillSpacing != 0  and  fillSpacing < 1):
             raise IllegalArgumentException(
-            "fillSpacing="+fillSpacing+"; "+
+            "fillSpacing=%s; " % fillSpacing +
             "fillSpacing must either be >= 1, or else " +
             "equal to either 0 or Double.NaN.")
 
@@ -1222,7 +1223,7 @@ class Symbol(object):
         self.getParent().invalidate()
         if fillThickness!=GChartConsts.NAI  and  fillThickness < 0:
             raise IllegalArgumentException(
-            "fillThickness="+self.fillThickness+"; "+
+            "fillThickness=%s; " % self.fillThickness +
             "fillThickness must either be >= 0, or else " +
             "equal to GChartConsts.NAI.")
 
@@ -2226,7 +2227,7 @@ class Symbol(object):
         self.getChart().invalidateDependentSlices(idx)
         if not GChartUtil.withinRange(pieSliceSize,0,1):
             raise IllegalArgumentException(
-            "pieSliceSize="+self.pieSliceSize+"; the requirement: "+
+            "pieSliceSize=%s; the requirement: " % self.pieSliceSize +
             "0.0 <= pieSliceSize <= 1.0 must be satisfied.")
 
         self.pieSliceSize = pieSliceSize
@@ -267,15 +267,14 @@ class SymbolType:
     def getCenterX(self, pp, symbol, iPoint):
 
         c = symbol.getParent()
-        p  = c.getPoint(iPoint)
         prevX = Double.NaN
-        x = p.getX()
+        x = c.getPointX(iPoint)
         nextX = Double.NaN
         if iPoint > 0:
-            prevX = c.getPoint(iPoint-1).getX()
+            prevX = c.getPointX(iPoint-1)
 
         if iPoint+1 < c.getNPoints():
-            nextX = c.getPoint(iPoint+1).getX()
+            nextX = c.getPointX(iPoint+1)
 
 
         result = self.getCenterX_2(pp, symbol, prevX, x, nextX)
@@ -348,15 +347,14 @@ class SymbolType:
     def getCenterY(self, pp, symbol, iPoint, onY2):
 
         c = symbol.getParent()
-        p = c.getPoint(iPoint)
         prevY = Double.NaN
-        y = p.getY()
+        y = c.getPointY(iPoint)
         nextY = Double.NaN
         if iPoint > 0:
-            prevY = c.getPoint(iPoint-1).getY()
+            prevY = c.getPointY(iPoint-1)
 
         if iPoint+1 < c.getNPoints():
-            nextY = c.getPoint(iPoint+1).getY()
+            nextY = c.getPointY(iPoint+1)
 
 
         result = self.getCenterY_2(pp, symbol, prevY, y, nextY, onY2)
@@ -738,20 +736,19 @@ class SymbolType:
                              yBrush, brushWidth, brushHeight):
 
         c = symbol.getParent()
-        p = c.getPoint(iPoint)
         prevX = Double.NaN
-        x = p.getX()
+        x = c.getPointX(iPoint)
         nextX = Double.NaN
         prevY = Double.NaN
-        y = p.getY()
+        y = c.getPointY(iPoint)
         nextY = Double.NaN
         if iPoint > 0:
-            prevX = c.getPoint(iPoint-1).getX()
-            prevY = c.getPoint(iPoint-1).getY()
+            prevX = c.getPointX(iPoint-1)
+            prevY = c.getPointY(iPoint-1)
 
         if iPoint+1 < c.getNPoints():
-            nextX = c.getPoint(iPoint+1).getX()
-            nextY = c.getPoint(iPoint+1).getY()
+            nextX = c.getPointX(iPoint+1)
+            nextY = c.getPointY(iPoint+1)
 
 
         # Treat mouse cursor as if it were a 0x0 pixel symbol
@@ -2009,8 +2006,7 @@ class PieSliceSymbolType (SymbolType):
     *
     """
     def getCenterX(self, pp, symbol, iPoint):
-        p = symbol.getParent().getPoint(iPoint)
-        result = pp.xToPixel(p.getX())
+        result = pp.xToPixel(symbol.getParent().getPointX(iPoint))
         return result
 
     """ @Override
@@ -2019,8 +2015,7 @@ class PieSliceSymbolType (SymbolType):
     *
     """
     def getCenterY(self, pp, symbol, iPoint, onY2):
-        p = symbol.getParent().getPoint(iPoint)
-        result = pp.yToPixel(p.getY(), onY2)
+        result = pp.yToPixel(symbol.getParent().getPointY(iPoint), onY2)
         return result
 
     """
@@ -2037,9 +2032,9 @@ class PieSliceSymbolType (SymbolType):
                              brushWidth, brushHeight):
 
         result = False
-        p = symbol.getParent().getPoint(iPoint)
-        x = p.getX();  # pie center point (slice pivot)
-        y = p.getY()
+        c = symbol.getParent()
+        x = c.getPointX(iPoint);  # pie center point (slice pivot)
+        y = c.getPointY(iPoint)
         xPx = pp.xToPixel(x)
         yPx = pp.yToPixel(y, onY2)
         dx = xBrush-xPx
@@ -0,0 +1,4 @@
+# Raised by the chart classes when an argument is out of range (GWT's
+# IllegalArgumentException); a ValueError, so callers may catch either.
+class IllegalArgumentException(ValueError):
+    pass
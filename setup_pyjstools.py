@@ -12,6 +12,7 @@ package_data={'pyjs': ['boilerplate/*.html', 'boilerplate/pyjampiler_wrapper.js.
 entry_points = {'console_scripts':[
     'pyjampiler=pyjs.pyjampiler:pyjampiler',
     'pyjscompile=pyjs.translator:main',
+    'pyjstranslatord=pyjs.translator_server:main',
     'pyjsbuild=pyjs.browser:build_script',
     'pyv8run=pyjs.pyv8.pyv8run:main',
     'pyjstest=pyjs.pyjstest:pyjstest',